@@ -0,0 +1,381 @@
+# Benchmarks for the Medical Management System hot paths
+# Runs in-process on the embedded SQLite backend, so no Oracle instance is needed:
+#     python benchmark.py                 (every benchmark)
+#     python benchmark.py lookups inserts (selected benchmarks)
+import argparse
+import datetime
+import os
+import threading
+import time
+
+os.environ.setdefault('MEDICAL_DB_BACKEND', 'sqlite')
+
+import medical_system_v9 as app
+
+BENCHMARKS = {}
+
+def benchmark(name):
+    def register(fn):
+        BENCHMARKS[name] = fn
+        return fn
+    return register
+
+def timed(label, fn, repeat=1):
+    start = time.perf_counter()
+    for _ in range(repeat):
+        fn()
+    elapsed = time.perf_counter() - start
+    print(f"  {label:<45} {elapsed * 1000:10.2f} ms total {elapsed * 1e6 / repeat:10.1f} us/op")
+    return elapsed
+
+# Stock high enough that the insert benchmarks never trip the stock trigger
+def restock(quantity=10**9):
+    app.dbms.execute_query("UPDATE MEDICINE SET quantity = :1", (quantity,))
+
+@benchmark('tables')
+def bench_tables():
+    for table in ('SUPPLIER', 'MEDICINE', 'CUSTOMER', 'PRESCRIPTION', 'SALES', 'SALES_ITEMS'):
+        timed(f"SELECT * FROM {table}", lambda: app.dbms.fetch_query(f"SELECT * FROM {table}"), repeat=200)
+
+@benchmark('lookups')
+def bench_lookups():
+    timed("check_medicine_id", lambda: app.check_medicine_id('M005'), repeat=2000)
+    timed("check_customer_id", lambda: app.check_customer_id('C001'), repeat=2000)
+    timed("check_sale_id", lambda: app.check_sale_id('S001'), repeat=2000)
+    discount = app.FirstTimeBuyerDiscount()
+    timed("FirstTimeBuyerDiscount.applies_to", lambda: discount.applies_to(customer_id='C002'), repeat=2000)
+    for table in ('MEDICINE', 'CUSTOMER', 'SALES'):
+        print(f"  id_index[{table}] {app.id_index[table].stats()}")
+    print(f"  purchases {app.purchases.stats()}")
+
+@benchmark('procedures')
+def bench_procedures():
+    timed("check_near_expiry", lambda: app.dbms.callproc("check_near_expiry"), repeat=200)
+    timed("check_low_stock", lambda: app.dbms.callproc("check_low_stock"), repeat=200)
+    timed("expiry_index.near_expiry", app.expiry_index.near_expiry, repeat=200)
+    timed("stock_monitor.low_stock", app.stock_monitor.low_stock, repeat=200)
+
+@benchmark('inserts')
+def bench_inserts(rows=2000):
+    restock()
+    app.dbms.execute_query("INSERT INTO SALES (sale_id, customer_id, sale_date, total_amount, payment_method) "
+                           "VALUES ('SBENCH', 'C001', TO_DATE('2024-11-01', 'YYYY-MM-DD'), 0, 'Cash')")
+    ids = iter(range(rows))
+    timed("SalesItemInsert.perform_insert",
+          lambda: app.SalesItemInsert(f"SIB{next(ids):05d}", 'SBENCH', 'M005', 1, 50.0).perform_insert(),
+          repeat=rows)
+
+@benchmark('bulk')
+def bench_bulk(rows=2000):
+    restock()
+    app.dbms.execute_query("INSERT INTO SALES (sale_id, customer_id, sale_date, total_amount, payment_method) "
+                           "VALUES ('SBULK', 'C001', TO_DATE('2024-11-01', 'YYYY-MM-DD'), 0, 'Cash')")
+    items = [app.SalesItemInsert(f"SIK{i:05d}", 'SBULK', 'M005', 1, 50.0) for i in range(rows)]
+    timed(f"bulk_insert ({rows} sales items)", lambda: app.bulk_insert(items))
+
+@benchmark('stock')
+def bench_stock(lines=10000, runs=5):
+    # 10k-line batches over 20 medicines: the row-level trigger versus the set-based StockEngine.
+    # The two take turns and the best run of each is reported, so machine noise hits both alike.
+    restock()
+    app.dbms.execute_query("INSERT INTO SALES (sale_id, customer_id, sale_date, total_amount, payment_method) "
+                           "VALUES ('SSTOCK', 'C001', TO_DATE('2024-11-01', 'YYYY-MM-DD'), 0, 'Cash')")
+    medicines = [f"M{i:03d}" for i in range(1, 21)]
+    batches = iter(range(2 * runs))
+    def batch():
+        prefix = f"SIT{next(batches)}"
+        return [app.SalesItemInsert(f"{prefix}{i:05d}", 'SSTOCK', medicines[i % len(medicines)], 1, 10.0) for i in range(lines)]
+    paths = (("update_medicine_stock trigger", False), ("StockEngine", True))
+    best = {}
+    enabled = app.stock_engine.enabled
+    try:
+        for _ in range(runs):
+            for label, engine in paths:
+                app.stock_engine.enabled = engine
+                items = batch()
+                start = time.perf_counter()
+                assert app.bulk_insert(items).ok
+                best[label] = min(best.get(label, float('inf')), time.perf_counter() - start)
+    finally:
+        app.stock_engine.enabled = enabled
+    for label, engine in paths:
+        print(f"  bulk_insert {lines} lines, {label:<30} {best[label] * 1000:10.2f} ms best of {runs}")
+
+@benchmark('reservations')
+def bench_reservations(terminals=8, baskets=50):
+    # Terminals holding and releasing the same medicine at once; SQLite serialises them, so
+    # conflicts only show up on Oracle
+    restock()
+    def terminal():
+        for _ in range(baskets):
+            basket = app.Basket()
+            basket.add('M005', 1)
+            basket.add('M011', 1)
+            basket.abandon()
+    def run():
+        threads = [threading.Thread(target=terminal) for _ in range(terminals)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+    timed(f"{terminals} terminals x {baskets} two-line baskets", run)
+    print(f"  reservations {app.reservations.stats()}")
+
+@benchmark('checkout')
+def bench_checkout(baskets=500):
+    restock()
+    basket = [('M005', 1), ('M011', 2), ('M018', 1), ('M024', 3), ('M002', 1)]
+    timed(f"checkout ({len(basket)}-line basket)", lambda: app.checkout('C001', basket, 'Cash'), repeat=baskets)
+
+@benchmark('stream')
+def bench_stream(chunk_sizes=(50, 200, 1000)):
+    # Rows into a Treeview: fetchall and one insert loop, where the first row shows only once every
+    # row is in, versus TreeviewStreamer's time to first row and to the last at each chunk size
+    query = "SELECT a.medicine_id, b.medicine_id, c.medicine_id FROM MEDICINE a, MEDICINE b, MEDICINE c"
+    try:
+        root = app.Tk()
+    except app.TclError as e:
+        print(f"  skipped, no display: {e}")
+        return
+    root.withdraw()
+    tree = app.ttk.Treeview(root, columns=('a', 'b', 'c'), show='headings')
+    rows = len(app.dbms.fetch_query(query))
+
+    def fetchall():
+        tree.delete(*tree.get_children())
+        for record in app.dbms.fetch_query(query):
+            tree.insert("", "end", values=tuple(record))
+        root.update()
+    elapsed = timed(f"fetchall + insert loop ({rows:,} rows)", fetchall)
+    print(f"  {'first row':<45} {elapsed * 1000:10.2f} ms")
+
+    for chunk_size in chunk_sizes:
+        tree.delete(*tree.get_children())
+        streamer = app.TreeviewStreamer(tree, chunk_size)
+        done = []
+        streamer.start(lambda size: app.dbms.iter_query(query, (), size), on_done=done.append)
+        while not done:
+            root.update()
+        print(f"  TreeviewStreamer chunk_size={chunk_size:<5} first row {streamer.metrics['first_row']:10.2f} ms"
+              f"   all rows {streamer.metrics['complete']:10.2f} ms")
+    root.destroy()
+
+def discount_rules(medicines, brands, count=500):
+    # A promotions calendar: date windows, medicine and brand scopes, segments, quantity breaks and stacking
+    today = datetime.date.today()
+    rules = []
+    for i in range(count):
+        scope = {}
+        if i % 3 == 0:
+            scope['medicine_ids'] = [f"M{(i * 37 + k) % medicines:05d}" for k in range(20)]
+        elif i % 3 == 1:
+            scope['brands'] = [f"Brand {(i + k) % brands}" for k in range(3)]
+        window = datetime.timedelta(days=i % 60)
+        rules.append(app.DiscountRule(f"Rule {i}", 1 + i % 15, starts=today - window, ends=today + window,
+                                      segment=(None, 'first_time', 'returning')[i % 3 == 0 and i % 2],
+                                      min_quantity=1 + i % 4 * 5, priority=i % 7, stackable=i % 5 == 0, **scope))
+    return rules
+
+def naive_price(rules, lines, segment, on):
+    # Every rule checked against every line, the way per-line strategies would do it
+    subtotals = []
+    for medicine_id, brand, quantity, unit_price in lines:
+        multiplier = 1.0
+        for rule in sorted(rules, key=lambda rule: -rule.priority):
+            if (rule.active(on, segment) and quantity >= rule.min_quantity
+                    and ((not rule.medicine_ids and not rule.brands)
+                         or medicine_id in rule.medicine_ids or brand in rule.brands)):
+                multiplier *= rule.multiplier
+                if not rule.stackable:
+                    break
+        subtotals.append(round(quantity * unit_price * multiplier, 2))
+    return subtotals
+
+@benchmark('discounts')
+def bench_discounts(lines=10000, medicines=5000, brands=100):
+    rules = discount_rules(medicines, brands)
+    basket = [(f"M{i * 7919 % medicines:05d}", f"Brand {i * 7919 % medicines % brands}", 1 + i % 25, 10 + i % 90)
+              for i in range(lines)]
+    engine = app.DiscountEngine(rules)
+    customer = 'C001'
+    assert engine.price_lines(basket, customer) == naive_price(rules, basket, engine.segment(customer), datetime.date.today())
+    timed(f"compile + price {lines}-line basket", lambda: app.DiscountEngine(rules).price_lines(basket, customer), repeat=5)
+    timed(f"price {lines}-line basket (compiled)", lambda: engine.price_lines(basket, customer), repeat=20)
+    timed(f"every rule per line (first 1000 lines)", lambda: naive_price(rules, basket[:1000], 'returning', datetime.date.today()))
+
+# The customer history query before it was split into streams, kept for comparison
+LEGACY_HISTORY_QUERY = """
+    SELECT C.customer_id, C.c_name, P.prescription_id, M.m_name, SI.quantity, S.sale_date,
+           (SELECT MAX(P1.prescription_id) FROM PRESCRIPTION P1 WHERE P1.customer_id = C.customer_id)
+    FROM CUSTOMER C
+    JOIN PRESCRIPTION P ON C.customer_id = P.customer_id
+    JOIN SALES S ON C.customer_id = S.customer_id
+    JOIN SALES_ITEMS SI ON SI.sale_id = S.sale_id
+    JOIN MEDICINE M ON M.medicine_id = SI.medicine_id
+    WHERE C.customer_id = :1
+"""
+
+@benchmark('history')
+def bench_history(prescriptions=50, sales=40, items_per_sale=5):
+    # A regular customer: 50 prescriptions and 200 sale items
+    restock()
+    customer = app.id_allocator['CUSTOMER'].next()
+    app.CustomerInsert(customer, 'Regular Customer', 9876543210, 'regular@gmail.com', 'Chennai').perform_insert()
+    app.bulk_insert([app.PrescriptionInsert(app.id_allocator['PRESCRIPTION'].next(), customer, 'Dr. Rao',
+                                            f"{1 + day % 28:02d}-Jan-24", '1 tablet', 'Daily', '5 days', 'After food')
+                     for day in range(prescriptions)])
+    for _ in range(sales):
+        app.checkout(customer, [('M005', 1)] * items_per_sale, 'Cash')
+
+    rows = app.dbms.fetch_query(LEGACY_HISTORY_QUERY, (customer,))
+    print(f"  cross product query returns {len(rows):,} rows")
+    timed("cross product query", lambda: app.dbms.fetch_query(LEGACY_HISTORY_QUERY, (customer,)), repeat=20)
+
+    def streams():
+        history = app.CustomerHistory(customer)
+        latest_prescription(customer)
+        history.prescriptions.first_page()
+        history.purchases.first_page()
+    timed("latest + first page of each stream", streams, repeat=20)
+
+    def drain():
+        history = app.CustomerHistory(customer)
+        for stream in (history.prescriptions, history.purchases):
+            page = stream.first_page()
+            while len(page) == stream.page_size:
+                page = stream.page_after(str(page[-1][0]))
+    timed("every page of both streams", drain, repeat=20)
+
+# How the history screen found a customer's latest prescription before CUSTOMER_SUMMARY
+def latest_prescription(customer):
+    latest = app.HistoryStream(app.CustomerHistory.PRESCRIPTIONS_QUERY, 'prescription_date', 'prescription_id',
+                               customer, page_size=1)
+    rows = latest.first_page()
+    return rows[0] if rows else None
+
+@benchmark('summary')
+def bench_summary(sales=200):
+    # Counter lookup of a regular customer: the summary row versus aggregating their sales and prescriptions
+    restock()
+    customer = app.id_allocator['CUSTOMER'].next()
+    app.CustomerInsert(customer, 'Summary Customer', 9876543211, 'summary@gmail.com', 'Chennai').perform_insert()
+    for _ in range(sales):
+        app.checkout(customer, [('M005', 1), ('M011', 1)], 'Cash')
+    def aggregate():
+        app.dbms.fetch_query("SELECT SUM(total_amount), COUNT(*), MAX(sale_date) FROM SALES WHERE customer_id = :1", (customer,))
+        latest_prescription(customer)
+    timed("aggregate over SALES and PRESCRIPTION", aggregate, repeat=2000)
+    timed("CustomerSummary.lookup", lambda: app.CustomerSummary.lookup(customer), repeat=2000)
+    timed("CustomerSummary.rebuild", app.CustomerSummary.rebuild, repeat=5)
+
+@benchmark('screens')
+def bench_screens(switches=50):
+    # Home <-> insert-medicine navigation: a fresh Tk window per screen versus the cached screens
+    screens = (app.introscreen, app.insertbymedicine)
+    try:
+        app.application.show(screens[0])
+    except app.TclError as e:
+        print(f"  skipped, no display: {e}")
+        return
+    root = app.application.root
+    def rebuild():
+        for builder in screens:
+            window = app.Tk()
+            builder(app.Screen(window))
+            window.update_idletasks()
+            window.destroy()
+    def switch():
+        for builder in screens:
+            app.application.show(builder)
+            root.update_idletasks()
+    timed("new Tk window and build per switch", rebuild, repeat=switches)
+    timed("Application.show of a cached screen", switch, repeat=switches)
+
+@benchmark('assets')
+def bench_assets(opens=30):
+    # One open of every screen: decoding and scaling bgpic.jpg each time versus the asset cache
+    from PIL import Image, ImageOps
+    size = (1000, 750)
+    path = app.assets.path('bgpic.jpg')
+    def decode():
+        with Image.open(path) as source:
+            ImageOps.fit(source.convert('RGB'), size, Image.LANCZOS)
+    timed("decode and scale per screen open", decode, repeat=opens)
+    timed("AssetManager.image", lambda: app.assets.image('bgpic.jpg', size), repeat=opens)
+    print('\n'.join('  ' + line for line in app.assets.report().splitlines()))
+
+# Generated volumes for the index benchmark; SALES_ITEMS gets SALES x ITEMS_PER_SALE rows
+INDEX_BENCH_CUSTOMERS = 50000
+INDEX_BENCH_MEDICINES = 20000
+INDEX_BENCH_SALES = 400000
+INDEX_BENCH_ITEMS_PER_SALE = 5
+
+def generate(cursor, table, count, select):
+    # Inserts count rows built by select from a counter i = 1..count, entirely inside SQLite
+    cursor.execute(f"INSERT INTO {table} WITH RECURSIVE n(i) AS (SELECT 1 UNION ALL SELECT i + 1 FROM n WHERE i < {count}) "
+                   f"SELECT {select} FROM n")
+
+def build_index_bench_db(backend):
+    customers, medicines, sales = INDEX_BENCH_CUSTOMERS, INDEX_BENCH_MEDICINES, INDEX_BENCH_SALES
+    with backend.checkout() as (connection, cursor):
+        generate(cursor, 'SUPPLIER', 100, "printf('S%03d', i), 'Supplier ' || i, 9000000000 + i, 's' || i || '@gmail.com', 'Chennai'")
+        generate(cursor, 'MEDICINE', medicines,
+                 "printf('M%05d', i), 'Medicine ' || i, 'Brand', printf('BATCH%03d', i % 1000), "
+                 "date('now', ((i * 7919) % 1460 - 365) || ' days'), 1000000000, 10 + i % 90, printf('S%03d', 1 + i % 100)")
+        generate(cursor, 'CUSTOMER', customers, "printf('C%05d', i), 'Customer ' || i, 9000000000 + i, 'c' || i || '@gmail.com', 'Chennai'")
+        generate(cursor, 'PRESCRIPTION', customers * 2,
+                 f"printf('P%06d', i), printf('C%05d', 1 + (i * 7) % {customers}), 'Dr. Rao', date('now', -(i % 700) || ' days'), "
+                 "'1 tablet', 'Twice a day', '5 days', 'After food'")
+        generate(cursor, 'SALES', sales,
+                 f"printf('S%06d', i), printf('C%05d', 1 + (i * 13) % {customers}), date('now', -(i % 700) || ' days'), 100, 'Cash'")
+        # The stock trigger is not what is being measured, so it is dropped for the load
+        cursor.execute("DROP TRIGGER update_medicine_stock")
+        generate(cursor, 'SALES_ITEMS', sales * INDEX_BENCH_ITEMS_PER_SALE,
+                 f"printf('SI%07d', i), printf('S%06d', 1 + (i - 1) / {INDEX_BENCH_ITEMS_PER_SALE}), "
+                 f"printf('M%05d', 1 + (i * 31) % {medicines}), 1, 10, 10")
+        connection.commit()
+
+@benchmark('indexes')
+def bench_indexes(lookups=5):
+    # Customer history and stock alert queries on a generated database, before and after the index migration
+    backend = app.SQLiteBackend()
+    migrator = app.SchemaMigrator(backend)
+    index_version = next(version for version, name, path in migrator.scripts() if name.endswith('_indexes.sql'))
+    migrator.migrate(target=index_version - 1)
+    start = time.perf_counter()
+    build_index_bench_db(backend)
+    print(f"  generated {INDEX_BENCH_SALES * INDEX_BENCH_ITEMS_PER_SALE:,} sales items in {time.perf_counter() - start:.1f} s")
+
+    customers = [f"C{1 + (i * 977) % INDEX_BENCH_CUSTOMERS:05d}" for i in range(lookups)]
+    def run(label):
+        with backend.checkout() as (connection, cursor):
+            ids = iter(customers)
+            def history():
+                history = app.CustomerHistory(next(ids))
+                for stream in (history.prescriptions, history.purchases):
+                    backend.execute(cursor, *stream.page_query())
+                    cursor.fetchall()
+            timed(f"{label}: customer history", history, repeat=lookups)
+            timed(f"{label}: check_near_expiry", lambda: backend.callproc(cursor, 'check_near_expiry'), repeat=5)
+            timed(f"{label}: check_low_stock", lambda: backend.callproc(cursor, 'check_low_stock'), repeat=5)
+
+    run("before")
+    start = time.perf_counter()
+    migrator.migrate(target=index_version)
+    print(f"  index migration took {time.perf_counter() - start:.1f} s")
+    run("after")
+    backend.close()
+
+def main():
+    parser = argparse.ArgumentParser(description='Medical Management System benchmarks')
+    parser.add_argument('names', nargs='*', help='benchmarks to run: ' + ', '.join(BENCHMARKS))
+    args = parser.parse_args()
+    unknown = set(args.names) - set(BENCHMARKS)
+    if unknown:
+        parser.error('unknown benchmark: ' + ', '.join(sorted(unknown)))
+    for name in args.names or BENCHMARKS:
+        print(f"[{name}] backend={app.dbms.backend.name}")
+        BENCHMARKS[name]()
+
+if __name__ == '__main__':
+    main()
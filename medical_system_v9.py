@@ -1,13 +1,592 @@
-from tkinter import * 
-from tkinter import messagebox,ttk,Tk, Frame, Label, ttk, Scrollbar, VERTICAL, HORIZONTAL
-from PIL import Image, ImageTk
-from customtkinter import *
-import cx_Oracle
+# Startup is timed from here; run with --profile-startup to print where the time went
+import time
+_started = time.perf_counter()
+
+import heapq
+import os
+import queue
 import re
+import socket
+import sqlite3
+import sys
+import threading
+import uuid
+from bisect import bisect_left, bisect_right, insort
+from collections import OrderedDict, deque
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
 from datetime import datetime, timedelta
 
+# Wall-clock stages of startup, recorded from any thread. Marks are points in time since
+# _started, optionally checked against a budget in milliseconds.
+class StartupProfiler:
+    def __init__(self, started):
+        self.started = started
+        self._lock = threading.Lock()
+        self.stages = []  # (name, thread name, offset ms, duration ms)
+        self.marks = []  # (name, offset ms, budget ms or None)
+
+    def elapsed_ms(self):
+        return (time.perf_counter() - self.started) * 1000
+
+    @contextmanager
+    def stage(self, name):
+        offset = self.elapsed_ms()
+        try:
+            yield
+        finally:
+            duration = self.elapsed_ms() - offset
+            with self._lock:
+                self.stages.append((name, threading.current_thread().name, offset, duration))
+
+    def mark(self, name, budget_ms=None):
+        with self._lock:
+            self.marks.append((name, self.elapsed_ms(), budget_ms))
+
+    def report(self):
+        with self._lock:
+            stages, marks = list(self.stages), list(self.marks)
+        rows = [(offset, f"  {offset:8.1f} +{duration:8.1f}  {name} [{thread}]") for name, thread, offset, duration in stages]
+        for name, offset, budget_ms in marks:
+            verdict = '' if budget_ms is None else f" ({'within' if offset <= budget_ms else 'OVER'} {budget_ms} ms budget)"
+            rows.append((offset, f"  {offset:8.1f}            {name}{verdict}"))
+        rows.sort(key=lambda row: row[0])
+        return '\n'.join(['Startup profile (ms since the first import)'] + [line for offset, line in rows])
+
+profiler = StartupProfiler(_started)
+profiler.mark('standard library imported')
+
+with profiler.stage('import tkinter'):
+    from tkinter import *
+    from tkinter import messagebox,ttk,Tk, Frame, Label, ttk, Scrollbar, VERTICAL, HORIZONTAL
+
+# Loaded on first use: PIL by AssetManager when the first image is drawn, cx_Oracle by the
+# Oracle backend on the database thread, so neither delays the login window
+Image = ImageOps = ImageTk = None
+cx_Oracle = None
+
+# Errors raised by any storage backend, for code that handles database failures itself;
+# the Oracle driver's errors join once it is loaded
+DATABASE_ERRORS = (sqlite3.DatabaseError,)
+
+def load_oracle_driver():
+    global cx_Oracle, DATABASE_ERRORS
+    if cx_Oracle is None:
+        with profiler.stage('import cx_Oracle'):
+            import cx_Oracle
+        DATABASE_ERRORS = (sqlite3.DatabaseError, cx_Oracle.DatabaseError)
+    return cx_Oracle
+
+# Object Pool Pattern - Hands out Oracle connections one operation at a time
+class ConnectionPool:
+    PING_AFTER = 5.0  # Seconds a session may sit idle before checkouts ping it again
+
+    def __init__(self, username, password, dsn, min_size=2, max_size=8, increment=1, wait_timeout=5000):
+        self.min_size = min_size
+        self.max_size = max_size
+        # Timed wait so a starved terminal gets an error after wait_timeout ms instead of hanging
+        self.pool = cx_Oracle.SessionPool(user=username, password=password, dsn=dsn,
+                                          min=min_size, max=max_size, increment=increment,
+                                          threaded=True, getmode=cx_Oracle.SPOOL_ATTRVAL_TIMEDWAIT,
+                                          wait_timeout=wait_timeout)
+        self._lock = threading.Lock()
+        self._released_at = {}  # Connection released healthy in the last PING_AFTER s -> time.monotonic() of it
+        self.checkouts = 0
+        self.failed_health_checks = 0
+        self.total_wait = 0.0
+        self.max_wait = 0.0
+
+    def _acquire_healthy(self):
+        # A session released moments ago is trusted as is; anything older is pinged first.
+        # Stale sessions (network drop, DB restart) are dropped until a live one turns up, and
+        # after max_size + 1 failures in a row the last error is raised.
+        for attempt in range(self.max_size + 1):
+            connection = self.pool.acquire()
+            with self._lock:
+                released_at = self._released_at.pop(connection, None)
+            if released_at is not None and time.monotonic() - released_at < self.PING_AFTER:
+                return connection
+            try:
+                connection.ping()
+                return connection
+            except cx_Oracle.DatabaseError:
+                with self._lock:
+                    self.failed_health_checks += 1
+                self._drop(connection)
+                if attempt == self.max_size:
+                    raise
+
+    def _drop(self, connection):
+        with self._lock:
+            self._released_at.pop(connection, None)
+        self.pool.drop(connection)
+
+    def _release(self, connection):
+        # Only sessions that just completed an operation are marked fresh; older marks are
+        # forgotten, which also clears sessions the pool closed on its own
+        now = time.monotonic()
+        with self._lock:
+            self._released_at = {released: at for released, at in self._released_at.items()
+                                 if now - at < self.PING_AFTER}
+            self._released_at[connection] = now
+        self.pool.release(connection)
+
+    @contextmanager
+    def connection(self):
+        start = time.perf_counter()
+        connection = self._acquire_healthy()
+        waited = time.perf_counter() - start
+        with self._lock:
+            self.checkouts += 1
+            self.total_wait += waited
+            self.max_wait = max(self.max_wait, waited)
+        try:
+            yield connection
+        except cx_Oracle.DatabaseError:
+            # The session itself may be what failed (ORA-03113/03135), so it never goes back
+            self._drop(connection)
+            raise
+        except BaseException:
+            try:
+                connection.rollback()
+            except cx_Oracle.DatabaseError:
+                self._drop(connection)  # Raising here would hide the original error
+            else:
+                self.pool.release(connection)
+            raise
+        self._release(connection)
+
+    def stats(self):
+        with self._lock:
+            checkouts = self.checkouts
+            avg_wait = self.total_wait / checkouts if checkouts else 0.0
+            return {
+                'min': self.min_size,
+                'max': self.max_size,
+                'opened': self.pool.opened,
+                'busy': self.pool.busy,
+                'checkouts': checkouts,
+                'avg_wait_ms': avg_wait * 1000,
+                'max_wait_ms': self.max_wait * 1000,
+                'failed_health_checks': self.failed_health_checks,
+            }
+
+    def close(self):
+        self.pool.close()
+
+# Tables whose IDs come from the sequence-backed IdAllocator: table -> (id column, prefix).
+# Every table has its own prefix; suppliers created before SUP shared S with sales.
+ID_SEQUENCES = {
+    'SUPPLIER': ('supplier_id', 'SUP'),
+    'MEDICINE': ('medicine_id', 'M'),
+    'CUSTOMER': ('customer_id', 'C'),
+    'PRESCRIPTION': ('prescription_id', 'P'),
+    'SALES': ('sale_id', 'S'),
+    'SALES_ITEMS': ('sale_item_id', 'SI'),
+}
+ID_BLOCK_SIZE = 20  # IDs reserved per round trip; the sequences increment by this much
+# Allocated IDs are zero-padded to a fixed width so they sort in numeric order. The longest
+# prefix plus ID_DIGITS stays well inside the VARCHAR2(20) ID columns of the wide_id_columns migration.
+ID_DIGITS = 10
+
+def _first_free_id(cursor, table, column, prefix):
+    # Number after the highest existing ID, so allocated IDs never collide with existing rows
+    cursor.execute(f"SELECT {column} FROM {table}")
+    pattern = re.compile(rf'^{prefix}(\d+)$')
+    numbers = [int(match.group(1)) for (value,) in cursor.fetchall() if (match := pattern.match(value or ''))]
+    return max(numbers, default=0) + 1
+
+# Bridge Pattern - DatabaseManager delegates storage work to a backend
+class OracleBackend:
+    name = 'oracle'
+
+    def __init__(self, username, password, dsn="localhost:1521", pool_min=None, pool_max=None):
+        self.DatabaseError = load_oracle_driver().DatabaseError
+        self._lock = threading.RLock()  # Guards the shared connection when not pooled
+        self.pool = None
+        self.connection = None
+        self.cursor = None
+        if pool_max:
+            # Pooled mode: every operation checks out its own connection
+            self.pool = ConnectionPool(username, password, dsn, min_size=pool_min or 1, max_size=pool_max)
+        else:
+            self.connection = cx_Oracle.connect(user=username, password=password, dsn=dsn)
+            self.cursor = self.connection.cursor()
+
+    @contextmanager
+    def checkout(self):
+        # Yields a (connection, cursor) pair for the duration of a single operation
+        if self.pool is None:
+            with self._lock:
+                yield self.connection, self.cursor
+            return
+        with self.pool.connection() as connection:
+            cursor = connection.cursor()
+            try:
+                yield connection, cursor
+            finally:
+                cursor.close()
+
+    def execute(self, cursor, query, params=()):
+        cursor.execute(query, params)
+
+    def limit(self, query, count):
+        return f"{query} FETCH FIRST {int(count)} ROWS ONLY"
+
+    def for_update(self, query):
+        return f"{query} FOR UPDATE"
+
+    def executemany(self, cursor, query, rows):
+        # Batch errors let the good rows through and report the bad ones by offset
+        cursor.executemany(query, rows, batcherrors=True)
+        return [(error.offset, error.message) for error in cursor.getbatcherrors()]
+
+    def update_counts(self, cursor, query, rows):
+        # One array DML round trip, with the number of rows each set of binds updated
+        cursor.executemany(query, rows, arraydmlrowcounts=True)
+        return cursor.getarraydmlrowcounts()
+
+    def set_stock_trigger(self, cursor, enabled):
+        # update_medicine_stock skips sessions whose CLIENT_INFO is 'stock_engine'
+        cursor.callproc('DBMS_APPLICATION_INFO.SET_CLIENT_INFO', ['' if enabled else 'stock_engine'])
+
+    def callproc(self, cursor, name):
+        # The procedures return their rows through a single OUT ref cursor
+        result = cursor.var(cx_Oracle.CURSOR)
+        cursor.callproc(name, [result])
+        return result.getvalue().fetchall()
+
+    def reserve_ids(self, cursor, sequence):
+        # The sequence increments by ID_BLOCK_SIZE, so one NEXTVAL reserves a whole block
+        cursor.execute(f"SELECT {sequence}.NEXTVAL FROM dual")
+        return cursor.fetchone()[0]
+
+    # Errors a migration statement raises when its object is already in place
+    ALREADY_EXISTS = ('ORA-00955', 'ORA-01408', 'ORA-01430', 'ORA-02260', 'ORA-02261', 'ORA-02264', 'ORA-02275')
+
+    def already_exists(self, error):
+        return str(error).startswith(self.ALREADY_EXISTS)
+
+    def seed_data(self):
+        pass  # The Oracle schema is populated with Medical_Management_System.sql
+
+    def stats(self):
+        return self.pool.stats() if self.pool else None
+
+    def close(self):
+        if self.pool:
+            self.pool.close()
+        else:
+            self.cursor.close()
+            self.connection.close()
+
+
+def _sqlite_to_date(value, fmt):
+    # Oracle TO_DATE for the seed script; dates are stored as ISO strings
+    fmt = fmt.upper().replace('YYYY', '%Y').replace('MM', '%m').replace('DD', '%d')
+    return datetime.strptime(value, fmt).strftime('%Y-%m-%d')
+
+def _sqlite_parse_date(value):
+    return datetime.strptime(value.decode()[:10], '%Y-%m-%d')
+
+sqlite3.register_converter('DATE', _sqlite_parse_date)
+
+# Embedded engine so the app and the benchmarks can run without an Oracle instance
+class SQLiteBackend:
+    name = 'sqlite'
+    DatabaseError = sqlite3.DatabaseError
+    SCHEMA_SCRIPT = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'Medical_Management_System.sql')
+    NEAR_EXPIRY_DAYS = 30
+    LOW_STOCK_THRESHOLD = 50
+
+    # Emulation of the Oracle procedures the app calls
+    PROCEDURES = {
+        'check_near_expiry': """
+            SELECT m_name, expiry_date,
+                   CAST(julianday(expiry_date) - julianday(date('now')) AS INTEGER) AS days_remaining
+            FROM MEDICINE
+            WHERE expiry_date BETWEEN date('now') AND date('now', '+{near_expiry_days} days')
+            ORDER BY expiry_date
+        """,
+        'check_low_stock': """
+            SELECT m_name, quantity
+            FROM MEDICINE
+            WHERE quantity < {low_stock_threshold}
+            ORDER BY quantity
+        """,
+    }
+
+    def __init__(self, path=':memory:', seed=False):
+        self._lock = threading.RLock()  # One connection shared by the GUI and worker threads
+        self.seed = seed
+        self.connection = sqlite3.connect(path, check_same_thread=False, detect_types=sqlite3.PARSE_DECLTYPES)
+        self.connection.create_function('TO_DATE', 2, _sqlite_to_date)
+        self._stock_trigger_enabled = True
+        self.connection.create_function('stock_trigger_enabled', 0, lambda: int(self._stock_trigger_enabled))
+        self.connection.execute('PRAGMA foreign_keys = ON')
+        self.cursor = self.connection.cursor()
+
+    @contextmanager
+    def checkout(self):
+        with self._lock:
+            yield self.connection, self.cursor
+
+    def _adapt(self, value):
+        if isinstance(value, datetime):
+            return value.strftime('%Y-%m-%d')
+        if isinstance(value, str) and re.match(r'^\d{1,2}-[A-Za-z]{3}-\d{2}$', value):
+            try:  # DD-MON-YY strings that Oracle would convert implicitly
+                return datetime.strptime(value, '%d-%b-%y').strftime('%Y-%m-%d')
+            except ValueError:
+                return value
+        return value
+
+    def translate(self, query, params=()):
+        # Oracle positional binds (:1, :2) become SQLite numbered binds (?1, ?2)
+        if isinstance(params, dict):
+            return query, {key: self._adapt(value) for key, value in params.items()}
+        query = re.sub(r'(?<![\w:]):(\d+)', r'?\1', query)
+        return query, tuple(self._adapt(value) for value in params)
+
+    def execute(self, cursor, query, params=()):
+        if query.strip().upper() == 'COMMIT':
+            return  # DatabaseManager commits after every statement already
+        cursor.execute(*self.translate(query, params))
+
+    def limit(self, query, count):
+        return f"{query} LIMIT {int(count)}"
+
+    def for_update(self, query):
+        # The caller's transaction holds the only connection, so nothing can write in between
+        return query
+
+    def executemany(self, cursor, query, rows):
+        # In-process engine, so row-at-a-time costs no round trips; a failing row only
+        # rolls back its own statement, like Oracle batch errors
+        errors = []
+        for index, params in enumerate(rows):
+            try:
+                cursor.execute(*self.translate(query, params))
+            except sqlite3.DatabaseError as e:
+                errors.append((index, str(e)))
+        return errors
+
+    def update_counts(self, cursor, query, rows):
+        return [cursor.execute(*self.translate(query, params)).rowcount for params in rows]
+
+    def set_stock_trigger(self, cursor, enabled):
+        # Read by the stock_trigger_enabled() function in the update_medicine_stock trigger.
+        # The connection is shared, but the caller's transaction holds it until it is switched back
+        self._stock_trigger_enabled = enabled
+
+    def reserve_ids(self, cursor, sequence):
+        cursor.execute("SELECT 1 FROM ID_SEQUENCES WHERE name = ?", (sequence,))
+        if cursor.fetchone() is None:
+            table = sequence[:-len('_ID_SEQ')]
+            start = _first_free_id(cursor, table, *ID_SEQUENCES[table])
+            cursor.execute("INSERT INTO ID_SEQUENCES VALUES (?, ?)", (sequence, start))
+        cursor.execute("UPDATE ID_SEQUENCES SET next_value = next_value + ? WHERE name = ?", (ID_BLOCK_SIZE, sequence))
+        cursor.execute("SELECT next_value - ? FROM ID_SEQUENCES WHERE name = ?", (ID_BLOCK_SIZE, sequence))
+        return cursor.fetchone()[0]
+
+    def callproc(self, cursor, name):
+        query = self.PROCEDURES[name].format(near_expiry_days=self.NEAR_EXPIRY_DAYS,
+                                             low_stock_threshold=self.LOW_STOCK_THRESHOLD)
+        cursor.execute(query)
+        return cursor.fetchall()
+
+    def _script_statements(self):
+        with open(self.SCHEMA_SCRIPT) as script:
+            lines = [line for line in script
+                     if not line.strip().upper().startswith(('REM', 'SET '))]
+        return [statement.strip() for statement in ''.join(lines).split(';') if statement.strip()]
+
+    def already_exists(self, error):
+        return 'already exists' in str(error)
+
+    def seed_data(self):
+        # Sample rows from Medical_Management_System.sql, loaded once into an empty database
+        if not self.seed:
+            return
+        with self.checkout() as (connection, cursor):
+            cursor.execute("SELECT COUNT(*) FROM MEDICINE")
+            if cursor.fetchone()[0]:
+                return
+            for statement in self._script_statements():
+                if statement.upper().startswith('INSERT'):
+                    cursor.execute(statement)
+            connection.commit()
+
+    def stats(self):
+        return None
+
+    def close(self):
+        self.cursor.close()
+        self.connection.close()
+
+# Applies migrations/<backend>/NNN_name.sql scripts newer than the version in SCHEMA_VERSION.
+# Statements are separated by lines holding only "/", so PL/SQL and trigger bodies keep their
+# semicolons; a statement failing because its object already exists is skipped.
+class SchemaMigrator:
+    DIRECTORY = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'migrations')
+
+    def __init__(self, backend):
+        self.backend = backend
+
+    def scripts(self):
+        directory = os.path.join(self.DIRECTORY, self.backend.name)
+        scripts = []
+        for filename in os.listdir(directory):
+            match = re.match(r'^(\d+)_\w+\.sql$', filename)
+            if match:
+                scripts.append((int(match.group(1)), filename, os.path.join(directory, filename)))
+        return sorted(scripts)
+
+    @staticmethod
+    def statements(path):
+        with open(path) as script:
+            lines = [line for line in script if not line.lstrip().startswith('--')]
+        statements, current = [], []
+        for line in lines + ['/\n']:
+            if line.strip() == '/':
+                if ''.join(current).strip():
+                    statements.append(''.join(current).strip())
+                current = []
+            else:
+                current.append(line)
+        return statements
+
+    def current_version(self, cursor):
+        try:
+            cursor.execute("SELECT MAX(version) FROM SCHEMA_VERSION")
+        except self.backend.DatabaseError:
+            return None  # Not created yet: nothing has been applied
+        return cursor.fetchone()[0] or 0
+
+    def migrate(self, target=None):
+        # Brings the schema up to target (default: the newest script)
+        scripts = [script for script in self.scripts() if target is None or script[0] <= target]
+        latest = scripts[-1][0] if scripts else 0
+        with self.backend.checkout() as (connection, cursor):
+            current = self.current_version(cursor)
+            if current is not None and current >= latest:
+                return current
+            if current:
+                current = self._renumber(cursor, scripts)
+                connection.commit()
+            if current is None:
+                self._run(cursor, "CREATE TABLE SCHEMA_VERSION (version INT PRIMARY KEY, "
+                                  "name VARCHAR2(100) NOT NULL, applied_on DATE NOT NULL)")
+                current = 0
+            for version, name, path in scripts:
+                if version <= current:
+                    continue
+                for statement in self.statements(path):
+                    self._run(cursor, statement)
+                self.backend.execute(cursor, "INSERT INTO SCHEMA_VERSION (version, name, applied_on) VALUES (:1, :2, :3)",
+                                     (version, name, datetime.now()))
+                connection.commit()
+                print(f"Applied migration {name}")
+        return latest
+
+    def _renumber(self, cursor, scripts):
+        # Applied scripts are matched to the scripts on disk by name, so a database migrated before
+        # a script was renumbered (SQLite gained a no-op 004 to line up with Oracle) keeps its place
+        numbers = {name.split('_', 1)[1]: (version, name) for version, name, path in scripts}
+        cursor.execute("SELECT version, name FROM SCHEMA_VERSION ORDER BY version DESC")
+        for version, name in cursor.fetchall():
+            renumbered, new_name = numbers.get(name.split('_', 1)[1], (version, name))
+            if renumbered != version:
+                self.backend.execute(cursor, "UPDATE SCHEMA_VERSION SET version = :1, name = :2 WHERE version = :3",
+                                     (renumbered, new_name, version))
+        return self.current_version(cursor)
+
+    def _run(self, cursor, statement):
+        try:
+            cursor.execute(statement)
+        except self.backend.DatabaseError as e:
+            if not self.backend.already_exists(e):
+                raise
+
+# Handle on an open DatabaseManager.transaction(); savepoints allow retrying part of it
+class Transaction:
+    def __init__(self, db, connection, cursor):
+        self.db = db
+        self.connection = connection
+        self.cursor = cursor
+        self.written = set()  # Tables to invalidate again once the transaction ends
+        self.on_commit = []  # Callbacks deferred until the commit succeeds
+
+    def savepoint(self, name):
+        self.db.backend.execute(self.cursor, f"SAVEPOINT {name}")
+
+    def rollback_to(self, name):
+        self.db.backend.execute(self.cursor, f"ROLLBACK TO SAVEPOINT {name}")
+
+# In-process read-through cache for query results with TTL expiry and LRU eviction.
+# Entries remember the tables they read so writes can invalidate them per table.
+class QueryCache:
+    def __init__(self, max_entries=512, ttl=30.0):
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self._entries = OrderedDict()  # (query, params) -> (expires_at, rows, tables)
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.invalidations = 0
+
+    def get(self, key):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None or entry[0] < time.monotonic():
+                if entry is not None:
+                    del self._entries[key]
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry[1]
+
+    def put(self, key, rows, tables):
+        with self._lock:
+            self._entries[key] = (time.monotonic() + self.ttl, rows, tables)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+    def invalidate(self, tables):
+        with self._lock:
+            stale = [key for key, entry in self._entries.items() if entry[2] & tables]
+            for key in stale:
+                del self._entries[key]
+            self.invalidations += len(stale)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self):
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                'entries': len(self._entries),
+                'hits': self.hits,
+                'misses': self.misses,
+                'hit_ratio': self.hits / lookups if lookups else 0.0,
+                'evictions': self.evictions,
+                'invalidations': self.invalidations,
+            }
+
 # Establishing Oracle SQL Connectivity using Singleton class
 class DatabaseManager:
+    # Reference tables that are read far more often than written
+    CACHED_TABLES = frozenset({'SUPPLIER', 'MEDICINE', 'CUSTOMER'})
+    # Writes to a table that also change another one through a trigger
+    WRITE_DEPENDENCIES = {'SALES_ITEMS': {'MEDICINE'}}
+    WRITE_PATTERN = re.compile(r'^\s*(?:INSERT\s+INTO|UPDATE|DELETE\s+FROM|DELETE|MERGE\s+INTO)\s+(\w+)', re.IGNORECASE)
+
     _instance = None
 
     def __new__(cls, *args, **kwargs):
@@ -15,94 +594,241 @@ class DatabaseManager:
             cls._instance = super(DatabaseManager, cls).__new__(cls)
         return cls._instance
 
-    def __init__(self, username, password):
+    def __init__(self, username=None, password=None, dsn="localhost:1521", pool_min=None, pool_max=None, backend=None):
         if not hasattr(self, 'initialized'):  # Avoid re-initialization
-            try:
-                dsn = "localhost:1521"
-                self.connection = cx_Oracle.connect(user=username, password=password, dsn=dsn)
-                self.cursor = self.connection.cursor()
-                print("Database connection established successfully.")
-
-                # Check for existing constraint before adding it
-                self.check_and_add_constraint(
-                    'SALES_ITEMS',
-                    'check_sales_item_quantity_positive',
-                    'CHECK (quantity > 0)'
-                )
-
-                # Drop existing trigger if it exists
-                try:
-                    self.execute_query("DROP TRIGGER update_medicine_stock", show_success=False)
-                except cx_Oracle.DatabaseError:
-                    pass  # Ignore error if trigger does not exist
-
-                # Define the trigger to update medicine stock after sale item insert
-                trigger_code = """
-                CREATE OR REPLACE TRIGGER update_medicine_stock
-                AFTER INSERT ON SALES_ITEMS
-                FOR EACH ROW
-                BEGIN
-                    UPDATE MEDICINE
-                    SET quantity = quantity - :NEW.quantity
-                    WHERE medicine_id = :NEW.medicine_id
-                    AND quantity >= :NEW.quantity;
-                    IF SQL%ROWCOUNT = 0 THEN
-                        RAISE_APPLICATION_ERROR(-20001, 'Insufficient stock in MEDICINE table.');
-                    END IF;
-                END;
-                """
-                self.execute_query(trigger_code, show_success=False)
+            # Runs on the database thread behind LazyDatabase, which reports errors to the GUI
+            self._local = threading.local()  # Per-thread open transaction, if any
+            self.cache = QueryCache()
+            self.backend = backend or OracleBackend(username, password, dsn, pool_min, pool_max)
+            print("Database connection established successfully.")
+
+            # Schema objects come from versioned migrations; an up-to-date schema costs one query
+            with profiler.stage('migrate schema'):
+                self.schema_version = SchemaMigrator(self.backend).migrate()
+            with profiler.stage('seed data'):
+                self.backend.seed_data()
+
+            self.initialized = True  # Set flag to indicate initialization
+
+    @contextmanager
+    def _session(self):
+        # Reuses the connection of an open transaction, otherwise checks one out and autocommits
+        tx = getattr(self._local, 'transaction', None)
+        if tx is not None:
+            yield tx.connection, tx.cursor, False
+            return
+        with self.backend.checkout() as (connection, cursor):
+            yield connection, cursor, True
 
-                self.initialized = True  # Set flag to indicate initialization
-            except cx_Oracle.DatabaseError as e:
-                messagebox.showerror("Database Error", str(e))
+    def in_transaction(self):
+        return getattr(self._local, 'transaction', None) is not None
+
+    @contextmanager
+    def raise_errors(self):
+        # Worker threads must not open message boxes; errors propagate to the caller instead
+        previous = getattr(self._local, 'raise_errors', False)
+        self._local.raise_errors = True
+        try:
+            yield
+        finally:
+            self._local.raise_errors = previous
+
+    def _raises_errors(self):
+        return self.in_transaction() or getattr(self._local, 'raise_errors', False)
+
+    @contextmanager
+    def transaction(self):
+        # Everything executed inside the block shares one connection and commits once;
+        # an exception rolls the whole block back. Nested blocks join the outer one.
+        if self.in_transaction():
+            yield self._local.transaction
+            return
+        with self.backend.checkout() as (connection, cursor):
+            tx = Transaction(self, connection, cursor)
+            self._local.transaction = tx
+            try:
+                yield tx
+                connection.commit()
+            except BaseException:
+                connection.rollback()
+                raise
+            finally:
+                self._local.transaction = None
+                # Other threads may have cached pre-commit rows, so drop them again at the end
+                self._invalidate(tx.written)
+        for callback in tx.on_commit:
+            callback()
+
+    def after_commit(self, callback):
+        # Runs the callback once the open transaction commits (never, if it rolls back), or right away
+        tx = getattr(self._local, 'transaction', None)
+        if tx is None:
+            callback()
+        else:
+            tx.on_commit.append(callback)
+
+    def _written_tables(self, query):
+        match = self.WRITE_PATTERN.match(query)
+        if not match:
+            return set()
+        table = match.group(1).upper()
+        return {table} | self.WRITE_DEPENDENCIES.get(table, set())
+
+    def _invalidate(self, tables):
+        if tables:
+            self.cache.invalidate(tables)
+
+    def _record_write(self, query):
+        tables = self._written_tables(query)
+        self._invalidate(tables)
+        tx = getattr(self._local, 'transaction', None)
+        if tx is not None:
+            tx.written |= tables
 
     def execute_query(self, query, params=(), success_message="Operation completed successfully", show_success=True):
         try:
-            self.cursor.execute(query, params)
-            self.connection.commit()
-        except cx_Oracle.DatabaseError as e:
+            try:
+                with self._session() as (connection, cursor, autocommit):
+                    self.backend.execute(cursor, query, params)
+                    if autocommit:
+                        connection.commit()
+            finally:
+                self._record_write(query)
+            return True
+        except DATABASE_ERRORS as e:
+            if self._raises_errors():
+                raise  # Let the transaction roll back, or the worker's caller, report it once
             error_message = str(e)
             if "ORA-20001" in error_message:  # Custom trigger error
                 messagebox.showerror("Trigger Error", "Trigger prevented the operation: Insufficient stock in MEDICINE table.")
             else:
                 messagebox.showerror("Database Error", error_message)
+            return False
 
-    def fetch_query(self, query, params=()):
+    def execute_many(self, batches):
+        # Array DML for [(query, rows), ...] in one transaction with a single commit.
+        # Returns the failed rows of each batch as [(row_index, error_message), ...]
+        errors = []
+        try:
+            with self._session() as (connection, cursor, autocommit):
+                for query, rows in batches:
+                    errors.append(self.backend.executemany(cursor, query, rows))
+                if autocommit:
+                    connection.commit()
+        finally:
+            for query, rows in batches:
+                self._record_write(query)
+        return errors
+
+    def update_counts(self, query, rows):
+        # Array DML returning the row count of each set of binds; errors always raise
         try:
-            self.cursor.execute(query, params)
-            return self.cursor.fetchall()
-        except cx_Oracle.DatabaseError as e:
+            with self._session() as (connection, cursor, autocommit):
+                counts = self.backend.update_counts(cursor, query, rows)
+                if autocommit:
+                    connection.commit()
+                return counts
+        finally:
+            self._record_write(query)
+
+    @contextmanager
+    def stock_trigger_bypassed(self):
+        # Inside a transaction: SALES_ITEMS inserts skip update_medicine_stock until the block ends
+        tx = self._local.transaction
+        self.backend.set_stock_trigger(tx.cursor, False)
+        try:
+            yield
+        finally:
+            self.backend.set_stock_trigger(tx.cursor, True)
+
+    def _cache_key(self, query, params, cache):
+        # Cache key and cached tables of a read, or (None, None) when it must go to the database
+        if not cache or self.in_transaction():
+            return None, None
+        tables = frozenset(re.findall(r'\w+', query.upper())) & self.CACHED_TABLES
+        return (query, tuple(params.items()) if isinstance(params, dict) else tuple(params)), tables
+
+    def fetch_query(self, query, params=(), cache=False):
+        # cache=True serves reference-table reads from the in-process cache. Reads inside a
+        # transaction always go to the database so they see the transaction's own writes
+        key, tables = self._cache_key(query, params, cache)
+        if tables:
+            rows = self.cache.get(key)
+            if rows is not None:
+                return list(rows)
+        try:
+            with self._session() as (connection, cursor, autocommit):
+                self.backend.execute(cursor, query, params)
+                rows = cursor.fetchall()
+            if tables:
+                self.cache.put(key, tuple(rows), tables)
+            return rows
+        except DATABASE_ERRORS as e:
+            if self._raises_errors():
+                raise
             messagebox.showerror("Database Error", str(e))
             return []
 
-    def close(self):
-        self.cursor.close()
-        self.connection.close()
+    def iter_query(self, query, params=(), size=500, cache=False):
+        # Yields rows in fetchmany batches so callers can use the first rows before the query
+        # finishes. The session stays checked out until the generator is exhausted or closed, so
+        # only drain it on a worker thread (see TreeviewStreamer). Errors always raise.
+        key, tables = self._cache_key(query, params, cache)
+        if tables:
+            rows = self.cache.get(key)
+            if rows is not None:
+                for start in range(0, len(rows), size):
+                    yield list(rows[start:start + size])
+                return
+        fetched = []
+        with self._session() as (connection, cursor, autocommit):
+            self.backend.execute(cursor, query, params)
+            while True:
+                rows = cursor.fetchmany(size)
+                if not rows:
+                    break
+                if tables:
+                    fetched.extend(rows)
+                yield rows
+        if tables:
+            self.cache.put(key, tuple(fetched), tables)
+
+    def callproc(self, name):
+        # Calls a procedure whose only parameter is an OUT ref cursor and returns its rows
+        with self._session() as (connection, cursor, autocommit):
+            return self.backend.callproc(cursor, name)
+
+    def reserve_ids(self, sequence):
+        # First ID of a fresh block of ID_BLOCK_SIZE from the sequence
+        with self._session() as (connection, cursor, autocommit):
+            start = self.backend.reserve_ids(cursor, sequence)
+            if autocommit:
+                connection.commit()
+        return start
+
+    def pool_stats(self):
+        # Pool size and checkout wait times, used for sizing the pool under peak load
+        return self.backend.stats()
+
+    def cache_stats(self):
+        return self.cache.stats()
 
-    def check_and_add_constraint(self, table_name, constraint_name, constraint_definition):
-        # Check if the constraint already exists
-        check_query = """
-        SELECT COUNT(*)
-        FROM all_constraints
-        WHERE table_name = :table_name
-        AND constraint_name = :constraint_name
-        """
-        result = self.fetch_query(check_query, {'table_name': table_name.upper(), 'constraint_name': constraint_name.upper()})
-
-        # If constraint does not exist, add it
-        if result and result[0][0] == 0:
-            add_constraint_query = f"ALTER TABLE {table_name} ADD CONSTRAINT {constraint_name} {constraint_definition}"
-            self.execute_query(add_constraint_query, show_success=False)
-            print(f"Constraint {constraint_name} added successfully.")
-        else:
-            print(f"Constraint {constraint_name} already exists.")
+    def close(self):
+        self.backend.close()
 
 # Strategy Pattern - Different discount strategies for sales
 class DiscountStrategy:
     def apply_discount(self, total):
         return total
 
+    def applies_to(self, customer_id=None, sale_id=None):
+        # Eligibility for a new sale by customer_id, or for lines added to the existing sale_id
+        return True
+
+    def price_lines(self, lines, customer_id=None, sale_id=None):
+        # Subtotals of (medicine_id, brand, quantity, unit_price) lines, one pass over the basket
+        return [round(self.apply_discount(quantity * unit_price), 2) for medicine_id, brand, quantity, unit_price in lines]
+
 class NoDiscount(DiscountStrategy):
     def apply_discount(self, total):
         return total
@@ -115,38 +841,210 @@ class FirstTimeBuyerDiscount(DiscountStrategy):
     def apply_discount(self, total):
         return total * 0.8  
 
+    def applies_to(self, customer_id=None, sale_id=None):
+        if sale_id is not None:
+            return purchases.is_first_sale(sale_id)
+        return not purchases.has_purchased(customer_id)
+
+# One declarative discount: percent off the lines it matches. A rule with no medicine_ids or brands
+# covers every medicine; segment is None (everyone), 'first_time' or 'returning'. Rules are applied
+# highest priority first; a stackable rule lets lower priority rules apply on top of it, any other
+# rule is the last one applied to the line.
+class DiscountRule:
+    def __init__(self, name, percent, starts=None, ends=None, medicine_ids=None, brands=None,
+                 segment=None, min_quantity=1, priority=0, stackable=False):
+        self.name = name
+        self.multiplier = 1 - percent / 100
+        self.starts = starts  # First and last day (datetime.date) the rule is on sale, inclusive
+        self.ends = ends
+        self.medicine_ids = frozenset(medicine_ids or ())
+        self.brands = frozenset(brands or ())
+        self.segment = segment
+        self.min_quantity = min_quantity  # Quantity break: only lines of at least this many units
+        self.priority = priority
+        self.stackable = stackable
+
+    def active(self, on, segment):
+        return ((self.starts is None or self.starts <= on) and (self.ends is None or on <= self.ends)
+                and (self.segment is None or self.segment == segment))
+
+# Rules active on a day for one customer segment, indexed by scope. A medicine's price schedule
+# is looked up the first time it is seen and reused for every later line. Schedules are shared by
+# scope: medicines with the same medicine-scoped rules and brand get the same one, and medicines
+# no scoped rule mentions share the schedule of the rules covering everything.
+class CompiledRules:
+    def __init__(self, rules):
+        everything = []
+        by_medicine = {}
+        by_brand = {}
+        for order, rule in enumerate(rules):
+            entry = (-rule.priority, order, rule)
+            if not rule.medicine_ids and not rule.brands:
+                everything.append(entry)
+            for medicine_id in rule.medicine_ids:
+                by_medicine.setdefault(medicine_id, []).append(entry)
+            for brand in rule.brands:
+                by_brand.setdefault(brand, []).append(entry)
+        # (-priority, order) is unique, so rules are never compared
+        self.everything = sorted(everything)
+        self.by_medicine = {medicine_id: tuple(sorted(entries)) for medicine_id, entries in by_medicine.items()}
+        self.by_brand = {brand: tuple(sorted(entries)) for brand, entries in by_brand.items()}
+        self.default = self._schedule(self.everything)
+        self.schedules = {}  # medicine_id -> (quantity thresholds, multipliers)
+        self._by_scope = {}  # (medicine-scoped entries, brand) -> (quantity thresholds, multipliers)
+
+    def _schedule(self, entries):
+        # Rules after one that applies to every quantity and does not stack can never apply
+        rules = []
+        for priority, order, rule in entries:
+            rules.append(rule)
+            if rule.min_quantity <= 1 and not rule.stackable:
+                break
+        # The multiplier for q units is the one at the last threshold <= q
+        thresholds = sorted({1} | {rule.min_quantity for rule in rules})
+        multipliers = []
+        for quantity in thresholds:
+            multiplier = 1.0
+            for rule in rules:
+                if quantity >= rule.min_quantity:
+                    multiplier *= rule.multiplier
+                    if not rule.stackable:
+                        break
+            multipliers.append(multiplier)
+        return thresholds, multipliers
+
+    def schedule(self, medicine_id, brand):
+        # A medicine keeps its brand, so schedules are keyed by medicine alone
+        own = self.by_medicine.get(medicine_id, ())
+        scope = (own, brand)
+        schedule = self._by_scope.get(scope)
+        if schedule is None:
+            branded = self.by_brand.get(brand, ())
+            if own or branded:
+                # A rule scoped to both the medicine and its brand is listed under each
+                scoped = sorted(set(own).union(branded)) if own and branded else own or branded
+                schedule = self._schedule(heapq.merge(self.everything, scoped))
+            else:
+                schedule = self.default
+            self._by_scope[scope] = schedule
+        self.schedules[medicine_id] = schedule
+        return schedule
+
+# Strategy that prices a whole basket from a list of DiscountRules. Rules are compiled once per
+# day and customer segment, so pricing N lines is N dictionary lookups and bisects.
+class DiscountEngine(DiscountStrategy):
+    def __init__(self, rules):
+        self.rules = list(rules)
+        self._day = None
+        self._compiled = {}  # segment -> CompiledRules for self._day
+        self._lock = threading.Lock()
+
+    def compiled(self, on, segment):
+        with self._lock:
+            if on != self._day:
+                self._day, self._compiled = on, {}
+            compiled = self._compiled.get(segment)
+            if compiled is None:
+                compiled = self._compiled[segment] = CompiledRules(
+                    [rule for rule in self.rules if rule.active(on, segment)])
+            return compiled
+
+    def segment(self, customer_id=None, sale_id=None):
+        # Lines added to an existing sale are first-time lines only if it is the customer's first sale
+        if sale_id is not None:
+            return 'first_time' if purchases.is_first_sale(sale_id) else 'returning'
+        if customer_id is None:
+            return None
+        return 'returning' if purchases.has_purchased(customer_id) else 'first_time'
+
+    def applies_to(self, customer_id=None, sale_id=None):
+        # Some rule is on for the customer's segment today; an engine without rules always applies
+        segment = self.segment(customer_id, sale_id)
+        today = datetime.now().date()
+        return not self.rules or any(rule.active(today, segment) for rule in self.rules)
+
+    def price_lines(self, lines, customer_id=None, on=None, sale_id=None):
+        compiled = self.compiled(on or datetime.now().date(), self.segment(customer_id, sale_id))
+        known = compiled.schedules.get
+        schedule = compiled.schedule
+        # round(x, 2) costs more than the rest of a line, and a basket repeats the same few
+        # quantity x price x multiplier products, so each distinct product is rounded once
+        rounded = {}
+        subtotals = []
+        append = subtotals.append
+        for medicine_id, brand, quantity, unit_price in lines:
+            thresholds, multipliers = known(medicine_id) or schedule(medicine_id, brand)
+            subtotal = quantity * unit_price * (multipliers[bisect_right(thresholds, quantity) - 1] if quantity >= 1 else 1.0)
+            cents = rounded.get(subtotal)
+            if cents is None:
+                cents = rounded[subtotal] = round(subtotal, 2)
+            append(cents)
+        return subtotals
+
+    def apply_discount(self, total):
+        # Without the line's medicine only the rules covering everything can apply
+        return self.price_lines([(None, None, 1, total)])[0]
+
+# Discount types offered on the sales item screen, as rules for the engine
+SALES_ITEM_DISCOUNTS = {
+    'NoDiscount': DiscountEngine([]),
+    'SeasonalDiscount': DiscountEngine([DiscountRule('Seasonal', 10)]),
+    'FirstTimeBuyerDiscount': DiscountEngine([DiscountRule('First-time buyer', 20, segment='first_time')]),
+}
+
 # Template and Factory Patterns for Insert Operations
 class InsertTemplate:
+    table = None  # Table written, used when publishing the new row
+    query = None  # INSERT statement with named binds, set by each subclass
+    interactive = True  # Bulk imports validate quietly and collect the error instead
+
     def insert(self):
         if not self.validate():
-            messagebox.showerror('Error!', 'Validation failed.')
-            return
-        self.perform_insert()
+            if self.interactive:
+                messagebox.showerror('Error!', 'Validation failed.')
+            return False
+        return self.perform_insert()
+
+    def reject(self, message):
+        self.error = message
+        if self.interactive:
+            messagebox.showerror('Error!', message)
+        return False
 
     def validate(self):
         """Override this method for custom validation logic."""
         raise NotImplementedError
 
-    def perform_insert(self):
-        """Override this method to insert the entity into the database."""
+    def params(self):
+        """Override this method to return the bind values for the insert query."""
         raise NotImplementedError
 
+    def row(self):
+        # The inserted row keyed by column name, as published to subscribers
+        return self.params()
+
+    def perform_insert(self):
+        if not dbms.execute_query(self.query, self.params()):
+            return False
+        events.publish(self.table, 'insert', self.row())
+        return True
+
 class InsertFactory:
     @staticmethod
-    def create_insert(insert_type, supplier_id=None, s_name=None, contact_number=None, email=None, address=None):
+    def create_insert(insert_type, *args, **kwargs):
         if insert_type == 'Supplier':
-            return SupplierInsert()
+            return SupplierInsert(*args, **kwargs)
         # Add other types as needeed
         elif insert_type == 'Medicine':
-            return MedicineInsert()
+            return MedicineInsert(*args, **kwargs)
         elif insert_type == 'Customer':
-            return CustomerInsert()
+            return CustomerInsert(*args, **kwargs)
         elif insert_type == 'Prescription':
-            return PrescriptionInsert()
+            return PrescriptionInsert(*args, **kwargs)
         elif insert_type == 'Sales':
-            return SalesInsert()
+            return SalesInsert(*args, **kwargs)
         elif insert_type == 'SalesItem':
-            return SalesItemInsert()
+            return SalesItemInsert(*args, **kwargs)
         else:
             raise ValueError("Invalid entity type")
 
@@ -155,28 +1053,114 @@ class Command:
     def execute(self):
         raise NotImplementedError
 
+    def check(self):
+        # Returns why the command cannot run, or None; called before a transaction opens
+        return None
+
+    def perform(self):
+        # The database work alone, run inside a transaction after check() passed
+        return self.execute()
+
+    def report(self, message):
+        # Shows a failure to the user once the transaction has committed or rolled back
+        pass
+
 class InsertCommand(Command):
     def __init__(self, insert_obj):
         self.insert_obj = insert_obj
 
     def execute(self):
-        self.insert_obj.insert()
+        return self.insert_obj.insert()
+
+    def check(self):
+        # Validates quietly; the message is shown by report() after the transaction
+        insert = self.insert_obj
+        interactive, insert.interactive = insert.interactive, False
+        try:
+            if insert.validate():
+                return None
+            return getattr(insert, 'error', 'Validation failed.')
+        finally:
+            insert.interactive = interactive
+
+    def perform(self):
+        return self.insert_obj.perform_insert()
+
+    def report(self, message):
+        if self.insert_obj.interactive:
+            messagebox.showerror('Error!', message)
+
+# Raised when a queued command fails validation inside a transactional batch
+class CommandError(Exception):
+    def __init__(self, messages):
+        super().__init__('\n'.join(messages))
+        self.messages = messages
 
 class CommandInvoker:
-    def __init__(self):
+    def __init__(self, transactional=False, retries=0):
         self._commands = []
+        # Transactional mode runs every queued command on one connection with a single commit
+        self.transactional = transactional
+        self.retries = retries  # Database errors retried from the failing command's savepoint
 
     def add_command(self, command):
         self._commands.append(command)
 
     def execute_commands(self):
-        for command in self._commands:
-            command.execute()
-        self._commands.clear()  # Clear the list after executing
+        try:
+            if not self.transactional:
+                for command in self._commands:
+                    command.execute()
+                return True
+            return self._execute_transaction(self._commands)
+        finally:
+            self._commands.clear()  # Clear the list after executing
+
+    def _execute_transaction(self, commands):
+        # Every command is validated before the transaction opens and no dialog is shown until
+        # it has committed or rolled back, so a message box never holds the connection open
+        problems = [(command, message) for command in commands for message in [command.check()] if message]
+        if problems:
+            self._report(problems)
+            raise CommandError([message for command, message in problems])
+        current = None
+        try:
+            with dbms.transaction() as tx:
+                for index, current in enumerate(commands):
+                    self._execute_in_savepoint(tx, f"command_{index}", current)
+        except DATABASE_ERRORS as e:
+            if current is not None:
+                self._report([(current, str(e))])
+            raise
+        return True
+
+    @staticmethod
+    def _report(problems):
+        for command, message in problems:
+            command.report(message)
+
+    def _execute_in_savepoint(self, tx, savepoint, command):
+        tx.savepoint(savepoint)
+        for attempt in range(self.retries + 1):
+            try:
+                if command.perform() is False:
+                    raise CommandError(['Operation failed.'])
+                return
+            except DATABASE_ERRORS:
+                # Undo only this command; earlier commands in the transaction are kept
+                tx.rollback_to(savepoint)
+                if attempt == self.retries:
+                    raise  # Out of retries: the whole transaction rolls back
 
 
 # Implementing Specific Insert Classes
 class SupplierInsert(InsertTemplate):
+    table = 'SUPPLIER'
+    query = """
+    INSERT INTO SUPPLIER (supplier_id, s_name, contact_number, email, address)
+    VALUES (:supplier_id, :s_name, :contact_number, :email, :address)
+    """
+
     def __init__(self, supplier_id, s_name, contact_number, email, address):
         self.supplier_id = supplier_id
         self.s_name = s_name
@@ -186,24 +1170,24 @@ class SupplierInsert(InsertTemplate):
 
     def validate(self):
         # Implement validation logic for Supplier entity
-        return bool(self.s_name and self.contact_number and self.email and self.address)
+        if not (self.s_name and self.contact_number and self.email and self.address):
+            return self.reject('All fields are required.')
+        return True
 
-    def perform_insert(self):
-        query = """
-        INSERT INTO SUPPLIER (supplier_id, s_name, contact_number, email, address)
-        VALUES (:supplier_id, :s_name, :contact_number, :email, :address)
-        """
-        params = {
+    def params(self):
+        return {
             'supplier_id': self.supplier_id,
             's_name': self.s_name,
             'contact_number': self.contact_number,
             'email': self.email,
             'address': self.address
         }
-        db_manager = DatabaseManager(username="your_username", password="your_password")
-        db_manager.execute_query(query, params)
 
 class MedicineInsert(InsertTemplate):
+    table = 'MEDICINE'
+    query = """INSERT INTO MEDICINE (medicine_id, m_name, brand, batch_number, expiry_date, quantity, price, supplier_id)
+               VALUES (:medicine_id, :m_name, :brand, :batch_number, :expiry_date, :quantity, :price, :supplier_id)"""
+
     def __init__(self, medicine_id, m_name, brand, batch_number, expiry_date, quantity, price, supplier_id):
         self.medicine_id = medicine_id
         self.m_name = m_name
@@ -216,26 +1200,19 @@ class MedicineInsert(InsertTemplate):
 
     def validate(self):
         if not self.medicine_id or not self.m_name or not self.brand or not self.batch_number or not self.expiry_date or not self.quantity or not self.price or not self.supplier_id:
-            messagebox.showerror('Error!', 'All fields are required.')
-            return False
+            return self.reject('All fields are required.')
         if int(self.quantity) <= 0:
-            messagebox.showerror('Error!', 'Quantity must be positive.')
-            return False
+            return self.reject('Quantity must be positive.')
         if float(self.price) <= 0:
-            messagebox.showerror('Error!', 'Price must be positive.')
-            return False
-        if not re.match(r"^M\d{3}$", self.medicine_id):
-            messagebox.showerror('Error!', 'Invalid Medicine ID format. It should start with "M" followed by three digits.')
-            return False
+            return self.reject('Price must be positive.')
+        if not re.match(r"^M\d{3,}$", self.medicine_id):
+            return self.reject('Invalid Medicine ID format. It should start with "M" followed by at least three digits.')
         if not re.match(r"^BATCH\d{3}$", self.batch_number):
-            messagebox.showerror('Error!', 'Invalid Batch Number format. It should start with "BATCH" followed by three digits.')
-            return False
+            return self.reject('Invalid Batch Number format. It should start with "BATCH" followed by three digits.')
         return True
 
-    def perform_insert(self):
-        query = """INSERT INTO MEDICINE (medicine_id, m_name, brand, batch_number, expiry_date, quantity, price, supplier_id)
-                   VALUES (:medicine_id, :m_name, :brand, :batch_number, :expiry_date, :quantity, :price, :supplier_id)"""
-        params = {
+    def params(self):
+        return {
             'medicine_id': self.medicine_id,
             'm_name': self.m_name,
             'brand': self.brand,
@@ -245,11 +1222,13 @@ class MedicineInsert(InsertTemplate):
             'price': self.price,
             'supplier_id': self.supplier_id
         }
-        dbms.execute_query(query, params)
-        dbms.execute_query("COMMIT")
 
 
 class CustomerInsert(InsertTemplate):
+    table = 'CUSTOMER'
+    query = """INSERT INTO CUSTOMER (customer_id, c_name, contact_number, email, address)
+               VALUES (:customer_id, :customer_name, :contact_number, :email, :address)"""
+
     def __init__(self, customer_id, customer_name, contact_number, email, address):
         self.customer_id = customer_id
         self.customer_name = customer_name
@@ -259,27 +1238,34 @@ class CustomerInsert(InsertTemplate):
 
     def validate(self):
         if not self.customer_id or not self.customer_name or not self.contact_number or not self.email or not self.address:
-            messagebox.showerror('Error!', 'All fields are required.')
-            return False
-        if not re.match(r"^C\d{3}$", self.customer_id):
-            messagebox.showerror('Error!', 'Invalid Customer ID format. It should start with "C" followed by three digits.')
-            return False
+            return self.reject('All fields are required.')
+        if not re.match(r"^C\d{3,}$", self.customer_id):
+            return self.reject('Invalid Customer ID format. It should start with "C" followed by at least three digits.')
         return True
 
-    def perform_insert(self):
-        query = """INSERT INTO CUSTOMER (customer_id, c_name, contact_number, email, address)
-                   VALUES (:customer_id, :customer_name, :contact_number, :email, :address)"""
-        params = {
+    def params(self):
+        return {
             'customer_id': self.customer_id,
             'customer_name': self.customer_name,
             'contact_number': self.contact_number,
             'email': self.email,
             'address': self.address
         }
-        dbms.execute_query(query, params)
-        dbms.execute_query("COMMIT")
+
+    def row(self):
+        return {
+            'customer_id': self.customer_id,
+            'c_name': self.customer_name,
+            'contact_number': self.contact_number,
+            'email': self.email,
+            'address': self.address
+        }
 
 class PrescriptionInsert(InsertTemplate):
+    table = 'PRESCRIPTION'
+    query = """INSERT INTO PRESCRIPTION (prescription_id, customer_id, doctor_name, prescription_date, dosage, frequency, duration, additional_instructions)
+               VALUES (:prescription_id, :customer_id, :doctor_name, :prescription_date, :dosage, :frequency, :duration, :additional_instructions)"""
+
     def __init__(self, prescription_id, customer_id, doctor_name, prescription_date, dosage, frequency, duration, additional_instructions):
         self.prescription_id = prescription_id
         self.customer_id = customer_id
@@ -292,32 +1278,26 @@ class PrescriptionInsert(InsertTemplate):
 
     def validate(self):
         if not self.prescription_id or not self.customer_id or not self.doctor_name or not self.prescription_date or not self.dosage or not self.frequency or not self.duration or not self.additional_instructions:
-            messagebox.showerror('Error!', 'All fields are required.')
-            return False
+            return self.reject('All fields are required.')
 
         # Validate Prescription ID format (should start with "P" followed by three digits)
-        if not re.match(r"^P\d{3}$", self.prescription_id):
-            messagebox.showerror('Error!', 'Invalid Prescription ID format. It should start with "P" followed by three digits.')
-            return False
+        if not re.match(r"^P\d{3,}$", self.prescription_id):
+            return self.reject('Invalid Prescription ID format. It should start with "P" followed by at least three digits.')
 
         # Check if the prescription date is in the correct format (DD-MON-YY)
         try:
             datetime.strptime(self.prescription_date, "%d-%b-%y")
         except ValueError:
-            messagebox.showerror('Error!', 'Invalid date format. Please enter the prescription date in DD-MON-YY format.')
-            return False
+            return self.reject('Invalid date format. Please enter the prescription date in DD-MON-YY format.')
         
         # Assuming check_customer_id is defined to validate customer ID
-        if not check_customer_id(self.customer_id):
-            messagebox.showerror('Error!', 'Customer ID does not exist.')
-            return False
+        if not check_customer_id(self.customer_id, show_error=self.interactive):
+            return self.reject('Customer ID does not exist.')
 
         return True
 
-    def perform_insert(self):
-        query = """INSERT INTO PRESCRIPTION (prescription_id, customer_id, doctor_name, prescription_date, dosage, frequency, duration, additional_instructions)
-                   VALUES (:prescription_id, :customer_id, :doctor_name, :prescription_date, :dosage, :frequency, :duration, :additional_instructions)"""
-        params = {
+    def params(self):
+        return {
             'prescription_id': self.prescription_id,
             'customer_id': self.customer_id,
             'doctor_name': self.doctor_name,
@@ -327,11 +1307,14 @@ class PrescriptionInsert(InsertTemplate):
             'duration': self.duration,
             'additional_instructions': self.additional_instructions
         }
-        dbms.execute_query(query, params)
-        dbms.execute_query("COMMIT")
 
 
 class SalesInsert(InsertTemplate):
+    table = 'SALES'
+    query = """INSERT INTO SALES (sale_id, customer_id, sale_date, total_amount, payment_method)
+               VALUES (:sales_id, :customer_id, :sales_date, :total_amount, :payment_method)"""
+    PAYMENT_METHODS = ('Cash', 'Credit Card', 'Debit Card', 'Online', 'UPI')
+
     def __init__(self, sales_id, customer_id, sales_date, total_amount, payment_method):
         self.sales_id = sales_id
         self.customer_id = customer_id
@@ -340,28 +1323,42 @@ class SalesInsert(InsertTemplate):
         self.payment_method = payment_method
 
     def validate(self):
-        if not self.sales_id or not self.customer_id or not self.sales_date or not self.total_amount or not self.payment_method:
-            messagebox.showerror('Error!', 'All fields are required.')
-            return False
-        if self.payment_method not in ['Cash', 'Credit Card', 'Debit Card', 'Online','UPI']:
-            messagebox.showerror('Error!', 'Invalid payment method. Choose from: Cash, Credit Card, Debit Card, Online, or UPI.')
-            return False
+        if not self.sales_id or not self.customer_id or not self.sales_date or self.total_amount is None or not self.payment_method:
+            return self.reject('All fields are required.')
+        # A fully discounted sale totals zero, which is still a sale. The screen passes the entry text.
+        try:
+            valid = not isinstance(self.total_amount, bool) and float(self.total_amount) >= 0
+        except (TypeError, ValueError):
+            valid = False
+        if not valid:
+            return self.reject('Total amount must be a number of zero or more.')
+        if self.payment_method not in self.PAYMENT_METHODS:
+            return self.reject('Invalid payment method. Choose from: Cash, Credit Card, Debit Card, Online, or UPI.')
         return True
 
-    def perform_insert(self):
-        query = """INSERT INTO SALES (sale_id, customer_id, sale_date, total_amount, payment_method)
-                   VALUES (:sales_id, :customer_id, :sales_date, :total_amount, :payment_method)"""
-        params = {
+    def params(self):
+        return {
             'sales_id': self.sales_id,
             'customer_id': self.customer_id,
             'sales_date': self.sales_date,
             'total_amount': self.total_amount,
             'payment_method': self.payment_method
         }
-        dbms.execute_query(query, params)
-        dbms.execute_query("COMMIT")
+
+    def row(self):
+        return {
+            'sale_id': self.sales_id,
+            'customer_id': self.customer_id,
+            'sale_date': self.sales_date,
+            'total_amount': self.total_amount,
+            'payment_method': self.payment_method
+        }
 
 class SalesItemInsert(InsertTemplate):
+    table = 'SALES_ITEMS'
+    query = """INSERT INTO SALES_ITEMS (sale_item_id, sale_id, medicine_id, quantity, price_per_unit, subtotal)
+               VALUES (:item_id, :sales_id, :medicine_id, :quantity, :price, :subtotal)"""
+
     def __init__(self, item_id, sales_id, medicine_id, quantity, price):
         self.item_id = item_id
         self.sales_id = sales_id
@@ -376,17 +1373,13 @@ class SalesItemInsert(InsertTemplate):
     def validate(self):
         # Validate that quantity and price are positive
         if self.quantity <= 0:
-            messagebox.showerror('Error!', 'Quantity must be greater than 0.')
-            return False
+            return self.reject('Quantity must be greater than 0.')
         if self.price <= 0:
-            messagebox.showerror('Error!', 'Price must be greater than 0.')
-            return False
+            return self.reject('Price must be greater than 0.')
         return True
 
-    def perform_insert(self):
-        query = """INSERT INTO SALES_ITEMS (sale_item_id, sale_id, medicine_id, quantity, price_per_unit, subtotal)
-                   VALUES (:item_id, :sales_id, :medicine_id, :quantity, :price, :subtotal)"""
-        params = {
+    def params(self):
+        return {
             'item_id': self.item_id,
             'sales_id': self.sales_id,
             'medicine_id': self.medicine_id,
@@ -394,24 +1387,1539 @@ class SalesItemInsert(InsertTemplate):
             'price': self.price,
             'subtotal': self.subtotal
         }
-        dbms.execute_query(query, params)
-        dbms.execute_query("COMMIT")
 
+    def row(self):
+        return {
+            'sale_item_id': self.item_id,
+            'sale_id': self.sales_id,
+            'medicine_id': self.medicine_id,
+            'quantity': self.quantity,
+            'price_per_unit': self.price,
+            'subtotal': self.subtotal
+        }
+
+# Outcome of bulk_insert: rows written and (insert object, error message) for rows that were not
+class BatchResult:
+    def __init__(self):
+        self.inserted = []
+        self.errors = []
+
+    @property
+    def ok(self):
+        return not self.errors
+
+# Set-based stock deduction for batches of sale items. Quantities are summed per medicine, the
+# stock left for sale is read for the whole batch with one locking SELECT, and every medicine that
+# has enough is deducted by one UPDATE that picks its total out of a CASE. A batch costs two
+# statements per IN_LIST_SIZE medicines instead of one trigger firing per line. The row-level
+# update_medicine_stock trigger stands aside while the engine writes; it still handles single
+# inserts, and every insert when the engine is disabled (MEDICAL_STOCK_ENGINE=trigger).
+class StockEngine:
+    # Stock held by open baskets (live STOCK_HOLD rows) is not for sale, like in the trigger
+    HELD = "SELECT COALESCE(SUM(h.quantity), 0) FROM STOCK_HOLD h WHERE h.medicine_id = MEDICINE.medicine_id AND h.expires_at > :now"
+    AVAILABLE = f"SELECT medicine_id, quantity - ({HELD}) FROM MEDICINE WHERE medicine_id IN ({{binds}})"
+    APPLY = ("UPDATE MEDICINE SET quantity = quantity {sign} CASE medicine_id {cases} END, version = version + 1 "
+             "WHERE medicine_id IN ({binds})")
+    IN_LIST_SIZE = 500  # Oracle allows at most 1000 expressions in an IN list
+
+    def __init__(self, enabled=True):
+        self.enabled = enabled
+
+    @staticmethod
+    def totals(lines):
+        totals = {}
+        for medicine_id, quantity in lines:
+            totals[medicine_id] = totals.get(medicine_id, 0) + quantity
+        return totals
+
+    def _chunks(self, medicine_ids):
+        # (IN list, named binds) per IN_LIST_SIZE medicines
+        for start in range(0, len(medicine_ids), self.IN_LIST_SIZE):
+            chunk = medicine_ids[start:start + self.IN_LIST_SIZE]
+            yield ', '.join(f':m{i}' for i in range(len(chunk))), {f'm{i}': medicine_id for i, medicine_id in enumerate(chunk)}
+
+    def available(self, medicine_ids, now):
+        # Stock not held by open baskets; the rows stay locked until the caller's transaction ends
+        available = {}
+        for binds, params in self._chunks(medicine_ids):
+            params['now'] = now
+            available.update(dbms.fetch_query(dbms.backend.for_update(self.AVAILABLE.format(binds=binds)), params))
+        return available
+
+    def _apply(self, totals, sign):
+        for binds, params in self._chunks(list(totals)):
+            cases = ' '.join(f'WHEN :m{i} THEN :q{i}' for i in range(len(params)))
+            params.update({f'q{i}': totals[params[f'm{i}']] for i in range(len(params))})
+            dbms.execute_query(self.APPLY.format(sign=sign, cases=cases, binds=binds), params)
+
+    def deduct(self, lines):
+        # Takes [(medicine_id, quantity)] off MEDICINE inside the caller's transaction. Medicines
+        # without enough stock for their total are left untouched and returned as
+        # {medicine_id: (requested, available)}, available being None for unknown medicines
+        totals = self.totals(lines)
+        available = self.available(list(totals), time.time())
+        short = {medicine_id: (quantity, available.get(medicine_id)) for medicine_id, quantity in totals.items()
+                 if available.get(medicine_id) is None or available[medicine_id] < quantity}
+        self._apply({medicine_id: quantity for medicine_id, quantity in totals.items() if medicine_id not in short}, '-')
+        return short
+
+    def restore(self, lines):
+        self._apply(self.totals(lines), '+')
+
+    def insert_items(self, items):
+        # Writes SalesItemInserts inside the caller's transaction; returns [(index, error message)]
+        # for the lines not written, like DatabaseManager.execute_many. Every line of a short
+        # medicine is reported in the same pass.
+        with dbms.stock_trigger_bypassed():
+            short = self.deduct([(item.medicine_id, item.quantity) for item in items])
+            errors = [(index, f'Insufficient stock for {item.medicine_id}: {short[item.medicine_id][0]} requested '
+                              f'across the batch, {short[item.medicine_id][1] or 0} available.')
+                      for index, item in enumerate(items) if item.medicine_id in short]
+            kept = [index for index, item in enumerate(items) if item.medicine_id not in short]
+            failed = dbms.execute_many([(SalesItemInsert.query, [items[index].params() for index in kept])])[0] if kept else []
+            if failed:
+                # Give back the stock of lines the insert rejected, e.g. duplicate IDs
+                self.restore([(items[kept[position]].medicine_id, items[kept[position]].quantity) for position, message in failed])
+                errors += [(kept[position], message) for position, message in failed]
+        return sorted(errors)
+
+stock_engine = StockEngine(enabled=os.environ.get('MEDICAL_STOCK_ENGINE', 'set') != 'trigger')
+
+# Bulk path for basket checkout and data imports: validates every object, then writes each
+# entity type with one array-bound executemany and commits once. Sale items go through the
+# StockEngine. A failing row (e.g. short stock) is reported in the result without aborting the
+# rest of the batch.
+def bulk_insert(insert_objs):
+    result = BatchResult()
+    groups = {}  # Insert class -> valid objects, kept in first-seen order so parents go before children
+    for obj in insert_objs:
+        obj.interactive = False
+        try:
+            valid = obj.validate()
+        except (TypeError, ValueError) as e:
+            obj.error, valid = str(e), False
+        if valid:
+            groups.setdefault(type(obj), []).append(obj)
+        else:
+            result.errors.append((obj, obj.error))
+
+    try:
+        batch_errors = []
+        with dbms.transaction():
+            for cls, objs in groups.items():
+                if cls is SalesItemInsert and stock_engine.enabled:
+                    batch_errors.append(stock_engine.insert_items(objs))
+                else:
+                    batch_errors.extend(dbms.execute_many([(cls.query, [obj.params() for obj in objs])]))
+    except DATABASE_ERRORS as e:
+        result.errors.extend((obj, str(e)) for objs in groups.values() for obj in objs)
+        return result
+
+    for objs, errors in zip(groups.values(), batch_errors):
+        failed = dict(errors)
+        for index, obj in enumerate(objs):
+            if index in failed:
+                result.errors.append((obj, failed[index]))
+            else:
+                result.inserted.append(obj)
+                events.publish(obj.table, 'insert', obj.row())
+    return result
+
+# Raised by checkout() when a basket cannot be sold; lists every problem found, not just the first
+class CheckoutError(Exception):
+    def __init__(self, problems):
+        super().__init__('\n'.join(problems))
+        self.problems = problems
+
+# Outcome of a completed checkout
+class Receipt:
+    def __init__(self, sale, items):
+        self.sale = sale
+        self.items = items
+
+    @property
+    def sale_id(self):
+        return self.sale.sales_id
+
+    @property
+    def total(self):
+        return self.sale.total_amount
+
+# Headless counter checkout: prices the basket from MEDICINE, derives the sale total from the
+# lines and checks stock for every line with one query, then writes SALES and all SALES_ITEMS
+# in a single transaction. The round trips stay constant however many lines the basket has.
+# holds are the basket's own STOCK_HOLD IDs, consumed by the sale; other terminals' live holds
+# are not available to it. Every problem with the basket is reported in one CheckoutError.
+def checkout(customer_id, items, payment_method, discount=None, holds=()):
+    discount = discount or NoDiscount()
+    problems = []
+    requested = {}  # medicine_id -> total quantity across the basket's valid lines
+    for medicine_id, quantity in items:
+        if isinstance(quantity, bool) or not isinstance(quantity, int) or quantity <= 0:
+            problems.append(f'{medicine_id}: quantity must be a positive whole number.')
+        else:
+            requested[medicine_id] = requested.get(medicine_id, 0) + quantity
+    if not items:
+        problems.append('The basket is empty.')
+    if payment_method not in SalesInsert.PAYMENT_METHODS:
+        problems.append(f'Invalid payment method {payment_method!r}. Choose from: {", ".join(SalesInsert.PAYMENT_METHODS)}.')
+    if not discount.applies_to(customer_id=customer_id):
+        problems.append(f'Customer ID {customer_id} is not eligible for {type(discount).__name__}.')
+
+    # Read-only pass: looks up the customer and every medicine, even lines with a bad quantity,
+    # and checks stock against other terminals' holds. The writes re-check stock atomically.
+    medicine_ids = list(dict.fromkeys(medicine_id for medicine_id, quantity in items))
+    stock, held = {}, {}
+    with dbms.transaction():
+        if not dbms.fetch_query("SELECT customer_id FROM CUSTOMER WHERE customer_id = :1", (customer_id,)):
+            problems.append(f'Customer ID {customer_id} does not exist in the CUSTOMER table.')
+        if medicine_ids:
+            binds = ', '.join(f':{i + 1}' for i in range(len(medicine_ids)))
+            rows = dbms.fetch_query(f"SELECT medicine_id, price, quantity, brand FROM MEDICINE WHERE medicine_id IN ({binds})", medicine_ids)
+            stock = {medicine_id: (price, quantity, brand) for medicine_id, price, quantity, brand in rows}
+            # The basket's own holds are about to become this sale, so they do not count against it
+            own = ', '.join(f':{len(medicine_ids) + 2 + i}' for i in range(len(holds)))
+            held = dict(dbms.fetch_query(f"SELECT medicine_id, SUM(quantity) FROM STOCK_HOLD WHERE medicine_id IN ({binds}) "
+                                         f"AND expires_at > :{len(medicine_ids) + 1} "
+                                         f"{f'AND hold_id NOT IN ({own}) ' if holds else ''}GROUP BY medicine_id",
+                                         medicine_ids + [time.time()] + list(holds)))
+    for medicine_id in medicine_ids:
+        if medicine_id not in stock:
+            problems.append(f'Medicine ID {medicine_id} does not exist in the MEDICINE table.')
+        elif medicine_id in requested:
+            available = stock[medicine_id][1] - held.get(medicine_id, 0)
+            if available < requested[medicine_id]:
+                problems.append(f'Insufficient stock for {medicine_id}: {requested[medicine_id]} requested, {available} available.')
+    if problems:
+        raise CheckoutError(problems)
+
+    # Reserved outside the transaction so a rolled back checkout only leaves gaps, never reused IDs
+    sale_id = id_allocator['SALES'].next()
+    item_ids = [id_allocator['SALES_ITEMS'].next() for _ in items]
+
+    lines = [(medicine_id, stock[medicine_id][2], quantity, float(stock[medicine_id][0])) for medicine_id, quantity in items]
+    sale_items = []
+    for item_id, (medicine_id, brand, quantity, price), subtotal in zip(item_ids, lines, discount.price_lines(lines, customer_id)):
+        item = SalesItemInsert(item_id, sale_id, medicine_id, quantity, price)
+        item.subtotal = subtotal
+        sale_items.append(item)
+    sale_date = datetime.now().replace(hour=0, minute=0, second=0, microsecond=0)
+    sale = SalesInsert(sale_id, customer_id, sale_date, round(sum(item.subtotal for item in sale_items), 2), payment_method)
+
+    with dbms.transaction():
+        if holds:
+            hold_binds = ', '.join(f':{i + 1}' for i in range(len(holds)))
+            dbms.execute_query(f"DELETE FROM STOCK_HOLD WHERE hold_id IN ({hold_binds})", list(holds))
+        result = bulk_insert([sale] + sale_items)
+        if not result.ok:
+            raise CheckoutError([error for obj, error in result.errors])  # Rolls back the whole sale and keeps the holds
+    return Receipt(sale, sale_items)
+
+# Raised by StockReservations.reserve() when a hold cannot be placed
+class ReservationError(Exception):
+    pass
+
+# Terminal name recorded on its holds; set MEDICAL_TERMINAL_ID to name counters explicitly
+TERMINAL_ID = os.environ.get('MEDICAL_TERMINAL_ID', f'{socket.gethostname()}:{os.getpid()}')
+
+# Short-lived holds on MEDICINE stock while a basket is open. A hold is placed optimistically:
+# read quantity, version and the live holds, then claim the medicine by bumping its version only
+# if it is unchanged. A terminal that lost the race sees zero rows updated and retries with fresh
+# numbers, so no row lock is held while staff are still scanning items. Holds expire after
+# HOLD_TTL seconds unless kept alive, and expired ones are purged by expire() on a timer.
+class StockReservations:
+    HOLD_TTL = 600
+    MAX_ATTEMPTS = 5
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._timer = None
+        self.metrics = {'reserved': 0, 'conflicts': 0, 'rejected': 0, 'gave_up': 0, 'released': 0, 'expired': 0}
+
+    def _count(self, metric, amount=1):
+        with self._lock:
+            self.metrics[metric] += amount
+
+    def reserve(self, medicine_id, quantity, terminal_id=TERMINAL_ID, ttl=HOLD_TTL):
+        # Returns the new hold's ID
+        for attempt in range(self.MAX_ATTEMPTS):
+            now = time.time()
+            with dbms.transaction():
+                rows = dbms.fetch_query("SELECT quantity, version FROM MEDICINE WHERE medicine_id = :1", (medicine_id,))
+                if not rows:
+                    raise ReservationError(f'Medicine ID {medicine_id} does not exist in the MEDICINE table.')
+                stock, version = rows[0]
+                held = dbms.fetch_query("SELECT COALESCE(SUM(quantity), 0) FROM STOCK_HOLD "
+                                        "WHERE medicine_id = :1 AND expires_at > :2", (medicine_id, now))[0][0]
+                if stock - held < quantity:
+                    self._count('rejected')
+                    raise ReservationError(f'Insufficient stock for {medicine_id}: {quantity} requested, '
+                                           f'{stock - held} available after other baskets\' holds.')
+                claimed = dbms.update_counts("UPDATE MEDICINE SET version = version + 1 "
+                                             "WHERE medicine_id = :medicine_id AND version = :version",
+                                             [{'medicine_id': medicine_id, 'version': version}])[0]
+                if claimed:
+                    hold_id = uuid.uuid4().hex
+                    dbms.execute_query("INSERT INTO STOCK_HOLD (hold_id, terminal_id, medicine_id, quantity, expires_at) "
+                                       "VALUES (:1, :2, :3, :4, :5)", (hold_id, terminal_id, medicine_id, quantity, now + ttl))
+            if claimed:
+                self._count('reserved')
+                return hold_id
+            self._count('conflicts')  # Another terminal changed the medicine between our read and claim
+        self._count('gave_up')
+        raise ReservationError(f'{medicine_id} is changing too fast to reserve; try again.')
+
+    def _binds(self, hold_ids):
+        return ', '.join(f':{i + 1}' for i in range(len(hold_ids)))
+
+    def keep_alive(self, hold_ids, ttl=HOLD_TTL):
+        # Pushes the expiry of an open basket's holds back to ttl seconds from now
+        if hold_ids:
+            dbms.execute_query(f"UPDATE STOCK_HOLD SET expires_at = :{len(hold_ids) + 1} "
+                               f"WHERE hold_id IN ({self._binds(hold_ids)})", list(hold_ids) + [time.time() + ttl])
+
+    def release(self, hold_ids):
+        if hold_ids:
+            dbms.execute_query(f"DELETE FROM STOCK_HOLD WHERE hold_id IN ({self._binds(hold_ids)})", list(hold_ids))
+            self._count('released', len(hold_ids))
+
+    def expire(self):
+        # Deletes abandoned holds; returns how many there were
+        count = dbms.update_counts("DELETE FROM STOCK_HOLD WHERE expires_at <= :now", [{'now': time.time()}])[0]
+        self._count('expired', count)
+        return count
+
+    def stats(self):
+        rows = dbms.fetch_query("SELECT COUNT(*), COALESCE(SUM(quantity), 0) FROM STOCK_HOLD WHERE expires_at > :1", (time.time(),))
+        with self._lock:
+            stats = dict(self.metrics)
+        attempts = stats['reserved'] + stats['conflicts'] + stats['rejected']
+        stats.update(active_holds=rows[0][0], held_units=rows[0][1],
+                     conflict_rate=stats['conflicts'] / attempts if attempts else 0.0)
+        return stats
+
+    def start(self, interval=60, delay=0):
+        # Purges expired holds on a daemon timer, first after delay seconds and then every interval
+        def tick():
+            try:
+                with dbms.raise_errors():
+                    self.expire()
+            except DATABASE_ERRORS as e:
+                print(f"Hold expiry failed: {e}")
+            self.start(interval, interval)
+        self._timer = threading.Timer(delay, tick)
+        self._timer.daemon = True
+        self._timer.start()
+
+    def stop(self):
+        if self._timer:
+            self._timer.cancel()
+
+reservations = StockReservations()
+
+# An open basket at one terminal: every line holds its stock until the sale or abandon()
+class Basket:
+    def __init__(self, terminal_id=TERMINAL_ID):
+        self.terminal_id = terminal_id
+        self.lines = []  # (hold_id, medicine_id, quantity)
+
+    def add(self, medicine_id, quantity):
+        self.lines.append((reservations.reserve(medicine_id, quantity, self.terminal_id), medicine_id, quantity))
+
+    def remove(self, medicine_id):
+        reservations.release([hold_id for hold_id, line_medicine, quantity in self.lines if line_medicine == medicine_id])
+        self.lines = [line for line in self.lines if line[1] != medicine_id]
+
+    def hold_ids(self):
+        return [hold_id for hold_id, medicine_id, quantity in self.lines]
+
+    def keep_alive(self):
+        reservations.keep_alive(self.hold_ids())
+
+    def abandon(self):
+        reservations.release(self.hold_ids())
+        self.lines = []
+
+    def checkout(self, customer_id, payment_method, discount=None):
+        items = [(medicine_id, quantity) for hold_id, medicine_id, quantity in self.lines]
+        receipt = checkout(customer_id, items, payment_method, discount, holds=self.hold_ids())
+        self.lines = []
+        return receipt
+
+# Proxy Pattern - Stands in for the DatabaseManager while it connects, migrates and seeds on
+# its own thread. Attribute access waits for it, so code uses dbms as before; the GUI only
+# blocks if it needs the database before it is ready.
+class LazyDatabase:
+    def __init__(self, factory):
+        self._factory = factory
+        self._lock = threading.Lock()
+        self._future = None
+        self._manager = None
+
+    def start(self):
+        with self._lock:
+            if self._future is None:
+                executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix='db-init')
+                self._future = executor.submit(self._create)
+                executor.shutdown(wait=False)
+        return self._future
+
+    def _create(self):
+        with profiler.stage('initialise database'):
+            manager = self._factory()
+        profiler.mark('database ready')
+        return manager
+
+    @property
+    def ready(self):
+        # Future of the DatabaseManager; it raises whatever stopped the initialisation
+        return self.start()
+
+    def __getattr__(self, name):
+        manager = self._manager
+        if manager is None:
+            manager = self._manager = self.ready.result()
+        return getattr(manager, name)
 
 # Creating an object for Database to Python link
-dbms = DatabaseManager(username='system', password='Rajini')
+# MEDICAL_DB_BACKEND=sqlite runs everything on the embedded engine (MEDICAL_DB_PATH, default in-memory)
+if os.environ.get('MEDICAL_DB_BACKEND', 'oracle') == 'sqlite':
+    dbms = LazyDatabase(lambda: DatabaseManager(backend=SQLiteBackend(os.environ.get('MEDICAL_DB_PATH', ':memory:'), seed=True)))
+else:
+    dbms = LazyDatabase(lambda: DatabaseManager(username='system', password='Rajini', pool_min=2, pool_max=8))
+dbms.start()  # Connects while the rest of the module loads and the login window is drawn
+
+# Observer Pattern - row changes made through the app are published per table, so in-memory
+# state can follow our own writes. Notifications inside a transaction wait for its commit.
+class EventBus:
+    def __init__(self):
+        self._subscribers = {}
+        self._lock = threading.Lock()
+
+    def subscribe(self, table, handler):
+        # handler(action, row) with action 'insert', 'update' or 'delete' and row a column -> value dict
+        with self._lock:
+            self._subscribers.setdefault(table, []).append(handler)
+
+    def publish(self, table, action, row):
+        dbms.after_commit(lambda: self._notify(table, action, row))
+
+    def _notify(self, table, action, row):
+        with self._lock:
+            handlers = list(self._subscribers.get(table, ()))
+        for handler in handlers:
+            handler(action, row)
+
+events = EventBus()
+
+# Set of the IDs in one table, loaded on first use and kept current from published writes.
+# Hits are answered in memory; a miss falls back to the database in case another terminal added
+# the row. A full reload every reconcile_interval seconds catches rows deleted elsewhere.
+class IdIndex:
+    def __init__(self, table, column, reconcile_interval=300):
+        self.table = table
+        self.column = column
+        self.reconcile_interval = reconcile_interval
+        self._ids = None
+        self._loaded_at = 0.0
+        self._reloading = None  # Changes seen while a reload is running, replayed over its result
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.fallbacks = 0
+        events.subscribe(table, self.on_change)
+
+    def load(self):
+        with self._lock:
+            self._reloading = []
+        try:
+            ids = {row[0] for row in dbms.fetch_query(f"SELECT {self.column} FROM {self.table}")}
+        except BaseException:
+            with self._lock:
+                self._reloading = None
+            raise
+        with self._lock:
+            for action, key in self._reloading:
+                self._apply(ids, action, key)
+            self._ids = ids
+            self._reloading = None
+            self._loaded_at = time.monotonic()
+
+    def reconcile(self):
+        # Reloads on a worker thread while lookups keep using the current set
+        if self._reloading is None:
+            background.run(self.load)
+
+    def _apply(self, ids, action, key):
+        if action == 'insert':
+            ids.add(key)
+        elif action == 'delete':
+            ids.discard(key)
+
+    def on_change(self, action, row):
+        key = row.get(self.column)
+        with self._lock:
+            if self._ids is not None:
+                self._apply(self._ids, action, key)
+            if self._reloading is not None:
+                self._reloading.append((action, key))
+
+    def known(self, key):
+        # In-memory answer only, without the database fallback on a miss
+        with self._lock:
+            return self._ids is not None and key in self._ids
+
+    def contains(self, key):
+        if self._ids is None:
+            self.load()
+        elif time.monotonic() - self._loaded_at > self.reconcile_interval:
+            self.reconcile()
+        with self._lock:
+            if key in self._ids:
+                self.hits += 1
+                return True
+            self.fallbacks += 1
+        if not dbms.fetch_query(f"SELECT {self.column} FROM {self.table} WHERE {self.column} = :1", (key,)):
+            return False
+        if not dbms.in_transaction():  # An uncommitted row may still roll back
+            self.on_change('insert', {self.column: key})
+        return True
+
+    def stats(self):
+        with self._lock:
+            return {'ids': len(self._ids or ()), 'hits': self.hits, 'fallbacks': self.fallbacks}
+
+id_index = {table: IdIndex(table, column) for table, (column, prefix) in ID_SEQUENCES.items()}
+
+# Hands out IDs from blocks reserved on the table's sequence, so a terminal only goes to the
+# database once every ID_BLOCK_SIZE IDs. IDs left in a block when the app exits are skipped.
+class IdAllocator:
+    def __init__(self, table, column, prefix):
+        self.table = table
+        self.column = column
+        self.prefix = prefix
+        self.sequence = f"{table}_ID_SEQ"
+        self._next = 0
+        self._end = 0
+        self._prefetch = None  # Future of the next block, reserved on a worker thread
+        self._draft = None  # ID shown on the insert screen until a row takes it
+        self._lock = threading.Lock()
+        self.reservations = 0
+        events.subscribe(table, self.on_change)
+
+    def on_change(self, action, row):
+        # Once a row takes the draft ID, the insert screen moves on to a new one
+        if action == 'insert':
+            with self._lock:
+                if row.get(self.column) == self._draft:
+                    self._draft = None
+
+    def _reserve(self):
+        # Uses the block fetched in the background when there is one, else reserves it here.
+        # Inside a transaction the worker may be queued behind our own connection, so only a
+        # finished prefetch is used there.
+        prefetch, self._prefetch = self._prefetch, None
+        start = None
+        if prefetch is not None and (prefetch.done() or not dbms.in_transaction()):
+            try:
+                start = prefetch.result()
+            except DATABASE_ERRORS:
+                pass
+        if start is None:
+            start = dbms.reserve_ids(self.sequence)
+        # A block below the one handed out last means a reservation was rolled back. Jumping past
+        # it would hand out IDs the sequence never reserved, so the sequence is read again instead.
+        while start < self._end:
+            start = dbms.reserve_ids(self.sequence)
+        self._next, self._end = start, start + ID_BLOCK_SIZE
+        self.reservations += 1
+
+    def _take(self):
+        while True:
+            if self._next >= self._end:
+                self._reserve()
+            new_id = f"{self.prefix}{self._next:0{ID_DIGITS}d}"
+            self._next += 1
+            # The next block is requested on the pool once a quarter of this one is left
+            if self._prefetch is None and self._end - self._next <= ID_BLOCK_SIZE // 4:
+                self._prefetch = background.run(dbms.reserve_ids, self.sequence)
+            # Skip IDs staff have already typed in by hand
+            if not id_index[self.table].known(new_id):
+                return new_id
+
+    def next(self):
+        with self._lock:
+            return self._take()
+
+    def draft(self, wait=True):
+        # The same ID until a row is inserted with it, so opening a screen or failing validation
+        # does not burn IDs. With wait=False, returns None rather than waiting for a new block.
+        with self._lock:
+            if self._draft is None or id_index[self.table].known(self._draft):
+                if not wait and self._next >= self._end and not (self._prefetch and self._prefetch.done()):
+                    return None
+                self._draft = self._take()
+            return self._draft
+
+id_allocator = {table: IdAllocator(table, column, prefix) for table, (column, prefix) in ID_SEQUENCES.items()}
+
+# Fills an insert screen's ID field with the table's draft ID; staff can still type their own.
+# A draft that needs a fresh block is fetched on the background pool and filled in if the field
+# is still empty by then.
+def prefill_id(entry, table):
+    entry.delete(0, END)
+    draft = id_allocator[table].draft(wait=False)
+    if draft is not None:
+        entry.insert(0, draft)
+        return
+
+    def fill(draft):
+        if not entry.get():
+            entry.insert(0, draft)
+    background.submit(entry, id_allocator[table].draft, on_done=fill,
+                      on_error=lambda e: print(f"ID prefill failed: {e}"))
+
+# First sale of every customer who has bought anything, kept current from published SALES
+# writes so first purchase checks at the counter are answered in memory. Updated or deleted
+# sales can move a customer's first sale, so those trigger a reload on a worker thread.
+class PurchaseRegistry:
+    QUERY = """
+        SELECT customer_id, sale_id FROM (
+            SELECT customer_id, sale_id,
+                   ROW_NUMBER() OVER (PARTITION BY customer_id ORDER BY sale_date, sale_id) AS position
+            FROM SALES
+            WHERE customer_id IS NOT NULL) first_sales
+        WHERE position = 1"""
+
+    def __init__(self, reconcile_interval=300):
+        self.reconcile_interval = reconcile_interval
+        self._first_sales = None  # customer_id -> sale_id
+        self._customers = None  # sale_id -> customer_id, for the first sales only
+        self._loaded_at = 0.0
+        self._reloading = None  # Inserts seen while a reload is running, replayed over its result
+        self._stale = False  # An update or delete arrived during the reload, so it needs another
+        self._lock = threading.Lock()
+        events.subscribe('SALES', self.on_change)
+
+    def load(self):
+        with self._lock:
+            self._reloading = []
+            self._stale = False
+        try:
+            first_sales = dict(dbms.fetch_query(self.QUERY))
+        except BaseException:
+            with self._lock:
+                self._reloading = None
+            raise
+        with self._lock:
+            customers = {sale_id: customer_id for customer_id, sale_id in first_sales.items()}
+            for customer_id, sale_id in self._reloading:
+                self._record(first_sales, customers, customer_id, sale_id)
+            self._first_sales, self._customers = first_sales, customers
+            self._reloading = None
+            self._loaded_at = time.monotonic()
+            stale = self._stale
+        if stale:
+            self.load()
+
+    def reconcile(self):
+        # Reloads on a worker thread while checks keep using the current maps
+        with self._lock:
+            if self._reloading is not None:
+                self._stale = True
+                return
+        background.run(self.load)
+
+    def _record(self, first_sales, customers, customer_id, sale_id):
+        if customer_id is not None and customer_id not in first_sales:
+            first_sales[customer_id] = sale_id
+            customers[sale_id] = customer_id
+
+    def on_change(self, action, row):
+        if action != 'insert':
+            self.reconcile()
+            return
+        with self._lock:
+            if self._first_sales is not None:
+                self._record(self._first_sales, self._customers, row.get('customer_id'), row.get('sale_id'))
+            if self._reloading is not None:
+                self._reloading.append((row.get('customer_id'), row.get('sale_id')))
+
+    def _ensure_loaded(self):
+        if self._first_sales is None:
+            self.load()
+        elif time.monotonic() - self._loaded_at > self.reconcile_interval:
+            self.reconcile()
+
+    def has_purchased(self, customer_id):
+        self._ensure_loaded()
+        with self._lock:
+            return customer_id in self._first_sales
+
+    def is_first_sale(self, sale_id):
+        # True when sale_id is its customer's earliest sale
+        self._ensure_loaded()
+        with self._lock:
+            return sale_id in self._customers
+
+    def stats(self):
+        with self._lock:
+            return {'customers': len(self._first_sales or ())}
+
+purchases = PurchaseRegistry()
+
+# Expiry date as a datetime.date, from database values or the DD-Mon-YY text the screens send
+def _as_date(value):
+    if value is None or value == '':
+        return None
+    if isinstance(value, datetime):
+        return value.date()
+    if hasattr(value, 'year'):
+        return value
+    for fmt in ('%d-%b-%y', '%d-%b-%Y', '%Y-%m-%d'):
+        try:
+            return datetime.strptime(str(value)[:11].strip(), fmt).date()
+        except ValueError:
+            pass
+    return None
+
+# Other terminals' MEDICINE writes, found without reading the whole table. Inserts and updates
+# stamp version from one table-wide counter and deletes leave a stamped MEDICINE_TOMBSTONE row
+# (see the medicine_changes migration), so a poll reads only rows stamped since an earlier poll
+# and publishes them as MEDICINE events, the path this terminal's own writes take. The in-memory
+# MEDICINE views load in full once at startup and stay current from those events.
+class MedicineChanges:
+    CHANGED = ("SELECT medicine_id, m_name, quantity, reorder_level, expiry_date, version "
+               "FROM MEDICINE WHERE version > :1")
+    DELETED = "SELECT medicine_id, version FROM MEDICINE_TOMBSTONE WHERE version > :1"
+
+    def __init__(self):
+        self._marks = None  # Highest stamps seen by the previous two polls, older first
+        self._timer = None
+        self._lock = threading.Lock()
+        self.polls = 0
+        self.published = 0
+
+    def _high_water(self):
+        return max(dbms.fetch_query("SELECT MAX(version) FROM MEDICINE")[0][0] or 0,
+                   dbms.fetch_query("SELECT MAX(version) FROM MEDICINE_TOMBSTONE")[0][0] or 0)
+
+    def mark(self):
+        # Called before every full read of MEDICINE; the first call sets where polling starts, so
+        # nothing written while the startup loads run is missed
+        with self._lock:
+            if self._marks is not None:
+                return
+        high = self._high_water()
+        with self._lock:
+            if self._marks is None:
+                self._marks = (high, high)
+
+    def poll(self):
+        # Reads from the older mark: a row is stamped when written but only seen once committed, so
+        # a slow transaction can land below the newest mark. Rows read twice change nothing.
+        with self._lock:
+            if self._marks is None:
+                return 0
+            since, latest = self._marks
+        rows = dbms.fetch_query(self.CHANGED, (since,))
+        deleted = dbms.fetch_query(self.DELETED, (since,))
+        with self._lock:
+            self._marks = (latest, max([latest] + [row[-1] for row in rows] + [row[-1] for row in deleted]))
+        changed = set()
+        for medicine_id, m_name, quantity, reorder_level, expiry_date, version in rows:
+            changed.add(medicine_id)
+            events.publish('MEDICINE', 'update', {'medicine_id': medicine_id, 'm_name': m_name, 'quantity': quantity,
+                                                  'reorder_level': reorder_level, 'expiry_date': expiry_date})
+        gone = [medicine_id for medicine_id, version in deleted if medicine_id not in changed]  # Not since re-added
+        for medicine_id in gone:
+            events.publish('MEDICINE', 'delete', {'medicine_id': medicine_id})
+        self.polls += 1
+        self.published += len(rows) + len(gone)
+        return len(rows) + len(gone)
+
+    def start(self, interval=60, delay=None):
+        # Polls on a daemon timer every interval seconds until stop()
+        def tick():
+            try:
+                with dbms.raise_errors():
+                    self.poll()
+            except DATABASE_ERRORS as e:
+                print(f"Medicine change poll failed: {e}")
+            self.start(interval)
+        self._timer = threading.Timer(interval if delay is None else delay, tick)
+        self._timer.daemon = True
+        self._timer.start()
+
+    def stop(self):
+        if self._timer:
+            self._timer.cancel()
+
+    def stats(self):
+        return {'polls': self.polls, 'published': self.published, 'marks': self._marks}
+
+medicine_changes = MedicineChanges()
+
+# Medicines ordered by expiry date, loaded once and kept current from published MEDICINE writes,
+# so "what expires in the next N days" is two bisects and a slice instead of a table scan.
+# Other terminals' writes arrive through MedicineChanges. An edit into the near-expiry window
+# publishes a MEDICINE_EXPIRY event; scan() publishes one for medicines that crossed into the
+# window or expired as the date moved on since the previous scan; start() runs it on a timer.
+class ExpiryIndex:
+    NEAR_EXPIRY_DAYS = 30
+
+    def __init__(self, near_expiry_days=NEAR_EXPIRY_DAYS):
+        self.near_expiry_days = near_expiry_days
+        self._entries = None  # Sorted [(expiry date, medicine_id)]
+        self._medicines = {}  # medicine_id -> (expiry date, m_name)
+        self._reloading = None  # Changes seen while a reload is running, replayed over its result
+        self._scanned_on = None  # Day of the previous scan
+        self._timer = None
+        self._lock = threading.Lock()
+        events.subscribe('MEDICINE', self.on_change)
+
+    def load(self):
+        with self._lock:
+            self._reloading = []
+        try:
+            medicine_changes.mark()
+            rows = dbms.fetch_query("SELECT medicine_id, m_name, expiry_date FROM MEDICINE")
+        except BaseException:
+            with self._lock:
+                self._reloading = None
+            raise
+        with self._lock:
+            medicines = {medicine_id: (_as_date(expiry), m_name) for medicine_id, m_name, expiry in rows}
+            self._entries = sorted((expiry, medicine_id) for medicine_id, (expiry, m_name) in medicines.items()
+                                   if expiry is not None)
+            self._medicines = medicines
+            for action, row in self._reloading:
+                self._apply(action, row)
+            self._reloading = None
+
+    def _remove(self, medicine_id):
+        expiry, m_name = self._medicines.pop(medicine_id, (None, None))
+        if expiry is not None:
+            position = bisect_left(self._entries, (expiry, medicine_id))
+            if position < len(self._entries) and self._entries[position] == (expiry, medicine_id):
+                del self._entries[position]
+        return expiry, m_name
+
+    def _apply(self, action, row):
+        # Returns (old expiry, new expiry) of the changed medicine
+        medicine_id = row.get('medicine_id')
+        old, m_name = self._remove(medicine_id)
+        if action == 'delete':
+            return old, None
+        expiry = _as_date(row['expiry_date']) if 'expiry_date' in row else old
+        self._medicines[medicine_id] = (expiry, row.get('m_name', m_name))
+        if expiry is not None:
+            insort(self._entries, (expiry, medicine_id))
+        return old, expiry
+
+    def on_change(self, action, row):
+        with self._lock:
+            if self._reloading is not None:
+                self._reloading.append((action, row))
+            if self._entries is None:
+                return
+            old, new = self._apply(action, row)
+            today = datetime.now().date()
+            horizon = today + timedelta(days=self.near_expiry_days)
+        # An edit that brings the expiry date into the window is a crossing too
+        if new is not None and today <= new <= horizon and not (old is not None and today <= old <= horizon):
+            self._publish('near_expiry', row.get('medicine_id'), new)
+
+    def _range(self, first, last):
+        # Entries with first <= expiry date <= last
+        if self._entries is None:
+            self.load()
+        with self._lock:
+            low = bisect_left(self._entries, (first,))
+            high = bisect_left(self._entries, (last + timedelta(days=1),))
+            return [(medicine_id, self._medicines[medicine_id][1], expiry)
+                    for expiry, medicine_id in self._entries[low:high]]
+
+    def expiring_within(self, days, today=None):
+        # [(medicine_id, m_name, expiry date)] expiring from today to today + days, soonest first
+        today = today or datetime.now().date()
+        return self._range(today, today + timedelta(days=days))
+
+    def near_expiry(self):
+        # Same rows as the check_near_expiry procedure: (m_name, expiry date, days remaining)
+        today = datetime.now().date()
+        return [(m_name, expiry, (expiry - today).days)
+                for medicine_id, m_name, expiry in self.expiring_within(self.near_expiry_days, today)]
+
+    def _publish(self, action, medicine_id, expiry):
+        with self._lock:
+            m_name = self._medicines.get(medicine_id, (None, None))[1]
+        events.publish('MEDICINE_EXPIRY', action, {'medicine_id': medicine_id, 'm_name': m_name, 'expiry_date': expiry})
+
+    def scan(self, today=None):
+        # Only the days passed since the previous scan are read; the first scan sets the baseline
+        today = today or datetime.now().date()
+        previous, self._scanned_on = self._scanned_on, today
+        if previous is None or today <= previous:
+            if self._entries is None:
+                self.load()
+            return []
+        window = timedelta(days=self.near_expiry_days)
+        crossings = [('near_expiry', entry) for entry in self._range(previous + window + timedelta(days=1), today + window)]
+        crossings += [('expired', entry) for entry in self._range(previous, today - timedelta(days=1))]
+        for action, (medicine_id, m_name, expiry) in crossings:
+            self._publish(action, medicine_id, expiry)
+        return crossings
+
+    def start(self, interval=3600, delay=0):
+        # Scans the in-memory index on a daemon timer, first after delay seconds and then every
+        # interval, until stop(); only the first scan reads MEDICINE
+        def tick():
+            try:
+                with dbms.raise_errors():
+                    self.scan()
+            except DATABASE_ERRORS as e:
+                print(f"Expiry scan failed: {e}")
+            self.start(interval, interval)
+        self._timer = threading.Timer(delay, tick)
+        self._timer.daemon = True
+        self._timer.start()
+
+    def stop(self):
+        if self._timer:
+            self._timer.cancel()
+
+expiry_index = ExpiryIndex()
+
+# Stock level and reorder threshold of every medicine, read in full once at startup and then
+# kept current from published writes: a sale item takes its quantity off the medicine the
+# stock trigger just decremented, and medicine edits set it outright. Only the medicine a
+# write touched is re-evaluated. Other terminals' writes arrive as medicine edits through
+# MedicineChanges. Crossing below the threshold publishes a MEDICINE_STOCK
+# 'reorder' event; getting back to it or above publishes 'restocked'.
+class StockMonitor:
+    DEFAULT_REORDER_LEVEL = 50  # check_low_stock's threshold, for medicines without reorder_level
+
+    def __init__(self):
+        self._stock = None  # medicine_id -> [m_name, quantity, reorder_level]
+        self._reloading = None  # Changes seen while a reload is running, replayed over its result
+        self._lock = threading.Lock()
+        events.subscribe('MEDICINE', lambda action, row: self.on_change('MEDICINE', action, row))
+        events.subscribe('SALES_ITEMS', lambda action, row: self.on_change('SALES_ITEMS', action, row))
+
+    def load(self):
+        # Startup reconciliation; the only full read of MEDICINE
+        with self._lock:
+            self._reloading = []
+        try:
+            medicine_changes.mark()
+            rows = dbms.fetch_query("SELECT medicine_id, m_name, quantity, reorder_level FROM MEDICINE")
+        except BaseException:
+            with self._lock:
+                self._reloading = None
+            raise
+        with self._lock:
+            self._stock = {medicine_id: [m_name, quantity or 0, reorder_level or self.DEFAULT_REORDER_LEVEL]
+                           for medicine_id, m_name, quantity, reorder_level in rows}
+            replay, self._reloading = self._reloading, None
+            for table, action, row in replay:
+                self._apply(table, action, row)
+
+    def _apply(self, table, action, row):
+        # Returns (medicine_id, low before, low after), or None when the write did not move stock
+        medicine_id = row.get('medicine_id')
+        entry = self._stock.get(medicine_id)
+        before = entry is not None and entry[1] < entry[2]
+        if table == 'SALES_ITEMS':
+            if action != 'insert' or entry is None:
+                return None
+            entry[1] -= int(row['quantity'])
+        elif action == 'delete':
+            self._stock.pop(medicine_id, None)
+            return None
+        else:
+            if entry is None:
+                entry = self._stock[medicine_id] = [None, 0, self.DEFAULT_REORDER_LEVEL]
+            entry[0] = row.get('m_name', entry[0])
+            if row.get('quantity') not in (None, ''):
+                entry[1] = int(row['quantity'])
+            if 'reorder_level' in row:
+                entry[2] = row['reorder_level'] or self.DEFAULT_REORDER_LEVEL
+        return medicine_id, before, entry[1] < entry[2]
+
+    def on_change(self, table, action, row):
+        with self._lock:
+            if self._reloading is not None:
+                self._reloading.append((table, action, row))
+            if self._stock is None:
+                return
+            change = self._apply(table, action, row)
+            if change is None or change[1] == change[2]:
+                return
+            medicine_id, was_low, is_low = change
+            m_name, quantity, reorder_level = self._stock[medicine_id]
+        self._publish(medicine_id, m_name, quantity, reorder_level)
+
+    def _publish(self, medicine_id, m_name, quantity, reorder_level):
+        events.publish('MEDICINE_STOCK', 'reorder' if quantity < reorder_level else 'restocked',
+                       {'medicine_id': medicine_id, 'm_name': m_name, 'quantity': quantity, 'reorder_level': reorder_level})
+
+    def low_stock(self):
+        # Same rows as the check_low_stock procedure: (m_name, quantity), lowest first
+        if self._stock is None:
+            self.load()
+        with self._lock:
+            return sorted(((m_name, quantity) for m_name, quantity, reorder_level in self._stock.values()
+                           if quantity < reorder_level), key=lambda row: row[1])
+
+    def set_reorder_level(self, medicine_id, reorder_level):
+        # None goes back to DEFAULT_REORDER_LEVEL
+        if not dbms.execute_query("UPDATE MEDICINE SET reorder_level = :1 WHERE medicine_id = :2",
+                                  (reorder_level, medicine_id), show_success=False):
+            return False
+        events.publish('MEDICINE', 'update', {'medicine_id': medicine_id, 'reorder_level': reorder_level})
+        return True
+
+stock_monitor = StockMonitor()
+
+# Handle on work submitted to the BackgroundLoader
+class BackgroundTask:
+    def __init__(self, future, owned=True):
+        self.future = future
+        self.owned = owned  # Futures shared with other screens keep running when this one goes away
+        self.cancelled = False
+
+    def cancel(self):
+        self.cancelled = True
+        if self.owned:
+            self.future.cancel()
+
+# Runs SQL on worker threads so the Tk main loop never blocks on the database. Tk is not
+# thread-safe, so results are collected by polling the future with after() on the Tk thread.
+class BackgroundLoader:
+    POLL_MS = 15
+    INDICATOR_DELAY_MS = 150  # Fast loads finish before the indicator would only flicker
+
+    def __init__(self, workers=4):
+        self.executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix='db-worker')
+
+    def _run(self, fn, args):
+        with dbms.raise_errors():
+            return fn(*args)
+
+    def run(self, fn, *args):
+        # Plain future for callers that collect results themselves
+        return self.executor.submit(self._run, fn, args)
+
+    def submit(self, widget, fn, *args, on_done=None, on_error=None, indicator=None, on_cancel=None):
+        return self.watch(widget, BackgroundTask(self.run(fn, *args)), on_done, on_error, indicator, on_cancel)
+
+    @staticmethod
+    def _screen(widget):
+        while widget is not None and not isinstance(widget, Screen):
+            widget = widget.master
+        return widget
+
+    def own(self, widget, task):
+        # Hiding the widget's screen cancels whatever it was still waiting for; widgets outside a
+        # screen are cancelled when destroyed. Returns the screen, if any, to discard the task from
+        screen = self._screen(widget)
+        if screen is not None:
+            screen.tasks.add(task)
+        else:
+            def on_destroy(event):
+                if event.widget is widget:
+                    task.cancel()
+            widget.bind('<Destroy>', on_destroy, add='+')
+        return screen
+
+    @staticmethod
+    def loading_label(indicator):
+        label = Label(indicator, text='Loading...', font=('Georgia', 14, 'bold'), bg='black', fg='white')
+        label.place(relx=0.5, rely=0.5, anchor='center')
+        return label
+
+    def watch(self, widget, task, on_done=None, on_error=None, indicator=None, on_cancel=None):
+        # Delivers a task's result to widget's Tk thread; use BackgroundTask(future, owned=False)
+        # for a future that should outlive the widget. on_cancel runs on the Tk thread if the
+        # task is cancelled before its result is delivered.
+        label = None
+        started = time.perf_counter()
+        screen = self.own(widget, task)
+
+        def poll():
+            nonlocal label
+            if not widget.winfo_exists():
+                return
+            if task.cancelled:
+                if label is not None:
+                    label.destroy()
+                if on_cancel:
+                    on_cancel()
+                return
+            if not task.future.done():
+                waited_ms = (time.perf_counter() - started) * 1000
+                if indicator is not None and label is None and waited_ms >= self.INDICATOR_DELAY_MS:
+                    label = self.loading_label(indicator)
+                widget.after(self.POLL_MS, poll)
+                return
+            if label is not None:
+                label.destroy()
+            if screen is not None:
+                screen.tasks.discard(task)
+            try:
+                result = task.future.result()
+            except Exception as e:
+                if on_error:
+                    on_error(e)
+                else:
+                    messagebox.showerror("Database Error", str(e))
+                return
+            if on_done:
+                on_done(result)
+
+        widget.after(self.POLL_MS, poll)
+        return task
+
+background = BackgroundLoader()
+
+# Near-expiry and low-stock alerts for the home page. Both checks run at the same time on the
+# background pool and their rows are reused for refresh_interval seconds, so coming back to the
+# home page does not run them again. Writes that change stock or expiry dates expire the cache.
+class AlertService:
+    CHECKS = {
+        'near_expiry': lambda: expiry_index.near_expiry(),  # Read from the in-memory expiry index
+        'low_stock': lambda: stock_monitor.low_stock(),  # Kept current by the stock monitor
+    }
+
+    def __init__(self, refresh_interval=300):
+        self.refresh_interval = refresh_interval
+        self._futures = {}  # check -> (started at, Future with its rows)
+        self._lock = threading.Lock()
+        self.changes = 0  # Bumped by every alert event; screens showing the checks refetch when it moves
+        for table in ('MEDICINE', 'SALES_ITEMS'):
+            events.subscribe(table, lambda action, row: self.invalidate())
+        for table in ('MEDICINE_STOCK', 'MEDICINE_EXPIRY'):
+            events.subscribe(table, self.on_alert)
+
+    def on_alert(self, action, row):
+        # A medicine crossed its reorder level or an expiry boundary, possibly through another
+        # terminal's writes found by MedicineChanges
+        with self._lock:
+            self._futures.clear()
+            self.changes += 1
+
+    def _fresh(self, started, future):
+        if not future.done():
+            return True  # Already running; callers share the result
+        if future.cancelled() or future.exception() is not None:
+            return False
+        return time.monotonic() - started < self.refresh_interval
+
+    def fetch(self, check):
+        with self._lock:
+            entry = self._futures.get(check)
+            if entry is None or not self._fresh(*entry):
+                entry = self._futures[check] = (time.monotonic(), background.run(self.CHECKS[check]))
+            return entry[1]
+
+    def fetch_all(self):
+        return {check: self.fetch(check) for check in self.CHECKS}
+
+    def invalidate(self):
+        with self._lock:
+            self._futures.clear()
+
+alerts = AlertService()
+ALERT_POLL_MS = 1000  # How often an open home page looks for new alert events
+
+# Images shipped next to this file, decoded once and scaled once per target size.
+# PhotoImages are shared by every screen that asks for the same (name, size)
+class AssetManager:
+    DIRECTORY = os.path.dirname(os.path.abspath(__file__))
+
+    def __init__(self, directory=None):
+        self.directory = directory or self.DIRECTORY
+        self._lock = threading.Lock()
+        self._decoded = {}  # name -> PIL image as stored on disk
+        self._scaled = {}  # (name, size) -> PIL image fitted to size
+        self._photos = {}  # (name, size) -> ImageTk.PhotoImage
+
+    def path(self, name):
+        return os.path.join(self.directory, name)
+
+    def _load_pil(self):
+        global Image, ImageOps, ImageTk
+        if Image is None:
+            with profiler.stage('import PIL'):
+                from PIL import Image, ImageOps, ImageTk
+
+    def image(self, name, size=None):
+        # Safe to call from a worker thread, e.g. to warm the cache before the first screen
+        key = (name, size)
+        with self._lock:
+            self._load_pil()
+            scaled = self._scaled.get(key)
+            if scaled is None:
+                decoded = self._decoded.get(name)
+                if decoded is None:
+                    with Image.open(self.path(name)) as source:
+                        decoded = self._decoded[name] = source.convert('RGB')
+                # Scale to cover the target and crop the overflow, so the aspect ratio is kept
+                scaled = self._scaled[key] = decoded if size is None else ImageOps.fit(decoded, size, Image.LANCZOS)
+            return scaled
+
+    def photo(self, name, size=None):
+        # Tk objects must be made on the Tk thread, after the root window exists. Keeping them
+        # here also keeps them alive, since Tk drops a PhotoImage as soon as Python does
+        key = (name, size)
+        photo = self._photos.get(key)
+        if photo is None:
+            image = self.image(name, size)  # Imports PIL, so ImageTk is only looked up afterwards
+            photo = self._photos[key] = ImageTk.PhotoImage(image)
+        return photo
+
+    def memory(self):
+        # Approximate bytes held: PIL pixel buffers, plus 4 bytes a pixel for each Tk photo
+        with self._lock:
+            decoded = sum(len(image.getbands()) * image.width * image.height for image in self._decoded.values())
+            scaled = sum(len(image.getbands()) * image.width * image.height
+                         for (name, size), image in self._scaled.items() if size is not None)
+        photos = sum(4 * photo.width() * photo.height() for photo in self._photos.values())
+        return {'decoded': decoded, 'scaled': scaled, 'photos': photos, 'total': decoded + scaled + photos}
+
+    def report(self):
+        memory = self.memory()
+        lines = [f"{len(self._decoded)} decoded, {len(self._scaled)} scaled, {len(self._photos)} photo images"]
+        lines += [f"  {kind:<8} {size / 2**20:8.2f} MiB" for kind, size in memory.items()]
+        return '\n'.join(lines)
+
+assets = AssetManager()
+
+# One page of the app. Screens are built once and kept; title/geometry/resizable are
+# remembered here and applied to the shared root window whenever the screen is shown
+class Screen(Frame):
+    def __init__(self, master):
+        super().__init__(master)
+        self.on_show = []
+        self.on_hide = []
+        self.tasks = set()  # BackgroundTasks still delivering to this screen
+        self._title = None
+        self._geometry = None
+        self._resizable = None
+
+    def cancel_tasks(self):
+        # Called when the screen is hidden, so nothing keeps loading into a page nobody sees
+        for task in self.tasks:
+            task.cancel()
+        self.tasks.clear()
+
+    def title(self, text):
+        self._title = text
+
+    def geometry(self, spec):
+        self._geometry = spec
+
+    def resizable(self, width, height):
+        self._resizable = (width, height)
+
+# Application Pattern - One Tk root for the whole session; navigation swaps the visible
+# screen instead of destroying the window and building the next one from scratch
+class Application:
+    def __init__(self):
+        self.root = None
+        self.screens = {}  # builder function -> its Screen
+        self.current = None
+        self.last_switch_ms = None
+
+    def show(self, builder):
+        started = time.perf_counter()
+        if self.root is None:
+            self.root = Tk()
+        screen = self.screens.get(builder)
+        if screen is None:
+            screen = self.screens[builder] = Screen(self.root)
+            with profiler.stage(f'build {builder.__name__}'):
+                builder(screen)
+        if screen is not self.current:
+            if self.current is not None:
+                self.current.cancel_tasks()
+                for hook in self.current.on_hide:
+                    hook()
+                self.current.place_forget()
+            self._apply(screen)
+            screen.place(x=0, y=0, relwidth=1, relheight=1)
+            self.current = screen
+            for hook in screen.on_show:
+                hook()
+        self.last_switch_ms = (time.perf_counter() - started) * 1000
+        return screen
+
+    def _apply(self, screen):
+        if screen._title is not None:
+            self.root.title(screen._title)
+        if screen._geometry is not None:
+            # Only the first screen positions the window; later ones resize it where the user left it
+            spec = screen._geometry if self.current is None else screen._geometry.split('+')[0]
+            self.root.geometry(spec)
+        if screen._resizable is not None:
+            self.root.resizable(*screen._resizable)
+
+    def run(self, builder, on_visible=None):
+        if self.root is None:
+            with profiler.stage('create Tk root'):
+                self.root = Tk()
+        self.show(builder)
+        if on_visible:
+            # Idle callbacks run once the first screen has been drawn
+            self.root.after_idle(on_visible)
+        self.root.mainloop()
+
+application = Application()
+show_screen = application.show
+
+# Streams query results into a Treeview. A worker reads the cursor with fetchmany(chunk_size)
+# and the Tk thread inserts one chunk per event-loop tick, so the first rows show up immediately
+# and the window keeps repainting while the rest arrive.
+class TreeviewStreamer:
+    CHUNK_SIZE = 50
+    TICK_MS = 1  # Between chunks already fetched; waiting on the worker polls at BackgroundLoader.POLL_MS
+    # Instrumentation hook called as hook(event, elapsed_ms, rows) for 'first_row' and 'complete'
+    metrics_hook = None
+
+    def __init__(self, tree, chunk_size=None, key=None, on_metrics=None):
+        self.tree = tree
+        self.chunk_size = chunk_size or self.CHUNK_SIZE
+        self.key = key  # Item id of a row, e.g. its primary key; Tk numbers the items otherwise
+        self.on_metrics = on_metrics or self.metrics_hook
+        self.metrics = {}
+
+    def _produce(self, task, batches, source, args):
+        rows = source(*args, size=self.chunk_size)
+        try:
+            for batch in rows:
+                if task.cancelled:
+                    return
+                batches.put(batch)
+        finally:
+            rows.close()  # Hands the session back if the stream stopped part-way
+
+    def _insert(self, record, index):
+        if self.key is None:
+            self.tree.insert("", index, values=tuple(record))
+        else:
+            self.tree.insert("", index, iid=self.key(record), values=tuple(record))
+
+    def start(self, source, *args, index="end", on_chunk=None, on_done=None, on_error=None, on_cancel=None, indicator=None):
+        # Inserts the batches of source(*args, size=chunk_size) at index: "end", or 0 for rows that
+        # arrive bottom-up. on_chunk(count) runs after each chunk and on_done(rows) after the last.
+        tree = self.tree
+        batches = queue.Queue()
+        pending = deque()
+        task = BackgroundTask(None)
+        task.future = background.run(self._produce, task, batches, source, args)
+        screen = background.own(tree, task)
+        started = time.perf_counter()
+        self.metrics = metrics = {}
+        rows = 0
+        label = None
+
+        def record(event):
+            elapsed_ms = (time.perf_counter() - started) * 1000
+            metrics[event] = elapsed_ms
+            if self.on_metrics:
+                self.on_metrics(event, elapsed_ms, rows)
+
+        def drain():
+            nonlocal rows, label
+            if not tree.winfo_exists():
+                return
+            if task.cancelled:
+                if label is not None:
+                    label.destroy()
+                if on_cancel:
+                    on_cancel()
+                return
+            while len(pending) < self.chunk_size:
+                try:
+                    pending.extend(batches.get_nowait())
+                except queue.Empty:
+                    break
+            if pending:
+                if label is not None:
+                    label.destroy()
+                    label = None
+                count = min(self.chunk_size, len(pending))
+                for _ in range(count):
+                    self._insert(pending.popleft(), index)
+                rows += count
+                if rows == count:
+                    record('first_row')
+                if on_chunk:
+                    on_chunk(count)
+                tree.after(self.TICK_MS, drain)
+                return
+            # The worker puts its last batch before the future completes, so done and empty is final
+            if not task.future.done() or not batches.empty():
+                waited_ms = (time.perf_counter() - started) * 1000
+                if indicator is not None and label is None and waited_ms >= background.INDICATOR_DELAY_MS:
+                    label = background.loading_label(indicator)
+                tree.after(background.POLL_MS, drain)
+                return
+            if label is not None:
+                label.destroy()
+            if screen is not None:
+                screen.tasks.discard(task)
+            try:
+                task.future.result()
+            except Exception as e:
+                if on_error:
+                    on_error(e)
+                else:
+                    messagebox.showerror("Database Error", str(e))
+                return
+            record('complete')
+            if on_done:
+                on_done(rows)
+
+        tree.after(self.TICK_MS, drain)
+        return task
+
+# Keyset pagination over a table ordered by its primary key, so no page ever scans past an OFFSET
+class KeysetPager:
+    def __init__(self, table, key_column, page_size=200):
+        self.table = table
+        self.key_column = key_column
+        self.page_size = page_size
+
+    def page_query(self, key=None, before=False):
+        # Rows before key come nearest first (DESC), the order they are inserted above the view
+        query = f"SELECT * FROM {self.table}"
+        params = ()
+        if key is not None:
+            query += f" WHERE {self.key_column} {'<' if before else '>'} :1"
+            params = (key,)
+        query += f" ORDER BY {self.key_column}{' DESC' if before else ''}"
+        return dbms.backend.limit(query, self.page_size), params
+
+    def _cached(self):
+        return self.table in DatabaseManager.CACHED_TABLES
+
+    def batches(self, key=None, before=False, size=500):
+        # One page as fetchmany batches, for TreeviewStreamer
+        return dbms.iter_query(*self.page_query(key, before), size=size, cache=self._cached())
+
+    def first_page(self):
+        return dbms.fetch_query(*self.page_query(), cache=self._cached())
+
+    def page_after(self, key):
+        return dbms.fetch_query(*self.page_query(key), cache=self._cached())
+
+    def page_before(self, key):
+        return list(reversed(dbms.fetch_query(*self.page_query(key, before=True), cache=self._cached())))
+
+# Virtual scrolling for the view screens: pages are streamed in as the scrollbar nears either end
+# and the Treeview never holds more than max_rows rows (the far end is trimmed as it grows)
+class PagedTreeview:
+    def __init__(self, tree, v_scroll, pager, max_rows=1000, chunk_size=None):
+        self.tree = tree
+        self.v_scroll = v_scroll
+        self.pager = pager
+        self.max_rows = max(max_rows, 2 * pager.page_size)
+        self.streamer = TreeviewStreamer(tree, chunk_size, key=lambda record: str(record[0]))
+        self.more_before = False
+        self.more_after = True
+        self.loading = False
+        self.task = None
+        self.top_index = 0  # First visible row while a page streams in above it
+        tree.configure(yscrollcommand=self.on_scroll)
+
+    def _fetch(self, key=None, before=False, then=None, on_chunk=None):
+        # A page streams in from a worker a chunk per tick; the scroll handler ignores requests until it is all in
+        self.loading = True
+
+        def done(rows):
+            self.loading = False
+            then(rows)
+
+        def failed(error):
+            self.loading = False
+            messagebox.showerror("Database Error", str(error))
+
+        def cancelled():
+            if self.task is task:  # A later fetch may already be running
+                self.loading = False
+
+        task = self.task = self.streamer.start(self.pager.batches, key, before, index=0 if before else "end",
+                                               on_chunk=on_chunk, on_done=done, on_error=failed, on_cancel=cancelled,
+                                               indicator=self.tree.master)
+
+    def load(self):
+        if self.task is not None:
+            self.task.cancel()
+        self.tree.delete(*self.tree.get_children())
+        self.more_before = False
+        self._fetch(then=self._first_page_done)
+
+    def switch(self, pager):
+        # Shows another pager's rows, e.g. a different customer's history
+        self.pager = pager
+        self.load()
+
+    def _first_page_done(self, rows):
+        self.more_after = rows == self.pager.page_size
+
+    def _keep_view(self, top_index, total):
+        if total:
+            self.tree.yview_moveto(max(top_index, 0) / total)
+
+    def on_scroll(self, first, last):
+        self.v_scroll.set(first, last)
+        if self.loading:
+            return
+        first, last = float(first), float(last)
+        children = self.tree.get_children()
+        if not children:
+            return
+        if last >= 0.9 and self.more_after:
+            self._fetch(children[-1], then=self._append_done)
+        elif first <= 0.1 and self.more_before:
+            self.top_index = first * len(children)
+            self._fetch(children[0], before=True, then=self._prepend_done, on_chunk=self._prepended)
+
+    def _append_done(self, rows):
+        # Rows added below the view leave it where it is until the top is trimmed
+        self.more_after = rows == self.pager.page_size
+        children = self.tree.get_children()
+        excess = len(children) - self.max_rows
+        if excess > 0:
+            top_index = self.tree.yview()[0] * len(children)
+            self.tree.delete(*children[:excess])
+            self.more_before = True
+            self._keep_view(top_index - excess, len(children) - excess)
+
+    def _prepended(self, count):
+        # Rows inserted above the view would push it down, so it follows the rows it was showing
+        self.top_index += count
+        self._keep_view(self.top_index, len(self.tree.get_children()))
+
+    def _prepend_done(self, rows):
+        self.more_before = rows == self.pager.page_size
+        children = self.tree.get_children()
+        excess = len(children) - self.max_rows
+        if excess > 0:
+            self.tree.delete(*children[-excess:])
+            self.more_after = True
+            self._keep_view(self.top_index, len(children) - excess)
 
 #Viewing records in supplier
-def checkbysupplier():
+def checkbysupplier(root18):
      # Create a tkinter window for viewing records in the supplier table
-    root18 = Tk()
     root18.geometry('1000x700+250+50')  # Set window size
     root18.title('Checking Medicines in Supplier Page')  # Set window title
     root18.resizable(0, 0)  # Disable window resizing
     root18.config(bg='gray')  # Set background color
     
-    bgimg = Image.open(R"C:\Users\Nikhil\Downloads\SSN\College Files\Second Year\3rd Semester\Database Technology Lab\Mini Project\bgpic.jpg")
-    bgtk = ImageTk.PhotoImage(bgimg)
+    bgtk = assets.photo('bgpic.jpg', (1000, 750))
     bglabel = Label(root18, image=bgtk, height=750, width=1000)
     bglabel.place(x=0, y=0)
 
@@ -424,8 +2932,6 @@ def checkbysupplier():
     DetailsFrame = Frame(root18, bg='black', width=1000, height=540)
     DetailsFrame.place(x=0, y=120)
 
-    records = dbms.fetch_query("SELECT * FROM SUPPLIER")
-
     style = ttk.Style()
     style.configure("Treeview", font=("Georgia", 11))  
     style.configure("Treeview.Heading", font=("Georgia", 12, "bold"))  
@@ -445,13 +2951,13 @@ def checkbysupplier():
     v_scroll.place(x=980, y=30, height=480)
     h_scroll.place(x=0, y=500, width=980)
 
-    for record in records:
-        tree.insert("", "end", values=record)
+    # Rows are fetched page by page as the user scrolls, starting over each time the screen is shown
+    pages = PagedTreeview(tree, v_scroll, KeysetPager('SUPPLIER', 'supplier_id'))
+    root18.on_show.append(pages.load)
     
     #Function when back button is pressed
     def backpage():
-        root18.destroy()
-        check_medicine()
+        show_screen(check_medicine)
 
     #Button for going back to previous page
     backbutton = Button(root18,text='Back',command=backpage,font=('Georgia',18,'bold'),cursor='hand2',bd=0,bg='light blue',fg='black',activebackground='light blue')
@@ -459,26 +2965,21 @@ def checkbysupplier():
 
     #Function when back home button is pressed
     def backtohome():
-        root18.destroy()
-        introscreen()
+        show_screen(introscreen)
 
     #Button for going back to home page
     home_page_button = Button(root18,text='Back to home',command=backtohome,font=('Georgia',18,'bold'),cursor='hand2',bd=0,bg='light blue',fg='black',activebackground='light blue')
     home_page_button.place(x=760,y=25,width=220)
 
-    root18.mainloop()
-
 #Viewing records in medicine
-def checkbymedicine():
+def checkbymedicine(root19):
     #Create a tkinter page for viewing records in medicine page
-    root19 = Tk()
     root19.geometry('1000x700+250+50') #Set window size
     root19.title('Checking Medicines in Medicine Page') #Set window title
     root19.resizable(0,0) # Disable window resizing
     root19.config(bg='gray') #Set background colour
     
-    bgimg = Image.open(R"C:\Users\Nikhil\Downloads\SSN\College Files\Second Year\3rd Semester\Database Technology Lab\Mini Project\bgpic.jpg")
-    bgtk = ImageTk.PhotoImage(bgimg)
+    bgtk = assets.photo('bgpic.jpg', (1000, 750))
     bglabel = Label(root19, image=bgtk, height=750, width=1000)
     bglabel.place(x=0, y=0)
 
@@ -493,8 +2994,6 @@ def checkbymedicine():
     DetailsFrame = Frame(root19,bg='black',width=1000,height=540)
     DetailsFrame.place(x=0,y=120)
 
-    records = dbms.fetch_query("SELECT * FROM MEDICINE")
-
     style = ttk.Style()
     style.configure("Treeview", font=("Georgia", 11))  
     style.configure("Treeview.Heading", font=("Georgia", 12, "bold"))  
@@ -513,13 +3012,13 @@ def checkbymedicine():
     v_scroll.place(x=980, y=30, height=480)
     h_scroll.place(x=0, y=490, width=980)
         
-    for record in records:
-        tree.insert("", "end", values=record)
+    # Rows are fetched page by page as the user scrolls, starting over each time the screen is shown
+    pages = PagedTreeview(tree, v_scroll, KeysetPager('MEDICINE', 'medicine_id'))
+    root19.on_show.append(pages.load)
 
     #Function when back button is pressed
     def backpage():
-        root19.destroy()
-        check_medicine()
+        show_screen(check_medicine)
 
     #Button for going back to previous page
     backbutton = Button(root19,text='Back',command=backpage,font=('Georgia',18,'bold'),cursor='hand2',bd=0,bg='light blue',fg='black',activebackground='light blue')
@@ -527,26 +3026,21 @@ def checkbymedicine():
 
     #Function when back home button is pressed
     def backtohome():
-        root19.destroy()
-        introscreen()
+        show_screen(introscreen)
 
     #Button for going back to home page
     home_page_button = Button(root19,text='Back to home',command=backtohome,font=('Georgia',18,'bold'),cursor='hand2',bd=0,bg='light blue',fg='black',activebackground='light blue')
     home_page_button.place(x=760,y=25,width=220)
 
-    root19.mainloop()
-
 #Viewing records in customer
-def checkbycustomer():
+def checkbycustomer(root20):
     #Create a tkinter page for viewing records in customer page
-    root20 = Tk()
     root20.geometry('1000x700+250+50') #Set window size
     root20.title('Checking Medicines in Customer Page') #Set window title
     root20.resizable(0,0) # Disable window resizing
     root20.config(bg='gray') #Set background colour
     
-    bgimg = Image.open(R"C:\Users\Nikhil\Downloads\SSN\College Files\Second Year\3rd Semester\Database Technology Lab\Mini Project\bgpic.jpg")
-    bgtk = ImageTk.PhotoImage(bgimg)
+    bgtk = assets.photo('bgpic.jpg', (1000, 750))
     bglabel = Label(root20, image=bgtk, height=750, width=1000)
     bglabel.place(x=0, y=0)
 
@@ -561,8 +3055,6 @@ def checkbycustomer():
     DetailsFrame = Frame(root20,bg='black',width=1000,height=540)
     DetailsFrame.place(x=0,y=120)
 
-    records = dbms.fetch_query("SELECT * FROM CUSTOMER")
-
     style = ttk.Style()
     style.configure("Treeview", font=("Georgia", 11))  
     style.configure("Treeview.Heading", font=("Georgia", 12, "bold"))  
@@ -581,13 +3073,13 @@ def checkbycustomer():
     v_scroll.place(x=980, y=30, height=480)
     h_scroll.place(x=0, y=490, width=980)
 
-    for record in records:
-        tree.insert("", "end", values=record)
+    # Rows are fetched page by page as the user scrolls, starting over each time the screen is shown
+    pages = PagedTreeview(tree, v_scroll, KeysetPager('CUSTOMER', 'customer_id'))
+    root20.on_show.append(pages.load)
 
     #Function when back button is pressed
     def backpage():
-        root20.destroy()
-        check_medicine()
+        show_screen(check_medicine)
 
     #Button for going back to previous page
     backbutton = Button(root20,text='Back',command=backpage,font=('Georgia',18,'bold'),
@@ -596,27 +3088,22 @@ def checkbycustomer():
 
     #Function when back home button is pressed
     def backtohome():
-        root20.destroy()
-        introscreen()
+        show_screen(introscreen)
 
     #Button for going back to home page
     home_page_button = Button(root20,text='Back to home',command=backtohome,font=('Georgia',18,'bold'),
                               cursor='hand2',bd=0,bg='light blue',fg='black',activebackground='light blue')
     home_page_button.place(x=760,y=25,width=220)
 
-    root20.mainloop()
-
 #Viewing records in prescription
-def checkbyprescription():
+def checkbyprescription(root21):
     #Create a tkinter page for viewing records in prescription page
-    root21 = Tk()
     root21.geometry('1000x700+250+50') #Set window size
     root21.title('Checking Medicines in Prescription Page') #Set window title
     root21.resizable(0,0) # Disable window resizing
     root21.config(bg='gray') #Set background colour
 
-    bgimg = Image.open(R"C:\Users\Nikhil\Downloads\SSN\College Files\Second Year\3rd Semester\Database Technology Lab\Mini Project\bgpic.jpg")
-    bgtk = ImageTk.PhotoImage(bgimg)
+    bgtk = assets.photo('bgpic.jpg', (1000, 750))
     bglabel = Label(root21, image=bgtk, height=750, width=1000)
     bglabel.place(x=0, y=0)
 
@@ -631,8 +3118,6 @@ def checkbyprescription():
     DetailsFrame = Frame(root21,bg='black',width=1000,height=540)
     DetailsFrame.place(x=0,y=120)
 
-    records = dbms.fetch_query("SELECT * FROM PRESCRIPTION")
-
     style = ttk.Style()
     style.configure("Treeview", font=("Georgia", 11))  
     style.configure("Treeview.Heading", font=("Georgia", 12, "bold"))  
@@ -651,13 +3136,13 @@ def checkbyprescription():
     v_scroll.place(x=980, y=30, height=480)
     h_scroll.place(x=0, y=490, width=980)
 
-    for record in records:
-        tree.insert("", "end", values=record)
+    # Rows are fetched page by page as the user scrolls, starting over each time the screen is shown
+    pages = PagedTreeview(tree, v_scroll, KeysetPager('PRESCRIPTION', 'prescription_id'))
+    root21.on_show.append(pages.load)
 
     #Function when back button is pressed
     def backpage():
-        root21.destroy()
-        check_medicine()
+        show_screen(check_medicine)
 
     #Button for going back to previous page
     backbutton = Button(root21,text='Back',command=backpage,font=('Georgia',18,'bold'),
@@ -666,27 +3151,22 @@ def checkbyprescription():
 
     #Function when back home button is pressed
     def backtohome():
-        root21.destroy()
-        introscreen()
+        show_screen(introscreen)
 
     #Button for going back to home page
     home_page_button = Button(root21,text='Back to home',command=backtohome,font=('Georgia',18,'bold'),
                               cursor='hand2',bd=0,bg='light blue',fg='black',activebackground='light blue')
     home_page_button.place(x=760,y=25,width=220)
 
-    root21.mainloop()
-
 #Viewing records in Sales
-def checkbysales():
+def checkbysales(root22):
     #Create a tkinter page for viewing records in Sales page
-    root22 = Tk()
     root22.geometry('1000x700+250+50') #Set window size
     root22.title('Checking Medicines in Sales Page') #Set window title
     root22.resizable(0,0) # Disable window resizing
     root22.config(bg='gray') #Set background colour
     
-    bgimg = Image.open(R"C:\Users\Nikhil\Downloads\SSN\College Files\Second Year\3rd Semester\Database Technology Lab\Mini Project\bgpic.jpg")
-    bgtk = ImageTk.PhotoImage(bgimg)
+    bgtk = assets.photo('bgpic.jpg', (1000, 750))
     bglabel = Label(root22, image=bgtk, height=750, width=1000)
     bglabel.place(x=0, y=0)
 
@@ -701,8 +3181,6 @@ def checkbysales():
     DetailsFrame = Frame(root22,bg='black',width=1000,height=540)
     DetailsFrame.place(x=0,y=120)
 
-    records = dbms.fetch_query("SELECT * FROM SALES")
-
     style = ttk.Style()
     style.configure("Treeview", font=("Georgia", 11))  
     style.configure("Treeview.Heading", font=("Georgia", 12, "bold"))  
@@ -721,13 +3199,13 @@ def checkbysales():
     v_scroll.place(x=980, y=30, height=480)
     h_scroll.place(x=0, y=490, width=980)
         
-    for record in records:
-        tree.insert("", "end", values=record)
+    # Rows are fetched page by page as the user scrolls, starting over each time the screen is shown
+    pages = PagedTreeview(tree, v_scroll, KeysetPager('SALES', 'sale_id'))
+    root22.on_show.append(pages.load)
 
     #Function when back button is pressed
     def backpage():
-        root22.destroy()
-        check_medicine()
+        show_screen(check_medicine)
 
     #Button for going back to previous page
     backbutton = Button(root22,text='Back',command=backpage,font=('Georgia',18,'bold'),
@@ -736,27 +3214,22 @@ def checkbysales():
 
     #Function when back home button is pressed
     def backtohome():
-        root22.destroy()
-        introscreen()
+        show_screen(introscreen)
 
     #Button for going back to home page
     home_page_button = Button(root22,text='Back to home',command=backtohome,font=('Georgia',18,'bold'),
                               cursor='hand2',bd=0,bg='light blue',fg='black',activebackground='light blue')
     home_page_button.place(x=760,y=25,width=220)
 
-    root22.mainloop()
-
 #Viewing records in Sales Items
-def checkbysalesitems():
+def checkbysalesitems(root23):
     #Create a tkinter page for viewing records in Sales Items page
-    root23 = Tk()
     root23.geometry('1000x700+250+50') #Set window size
     root23.title('Checking Medicines in Sales Items Page') #Set window title
     root23.resizable(0,0) # Disable window resizing
     root23.config(bg='gray') #Set background colour
     
-    bgimg = Image.open(R"C:\Users\Nikhil\Downloads\SSN\College Files\Second Year\3rd Semester\Database Technology Lab\Mini Project\bgpic.jpg")
-    bgtk = ImageTk.PhotoImage(bgimg)
+    bgtk = assets.photo('bgpic.jpg', (1000, 750))
     bglabel = Label(root23, image=bgtk, height=750, width=1000)
     bglabel.place(x=0, y=0)
 
@@ -771,8 +3244,6 @@ def checkbysalesitems():
     DetailsFrame = Frame(root23,bg='black',width=1000,height=540)
     DetailsFrame.place(x=0,y=120)
 
-    records = dbms.fetch_query("SELECT * FROM SALES_ITEMS")
-
     style = ttk.Style()
     style.configure("Treeview", font=("Georgia", 11))  
     style.configure("Treeview.Heading", font=("Georgia", 12, "bold"))  
@@ -791,13 +3262,13 @@ def checkbysalesitems():
     v_scroll.place(x=980, y=30, height=480)
     h_scroll.place(x=0, y=490, width=980)
 
-    for record in records:
-        tree.insert("", "end", values=record)
+    # Rows are fetched page by page as the user scrolls, starting over each time the screen is shown
+    pages = PagedTreeview(tree, v_scroll, KeysetPager('SALES_ITEMS', 'sale_item_id'))
+    root23.on_show.append(pages.load)
 
     #Function when back button is pressed
     def backpage():
-        root23.destroy()
-        check_medicine()
+        show_screen(check_medicine)
 
     #Button for going back to previous page
     backbutton = Button(root23,text='Back',command=backpage,font=('Georgia',18,'bold'),
@@ -806,26 +3277,136 @@ def checkbysalesitems():
     
     #Function when back home button is pressed
     def backtohome():
-        root23.destroy()
-        introscreen()
+        show_screen(introscreen)
 
     #Button for going back to home page
     home_page_button = Button(root23,text='Back to home',command=backtohome,font=('Georgia',18,'bold'),
                               cursor='hand2',bd=0,bg='light blue',fg='black',activebackground='light blue')
     home_page_button.place(x=760,y=25,width=220)
 
-    root23.mainloop()
-
-def check_customer_history():
+# One of a customer's history streams, newest first. Pages are keyset-paged on (date, id) and the
+# first column of every row is its id, so it plugs into PagedTreeview like a KeysetPager.
+class HistoryStream:
+    def __init__(self, query, date_column, id_column, customer_id, page_size=50):
+        self.query = query  # SELECT <id>, <date>, ... WHERE ... = :customer_id
+        self.date_column = date_column
+        self.id_column = id_column
+        self.customer_id = customer_id
+        self.page_size = page_size
+        self._dates = {}  # id -> date of each row handed out, the boundary for the next page
+
+    def page_query(self, key=None, newer=False):
+        query = self.query
+        params = {'customer_id': self.customer_id}
+        if key is not None:
+            op = '>' if newer else '<'
+            query += (f" AND ({self.date_column} {op} :key_date"
+                      f" OR ({self.date_column} = :key_date AND {self.id_column} {op} :key_id))")
+            params.update(key_date=self._dates[key], key_id=key)
+        order = 'ASC' if newer else 'DESC'
+        query += f" ORDER BY {self.date_column} {order}, {self.id_column} {order}"
+        return dbms.backend.limit(query, self.page_size), params
+
+    def _seen(self, rows):
+        for row in rows:
+            self._dates[str(row[0])] = row[1]
+
+    def _page(self, key=None, newer=False):
+        rows = dbms.fetch_query(*self.page_query(key, newer))
+        self._seen(rows)
+        return list(reversed(rows)) if newer else rows
+
+    def batches(self, key=None, before=False, size=500):
+        # One page as fetchmany batches, for TreeviewStreamer; newer rows come oldest first
+        for rows in dbms.iter_query(*self.page_query(key, newer=before), size=size):
+            self._seen(rows)
+            yield rows
+
+    def first_page(self):
+        return self._page()
+
+    def page_after(self, key):
+        return self._page(key)  # Older rows
+
+    def page_before(self, key):
+        return self._page(key, newer=True)
+
+# A customer's prescriptions and purchases as two separate streams, so a regular customer costs
+# prescriptions + sale items rows rather than their product. Each stream is paged on its own
+# date and key; the latest prescription comes from CustomerSummary, not from these rows.
+class CustomerHistory:
+    PRESCRIPTIONS_QUERY = """
+        SELECT prescription_id, prescription_date, doctor_name, dosage, frequency, duration
+        FROM PRESCRIPTION
+        WHERE customer_id = :customer_id"""
+    PURCHASES_QUERY = """
+        SELECT SI.sale_item_id, S.sale_date, S.sale_id, M.m_name, SI.quantity, SI.subtotal
+        FROM SALES S
+        JOIN SALES_ITEMS SI ON SI.sale_id = S.sale_id
+        JOIN MEDICINE M ON M.medicine_id = SI.medicine_id
+        WHERE S.customer_id = :customer_id"""
+
+    def __init__(self, customer_id, page_size=50):
+        self.customer_id = customer_id
+        self.prescriptions = HistoryStream(self.PRESCRIPTIONS_QUERY, 'prescription_date', 'prescription_id', customer_id, page_size)
+        self.purchases = HistoryStream(self.PURCHASES_QUERY, 'S.sale_date', 'SI.sale_item_id', customer_id, page_size)
+
+# Per-customer totals from CUSTOMER_SUMMARY, a single-row read. The table is kept current by
+# the triggers in the customer_summary migration; rebuild() recomputes it after a bulk repair.
+class CustomerSummary:
+    QUERY = """
+        SELECT total_spend, visit_count, last_visit, last_prescription_id, last_prescription_date
+        FROM CUSTOMER_SUMMARY
+        WHERE customer_id = :1"""
+    REBUILD_QUERY = """
+        INSERT INTO CUSTOMER_SUMMARY (customer_id, total_spend, visit_count, last_visit,
+                                      last_prescription_id, last_prescription_date)
+        SELECT C.customer_id, COALESCE(S.total_spend, 0), COALESCE(S.visit_count, 0), S.last_visit,
+               P.prescription_id, P.prescription_date
+        FROM CUSTOMER C
+        LEFT JOIN (SELECT customer_id, SUM(total_amount) AS total_spend, COUNT(*) AS visit_count,
+                          MAX(sale_date) AS last_visit
+                   FROM SALES GROUP BY customer_id) S ON S.customer_id = C.customer_id
+        LEFT JOIN (SELECT customer_id, prescription_id, prescription_date,
+                          ROW_NUMBER() OVER (PARTITION BY customer_id
+                                             ORDER BY prescription_date DESC NULLS LAST, prescription_id DESC) AS position
+                   FROM PRESCRIPTION) P ON P.customer_id = C.customer_id AND P.position = 1"""
+
+    def __init__(self, customer_id, total_spend=0, visit_count=0, last_visit=None,
+                 last_prescription_id=None, last_prescription_date=None):
+        self.customer_id = customer_id
+        self.total_spend = total_spend or 0
+        self.visit_count = visit_count or 0
+        self.last_visit = last_visit
+        self.last_prescription_id = last_prescription_id
+        self.last_prescription_date = last_prescription_date
+
+    @property
+    def first_purchase(self):
+        return self.visit_count == 0
+
+    @classmethod
+    def lookup(cls, customer_id):
+        # Customers without a summary row have not bought or been prescribed anything yet
+        rows = dbms.fetch_query(cls.QUERY, (customer_id,))
+        return cls(customer_id, *rows[0]) if rows else cls(customer_id)
+
+    @classmethod
+    def rebuild(cls):
+        # Recomputes every row from SALES and PRESCRIPTION; returns the number of customers
+        with dbms.transaction():
+            dbms.execute_query("DELETE FROM CUSTOMER_SUMMARY")
+            dbms.execute_query(cls.REBUILD_QUERY)
+            return dbms.fetch_query("SELECT COUNT(*) FROM CUSTOMER_SUMMARY")[0][0]
+
+def check_customer_history(root_history):
     # Create tkinter page for viewing customer's purchase history
-    root_history = Tk()
     root_history.geometry('1000x700+250+50')
     root_history.title('Customer Purchase History')
     root_history.resizable(0, 0)
     root_history.config(bg='gray')
 
-    bgimg = Image.open(R"C:\Users\Nikhil\Downloads\SSN\College Files\Second Year\3rd Semester\Database Technology Lab\Mini Project\bgpic.jpg")
-    bgtk = ImageTk.PhotoImage(bgimg)
+    bgtk = assets.photo('bgpic.jpg', (1000, 750))
     bglabel = Label(root_history, image=bgtk, height=750, width=1000)
     bglabel.place(x=0, y=0)
 
@@ -846,93 +3427,92 @@ def check_customer_history():
     customerid_entry = Entry(Topframe, font=('Georgia', 14), width=15)
     customerid_entry.place(x=375, y=95)
 
-    # Define Treeview table for displaying results
-    columns = ("Customer ID", "Customer Name", "Prescription ID", "Medicine Name", "Quantity Sold", "Sale Date", "Most Recent Prescription")
-    tree = ttk.Treeview(DetailsFrame, columns=columns, show="headings", style="Treeview")
-    for col in columns:
-        tree.heading(col, text=col)
-        tree.column(col, width=1000 // len(columns), anchor="center")
-    tree.place(x=0, y=30, width=980, height=480)
-
-    v_scroll = Scrollbar(DetailsFrame, orient=VERTICAL, command=tree.yview)
-    h_scroll = Scrollbar(DetailsFrame, orient=HORIZONTAL, command=tree.xview)
-    tree.configure(yscrollcommand=v_scroll.set, xscrollcommand=h_scroll.set)
-    v_scroll.place(x=980, y=30, height=480)
-    h_scroll.place(x=0, y=490, width=980)
+    # Summary line, then prescriptions and purchases in separate tables, newest first
+    latest_label = Label(DetailsFrame, text='', font=('Georgia', 13, 'bold'), fg='white', bg='black', anchor='w')
+    latest_label.place(x=10, y=0, width=960)
+
+    def history_table(title, columns, y):
+        Label(DetailsFrame, text=title, font=('Georgia', 13), fg='white', bg='black').place(x=10, y=y)
+        tree = ttk.Treeview(DetailsFrame, columns=columns, show="headings", style="Treeview")
+        for col in columns:
+            tree.heading(col, text=col)
+            tree.column(col, width=980 // len(columns), anchor="center")
+        tree.place(x=0, y=y + 25, width=980, height=205)
+        v_scroll = Scrollbar(DetailsFrame, orient=VERTICAL, command=tree.yview)
+        v_scroll.place(x=980, y=y + 25, height=205)
+        return tree, v_scroll
+
+    prescription_tree, prescription_scroll = history_table(
+        'Prescriptions', ("Prescription ID", "Date", "Doctor", "Dosage", "Frequency", "Duration"), 30)
+    purchase_tree, purchase_scroll = history_table(
+        'Purchases', ("Sale Item ID", "Sale Date", "Sale ID", "Medicine Name", "Quantity", "Subtotal"), 270)
+    prescription_pages = None
+    purchase_pages = None
 
     def resetfield():
         customerid_entry.delete(0, END)
-    
+
+    def clear_history():
+        # The screen is kept between visits; the next user must not see the last customer
+        nonlocal prescription_pages, purchase_pages
+        resetfield()
+        latest_label.config(text='')
+        for tree in (prescription_tree, purchase_tree):
+            tree.delete(*tree.get_children())
+        prescription_pages = purchase_pages = None
+    root_history.on_show.append(clear_history)
+
+    def open_history(customer_id):
+        # Runs on a worker thread; None means the customer does not exist
+        if not id_index['CUSTOMER'].contains(customer_id):
+            return None
+        return CustomerHistory(customer_id), CustomerSummary.lookup(customer_id)
+
+    def show_history(result):
+        nonlocal prescription_pages, purchase_pages
+        if result is None:
+            messagebox.showerror('Error!', 'Customer ID does not exist in the database.')
+            resetfield()
+            return
+        history, summary = result
+        if summary.first_purchase:
+            visits = 'No purchases yet'
+        else:
+            visits = (f'{summary.visit_count} visits, Rs. {summary.total_spend:.2f} spent, '
+                      f'last visit {summary.last_visit:%d-%b-%Y}')
+        if summary.last_prescription_id is None:
+            prescription = 'no prescriptions on record'
+        elif summary.last_prescription_date:
+            prescription = f'latest prescription {summary.last_prescription_id} on {summary.last_prescription_date:%d-%b-%Y}'
+        else:
+            prescription = f'latest prescription {summary.last_prescription_id}'
+        latest_label.config(text=f'{visits}; {prescription}.')
+        # Both tables page in more rows as they are scrolled
+        if prescription_pages is None:
+            prescription_pages = PagedTreeview(prescription_tree, prescription_scroll, history.prescriptions)
+            purchase_pages = PagedTreeview(purchase_tree, purchase_scroll, history.purchases)
+            prescription_pages.load()
+            purchase_pages.load()
+        else:
+            prescription_pages.switch(history.prescriptions)
+            purchase_pages.switch(history.purchases)
+
+    def history_failed(e):
+        print(f"Error during fetch: {e}")
+        messagebox.showerror('Query Failed', f'Error fetching customer history: {e}')
+        resetfield()
 
     def fetch_and_display_customer_history():
         customer_id = customerid_entry.get()
 
         # Check if Customer ID is in the correct format (e.g., C001)
-        if not re.match(r'^C\d{3}$', customer_id):
+        if not re.match(r'^C\d{3,}$', customer_id):
             messagebox.showerror('Error!', 'Customer ID format is invalid. It should be in the format Cxxx (e.g., C001).')
             return
 
-        try:
-            # Check if Customer ID exists in the CUSTOMER table
-            check_query = "SELECT COUNT(*) FROM CUSTOMER WHERE customer_id = :1"
-            print(f"Executing query: {check_query} with {customer_id}")
-            result = dbms.execute_query(check_query, (customer_id,))
-            print(f"Query result: {result}")
-
-            if result and result[0][0] == 0:
-                messagebox.showerror('Error!', 'Customer ID does not exist in the database.')
-                customerid_entry.delete(0, END)
-                return
-
-        except Exception as e:
-            print(f"Error during customer check: {e}")
-            messagebox.showerror('Error!', f'Error checking Customer ID: {e}')
-            customerid_entry.delete(0, END)
-            return
-
-        try:
-            query = """
-                SELECT C.customer_id, C.c_name AS customer_name, 
-                       P.prescription_id, M.m_name AS medicine_name, 
-                       SI.quantity, S.sale_date,
-                       (  SELECT MAX(P1.prescription_id)  -- Subquery to get the most recent prescription
-                           FROM PRESCRIPTION P1
-                           WHERE P1.customer_id = C.customer_id
-                       ) AS most_recent_prescription_id
-                FROM CUSTOMER C
-                JOIN PRESCRIPTION P ON C.customer_id = P.customer_id
-                JOIN SALES S ON C.customer_id = S.customer_id
-                JOIN SALES_ITEMS SI ON SI.sale_id = S.sale_id
-                JOIN MEDICINE M ON M.medicine_id = SI.medicine_id
-                WHERE C.customer_id = :1
-            """
-            print(f"Executing query: {query} with {customer_id}")
-            records = dbms.fetch_query(query, (customer_id,))
-            print(f"Fetched records: {records}")
-
-            # Ensure records are not None before accessing
-            if not records or len(records) == 0:
-                messagebox.showinfo('No Data', 'This customer has no sales or prescription history.')
-                resetfield()
-                return
-
-            tree.delete(*tree.get_children())  # Clear previous records
-
-            for record in records:
-                # Debug: Print each record to verify its format
-                print(f"Inserting record: {record}")
-
-                if isinstance(record, tuple):
-                    tree.insert("", "end", values=record)  # Insert into Treeview
-                else:
-                    messagebox.showerror('Data Error', 'Record format is incorrect.')
-                    resetfield()
-                    return
-
-        except Exception as e:
-            print(f"Error during fetch: {e}")
-            messagebox.showerror('Query Failed', f'Error fetching customer history: {e}')
-            resetfield()
+        # The lookup runs on a worker thread so the window stays responsive
+        background.submit(root_history, open_history, customer_id,
+                          on_done=show_history, on_error=history_failed, indicator=DetailsFrame)
 
 
     # Button to fetch history based on entered Customer ID with realignment
@@ -942,8 +3522,7 @@ def check_customer_history():
 
     # Function for Back button
     def backpage():
-        root_history.destroy()
-        check_medicine()  # Adjust if needed
+        show_screen(check_medicine)  # Adjust if needed
 
     # Back button
     backbutton = Button(root_history, text='Back', command=backpage, font=('Georgia', 18, 'bold'),
@@ -952,35 +3531,29 @@ def check_customer_history():
 
     # Function for Back to Home button
     def backtohome():
-        root_history.destroy()
-        introscreen()  # Adjust if needed
+        show_screen(introscreen)  # Adjust if needed
 
     # Back to Home button
     home_page_button = Button(root_history, text='Back to home', command=backtohome, font=('Georgia', 18, 'bold'),
                               cursor='hand2', bd=0, bg='light blue', fg='black', activebackground='light blue')
     home_page_button.place(x=760, y=25, width=220)
 
-    root_history.mainloop()
-
 
 #Checking the medicines available
-def check_medicine():
+def check_medicine(root2):
     #Create a tkinter page for the check medicine page
-    root2 = Tk()
     root2.geometry('1000x700+250+50') #Set window size
     root2.title('Check Medicine Page') #Set window title
     root2.resizable(0,0) # Disable window resizing
     root2.config(bg='gray') #Set background colour
     
-    bgimg = Image.open(R"C:\Users\Nikhil\Downloads\SSN\College Files\Second Year\3rd Semester\Database Technology Lab\Mini Project\bgpic.jpg")
-    bgtk = ImageTk.PhotoImage(bgimg)
+    bgtk = assets.photo('bgpic.jpg', (1000, 750))
     bglabel = Label(root2, image=bgtk, height=750, width=1000)
     bglabel.place(x=0, y=0)
 
     #Function when back home button is pressed
     def backtohome():
-        root2.destroy()
-        introscreen()
+        show_screen(introscreen)
     
     #Create top frame for displaying title
     Topframe = Frame(root2, bg='black',width=1000, height=100)
@@ -995,32 +3568,25 @@ def check_medicine():
 
     #Function when buttons are pressed for checking into specific tables
     def check_supplier():
-        root2.destroy()
-        checkbysupplier()
+        show_screen(checkbysupplier)
     
     def check_medicine():
-        root2.destroy()
-        checkbymedicine()
+        show_screen(checkbymedicine)
     
     def check_customer():
-        root2.destroy()
-        checkbycustomer()
+        show_screen(checkbycustomer)
     
     def check_prescription():
-        root2.destroy()
-        checkbyprescription()
+        show_screen(checkbyprescription)
 
     def check_sales():
-        root2.destroy()
-        checkbysales()
+        show_screen(checkbysales)
     
     def check_sales_items():
-        root2.destroy()
-        checkbysalesitems()
+        show_screen(checkbysalesitems)
     
     def check_custom_data():
-        root2.destroy()
-        check_customer_history()
+        show_screen(check_customer_history)
 
     #Button for inserting medicine by supplier
     supplier_button = Button(ButtonsFrame,text='Supplier',command=check_supplier,font=('Georgia',18,'bold'),
@@ -1056,126 +3622,110 @@ def check_medicine():
     home_page_button = Button(root2,text='Back to home',command=backtohome,font=('Georgia',18,'bold'),cursor='hand2',bd=0,bg='light blue',fg='black',activebackground='light blue')
     home_page_button.place(x=760,y=25,width=220)
 
-    root2.mainloop()
-
 #Checking if Supplier ID entered is a valid Supplier ID or not
-def check_supplier_id(supplier_id):
-    pattern = r"^S\d{3}$"
+def check_supplier_id(supplier_id, show_error=True):
+    pattern = r"^S(UP)?\d{3,}$"
     if not re.match(pattern, supplier_id):
-        messagebox.showerror('Error!', 'Invalid Supplier ID format. It should start with "S" followed by three digits.')
+        if show_error:
+            messagebox.showerror('Error!', 'Invalid Supplier ID format. It should start with "SUP" (or "S" for older suppliers) followed by at least three digits.')
         return False
         
-    query = "SELECT supplier_id FROM SUPPLIER WHERE supplier_id = :1"
-    params = (supplier_id,)
-    result = dbms.fetch_query(query, params)
-        
-    if not result:
-        messagebox.showerror('Error!', f'Supplier ID {supplier_id} does not exist in the SUPPLIER table.')
+    if not id_index['SUPPLIER'].contains(supplier_id):
+        if show_error:
+            messagebox.showerror('Error!', f'Supplier ID {supplier_id} does not exist in the SUPPLIER table.')
         return False
         
     return True
 
 #Checking if Medicine ID entered is a valid Medicine ID or not
-def check_medicine_id(medicine_id):
-    pattern = r"^M\d{3}$"
+def check_medicine_id(medicine_id, show_error=True):
+    pattern = r"^M\d{3,}$"
         
     if not re.match(pattern, medicine_id):
-        messagebox.showerror('Error!', 'Invalid Medicine ID format. It should start with "M" followed by three digits.')
+        if show_error:
+            messagebox.showerror('Error!', 'Invalid Medicine ID format. It should start with "M" followed by at least three digits.')
         return False
         
-    query = "SELECT medicine_id FROM MEDICINE WHERE medicine_id = :1"
-    params = (medicine_id,)
-    result = dbms.fetch_query(query, params)
-        
-    if not result:
-        messagebox.showerror('Error!', f'Medicine ID {medicine_id} does not exist in the MEDICINE table.')
+    if not id_index['MEDICINE'].contains(medicine_id):
+        if show_error:
+            messagebox.showerror('Error!', f'Medicine ID {medicine_id} does not exist in the MEDICINE table.')
         return False
         
     return True
 
 #Checking if Customer ID entered is a valid Customer ID or not
-def check_customer_id(customer_id):
-    pattern = r"^C\d{3}$"
+def check_customer_id(customer_id, show_error=True):
+    pattern = r"^C\d{3,}$"
         
     if not re.match(pattern, customer_id):
-        messagebox.showerror('Error!', 'Invalid Customer ID format. It should start with "C" followed by three digits.')
+        if show_error:
+            messagebox.showerror('Error!', 'Invalid Customer ID format. It should start with "C" followed by at least three digits.')
         return False
         
-    query = "SELECT customer_id FROM CUSTOMER WHERE customer_id = :1"
-    params = (customer_id,)
-    result = dbms.fetch_query(query, params)
-        
-    if not result:
-        messagebox.showerror('Error!', f'Customer ID {customer_id} does not exist in the CUSTOMER table.')
+    if not id_index['CUSTOMER'].contains(customer_id):
+        if show_error:
+            messagebox.showerror('Error!', f'Customer ID {customer_id} does not exist in the CUSTOMER table.')
         return False
         
     return True
 
 #Checking if Prescription ID entered is a valid Prescription ID or not
-def check_prescription_id(prescription_id):
-    pattern = r"^P\d{3}$"
+def check_prescription_id(prescription_id, show_error=True):
+    pattern = r"^P\d{3,}$"
 
     if not re.match(pattern, prescription_id):
-        messagebox.showerror('Error!', 'Invalid Prescription ID format. It should start with "P" followed by three digits.')
+        if show_error:
+            messagebox.showerror('Error!', 'Invalid Prescription ID format. It should start with "P" followed by at least three digits.')
         return False
         
-    query = "SELECT prescription_id FROM PRESCRIPTION WHERE prescription_id = :1"
-    params = (prescription_id,)
-    result = dbms.fetch_query(query, params)
-        
-    if not result:
-        messagebox.showerror('Error!', f'Prescription ID {prescription_id} does not exist in the PRESCRIPTION table.')
+    if not id_index['PRESCRIPTION'].contains(prescription_id):
+        if show_error:
+            messagebox.showerror('Error!', f'Prescription ID {prescription_id} does not exist in the PRESCRIPTION table.')
         return False
         
     return True
 
 #Checking if Sale ID entered is a valid Sale ID or not
-def check_sale_id(sale_id):
-    pattern = r"^S\d{3}$"
+def check_sale_id(sale_id, show_error=True):
+    pattern = r"^S\d{3,}$"
         
     if not re.match(pattern, sale_id):
-        messagebox.showerror('Error!', 'Invalid Sale ID format. It should start with "S" followed by three digits.')
+        if show_error:
+            messagebox.showerror('Error!', 'Invalid Sale ID format. It should start with "S" followed by at least three digits.')
         return False
         
-    query = "SELECT sale_id FROM SALES WHERE sale_id = :1"
-    params = (sale_id,)
-    result = dbms.fetch_query(query, params)
-        
-    if not result:
-        messagebox.showerror('Error!', f'Sale ID {sale_id} does not exist in the SALES table.')
+    if not id_index['SALES'].contains(sale_id):
+        if show_error:
+            messagebox.showerror('Error!', f'Sale ID {sale_id} does not exist in the SALES table.')
         return False
         
     return True
 
 #Checking if Sale ID entered is a valid Sale ID or not
-def check_sale_item_id(sale_item_id):
-    pattern = r"^SI\d{3}$"
+def check_sale_item_id(sale_item_id, show_error=True):
+    pattern = r"^SI\d{3,}$"
         
     if not re.match(pattern, sale_item_id):
-        messagebox.showerror('Error!', 'Invalid Sale Item ID format. It should start with "SI" followed by three digits.')
+        if show_error:
+            messagebox.showerror('Error!', 'Invalid Sale Item ID format. It should start with "SI" followed by at least three digits.')
         return False
         
-    query = "SELECT sale_item_id FROM SALES_ITEMS WHERE sale_item_id = :1"
-    params = (sale_item_id,)
-    result = dbms.fetch_query(query, params)
-        
-    if not result:
-        messagebox.showerror('Error!', f'Sale Item ID {sale_item_id} does not exist in the SALES_ITEMS table.')
+    if not id_index['SALES_ITEMS'].contains(sale_item_id):
+        if show_error:
+            messagebox.showerror('Error!', f'Sale Item ID {sale_item_id} does not exist in the SALES_ITEMS table.')
         return False
         
     return True
 
 #Inserting in supplier
-def insertbysupplier():
+def insertbysupplier(root6):
     #Create a tkinter page for the insert in supplier page
-    root6 = Tk()
     root6.geometry('1000x700+250+50') #Set window size
     root6.title('Insert in Supplier Page') #Set window title
     root6.resizable(0,0) # Disable window resizing
     root6.config(bg='gray') #Set background colour
     
-    bgimg = Image.open(R"C:\Users\Nikhil\Downloads\SSN\College Files\Second Year\3rd Semester\Database Technology Lab\Mini Project\bgpic.jpg")
-    bgtk = ImageTk.PhotoImage(bgimg)
+    bgtk = assets.photo('bgpic.jpg', (1000, 750))
     bglabel = Label(root6, image=bgtk, height=750, width=1000)
     bglabel.place(x=0, y=0)
 
@@ -1196,6 +3746,8 @@ def insertbysupplier():
         numberentry.delete(0, END)
         emailentry.delete(0, END)
         addressentry.delete(0, END)
+        prefill_id(sidentry, 'SUPPLIER')
+    root6.on_show.append(resetfield)
 
     def insertdetails():
         global se, sne, ne, ee, ae
@@ -1210,9 +3762,9 @@ def insertbysupplier():
             return bool(re.match(pattern, email))
 
         def pattern():
-            pattern_regex = r"^S\d{3}$"
+            pattern_regex = r"^S(UP)?\d{3,}$"
             if not re.match(pattern_regex, se):
-                messagebox.showerror('Error!', 'Invalid Supplier ID format. It should start with "S" followed by three digits.')
+                messagebox.showerror('Error!', 'Invalid Supplier ID format. It should start with "SUP" (or "S" for older suppliers) followed by at least three digits.')
                 return False
             return True 
 
@@ -1229,9 +3781,7 @@ def insertbysupplier():
             resetfield()
         else:
             # Check if Supplier ID already exists
-            query = "SELECT supplier_id FROM SUPPLIER WHERE supplier_id = :1"
-            params = (se,)
-            c = dbms.fetch_query(query, params)
+            c = id_index['SUPPLIER'].contains(se)
             if c:
                 # Display an error message if the supplier ID already exists
                 messagebox.showerror('Insert Error!', f'Supplier ID {se} already exists!')
@@ -1269,6 +3819,7 @@ def insertbysupplier():
 
     sidentry = Entry(DetailsFrame, font=("Georgia", 16, 'bold'), bg='white', fg='black')
     sidentry.place(x=20, y=80, width=350)
+    prefill_id(sidentry, 'SUPPLIER')
     snameentry = Entry(DetailsFrame, font=("Georgia", 16, 'bold'), bg='white', fg='black')
     snameentry.place(x=20, y=160, width=350)
     numberentry = Entry(DetailsFrame, font=("Georgia", 16, 'bold'), bg='white', fg='black')
@@ -1284,8 +3835,7 @@ def insertbysupplier():
 
     #Function when back button is pressed
     def backpage():
-        root6.destroy()
-        insert_medicine()
+        show_screen(insert_medicine)
 
     #Button for going back to previous page
     backbutton = Button(root6,text='Back',command=backpage,font=('Georgia',18,'bold'),
@@ -1294,28 +3844,23 @@ def insertbysupplier():
 
     #Function when back home button is pressed
     def backtohome():
-        root6.destroy()
-        introscreen()
+        show_screen(introscreen)
 
     #Button for going back to home page
     home_page_button = Button(root6,text='Back to home',command=backtohome,font=('Georgia',18,'bold'),
                               cursor='hand2',bd=0,bg='light blue',fg='black',activebackground='light blue')
     home_page_button.place(x=760,y=25,width=220)
 
-    root6.mainloop()
-
 #Inserting in medicine
-def insertbymedicine():
+def insertbymedicine(root7):
     # Create a tkinter page for the insert in medicine page
-    root7 = Tk()
     root7.geometry('1000x700+250+50')
     root7.title('Insert in Medicine Page')
     root7.resizable(0, 0)
     root7.config(bg='gray')
 
     # Background image setup (make sure the path is correct)
-    bgimg = Image.open(R"C:\Users\Nikhil\Downloads\SSN\College Files\Second Year\3rd Semester\Database Technology Lab\Mini Project\bgpic.jpg")
-    bgtk = ImageTk.PhotoImage(bgimg)
+    bgtk = assets.photo('bgpic.jpg', (1000, 750))
     bglabel = Label(root7, image=bgtk, height=750, width=1000)
     bglabel.place(x=0, y=0)
 
@@ -1339,6 +3884,8 @@ def insertbymedicine():
         qtyentry.delete(0, END)
         priceentry.delete(0, END)
         sidentry.delete(0, END)
+        prefill_id(midentry, 'MEDICINE')
+    root7.on_show.append(resetfield)
 
     def insertdetails():
         # Get the input data from the entry fields
@@ -1380,9 +3927,7 @@ def insertbymedicine():
             return
 
         # Check if the medicine ID already exists
-        query = "SELECT medicine_id FROM MEDICINE WHERE medicine_id = :1"
-        params = (me,)
-        c = dbms.fetch_query(query, params)
+        c = id_index['MEDICINE'].contains(me)
 
         if c:
             messagebox.showerror('Insert Error!', f'Medicine ID {me} already exists!')
@@ -1417,6 +3962,7 @@ def insertbymedicine():
 
     midentry = Entry(DetailsFrame, font=("Georgia", 16, 'bold'), bg='white', fg='black')
     midentry.place(x=20, y=80, width=350)
+    prefill_id(midentry, 'MEDICINE')
     mnameentry = Entry(DetailsFrame, font=("Georgia", 16, 'bold'), bg='white', fg='black')
     mnameentry.place(x=20, y=160, width=350)
     brandentry = Entry(DetailsFrame, font=("Georgia", 16, 'bold'), bg='white', fg='black')
@@ -1437,8 +3983,7 @@ def insertbymedicine():
 
     # Function when back button is pressed
     def backpage():
-        root7.destroy()
-        insert_medicine()
+        show_screen(insert_medicine)
 
     # Button for going back to previous page
     backbutton = Button(root7, text='Back', command=backpage, font=('Georgia', 18, 'bold'), cursor='hand2', bd=0, bg='light blue', fg='black', activebackground='light blue')
@@ -1446,27 +3991,22 @@ def insertbymedicine():
 
     # Function when back home button is pressed
     def backtohome():
-        root7.destroy()
-        introscreen()
+        show_screen(introscreen)
 
     # Button for going back to home page
     home_page_button = Button(root7, text='Back to home', command=backtohome, font=('Georgia', 18, 'bold'), cursor='hand2', bd=0, bg='light blue', fg='black', activebackground='light blue')
     home_page_button.place(x=760, y=25, width=220)
 
-    root7.mainloop()
-
 
-def insertbycustomer():
+def insertbycustomer(root8):
     # Create a tkinter page for the insert in customer page
-    root8 = Tk()
     root8.geometry('1000x700+250+50')
     root8.title('Insert in Customer Page')
     root8.resizable(0, 0)
     root8.config(bg='gray')
 
     # Background image setup (make sure the path is correct)
-    bgimg = Image.open(R"C:\Users\Nikhil\Downloads\SSN\College Files\Second Year\3rd Semester\Database Technology Lab\Mini Project\bgpic.jpg")
-    bgtk = ImageTk.PhotoImage(bgimg)
+    bgtk = assets.photo('bgpic.jpg', (1000, 750))
     bglabel = Label(root8, image=bgtk, height=750, width=1000)
     bglabel.place(x=0, y=0)
 
@@ -1487,6 +4027,8 @@ def insertbycustomer():
         numberentry.delete(0, END)
         emailentry.delete(0, END)
         addressentry.delete(0, END)
+        prefill_id(cidentry, 'CUSTOMER')
+    root8.on_show.append(resetfield)
 
     def insertdetails():
         ce = cidentry.get()  # Customer ID
@@ -1505,9 +4047,9 @@ def insertbycustomer():
 
         # Function to validate Customer ID format
         def pattern():
-            pattern = r"^C\d{3}$"
+            pattern = r"^C\d{3,}$"
             if not re.match(pattern, ce):
-                messagebox.showerror('Error!', 'Invalid Customer ID format. It should start with "C" followed by three digits.')
+                messagebox.showerror('Error!', 'Invalid Customer ID format. It should start with "C" followed by at least three digits.')
                 return False
             return True
 
@@ -1528,9 +4070,7 @@ def insertbycustomer():
             return
         else:
             # Check if the customer ID already exists
-            query = "SELECT customer_id FROM CUSTOMER WHERE customer_id = :1"
-            params = (ce,)
-            c = dbms.fetch_query(query, params)
+            c = id_index['CUSTOMER'].contains(ce)
 
             if c:
                 messagebox.showerror('Insert Error!', f'Customer ID {ce} already exists!')
@@ -1560,6 +4100,7 @@ def insertbycustomer():
     # Input fields
     cidentry = Entry(DetailsFrame, font=("Georgia", 16, 'bold'), bg='white', fg='black')
     cidentry.place(x=20, y=80, width=350)
+    prefill_id(cidentry, 'CUSTOMER')
     cnameentry = Entry(DetailsFrame, font=("Georgia", 16, 'bold'), bg='white', fg='black')
     cnameentry.place(x=20, y=160, width=350)
     numberentry = Entry(DetailsFrame, font=("Georgia", 16, 'bold'), bg='white', fg='black')
@@ -1574,33 +4115,27 @@ def insertbycustomer():
 
     # Back button
     def backpage():
-        root8.destroy()
-        insert_medicine()
+        show_screen(insert_medicine)
 
     backbutton = Button(root8, text='Back', command=backpage, font=('Georgia', 18, 'bold'), cursor='hand2', bd=0, bg='light blue', fg='black', activebackground='light blue')
     backbutton.place(x=20, y=25, width=220)
 
     # Home button
     def backtohome():
-        root8.destroy()
-        introscreen()
+        show_screen(introscreen)
 
     home_page_button = Button(root8, text='Back to home', command=backtohome, font=('Georgia', 18, 'bold'), cursor='hand2', bd=0, bg='light blue', fg='black', activebackground='light blue')
     home_page_button.place(x=760, y=25, width=220)
 
-    root8.mainloop()
-
-def insertbyprescription():
+def insertbyprescription(root9):
     # Create a tkinter page for the insert in prescription page
-    root9 = Tk()
     root9.geometry('1000x700+250+50')
     root9.title('Insert in Prescription Page')
     root9.resizable(0, 0)
     root9.config(bg='gray')
 
     # Background image setup (make sure the path is correct)
-    bgimg = Image.open(R"C:\Users\Nikhil\Downloads\SSN\College Files\Second Year\3rd Semester\Database Technology Lab\Mini Project\bgpic.jpg")
-    bgtk = ImageTk.PhotoImage(bgimg)
+    bgtk = assets.photo('bgpic.jpg', (1000, 750))
     bglabel = Label(root9, image=bgtk, height=750, width=1000)
     bglabel.place(x=0, y=0)
 
@@ -1624,6 +4159,8 @@ def insertbyprescription():
         freqentry.delete(0, END)
         durationentry.delete(0, END)
         addinentry.delete(0, END)
+        prefill_id(pidentry, 'PRESCRIPTION')
+    root9.on_show.append(resetfield)
 
 # Assuming necessary imports have been made for Command pattern and the required classes
 
@@ -1645,8 +4182,8 @@ def insertbyprescription():
             return
 
         # Validate Prescription ID format
-        if not re.match(r"^P\d{3}$", pe):
-            messagebox.showerror('Error!', 'Invalid Prescription ID format. It should start with "P" followed by three digits.')
+        if not re.match(r"^P\d{3,}$", pe):
+            messagebox.showerror('Error!', 'Invalid Prescription ID format. It should start with "P" followed by at least three digits.')
             resetfield()
             return
 
@@ -1702,6 +4239,7 @@ def insertbyprescription():
     # Input fields
     pidentry = Entry(DetailsFrame, font=("Georgia", 16, 'bold'), bg='white', fg='black')
     pidentry.place(x=20, y=80, width=350)
+    prefill_id(pidentry, 'PRESCRIPTION')
     cidentry = Entry(DetailsFrame, font=("Georgia", 16, 'bold'), bg='white', fg='black')
     cidentry.place(x=20, y=160, width=350)
     docnameentry = Entry(DetailsFrame, font=("Georgia", 16, 'bold'), bg='white', fg='black')
@@ -1721,8 +4259,7 @@ def insertbyprescription():
 
     # Function when back button is pressed
     def backpage():
-        root9.destroy()
-        insert_medicine()
+        show_screen(insert_medicine)
 
     # Button for going back to previous page
     backbutton = Button(root9, text='Back', command=backpage, font=('Georgia', 18, 'bold'), cursor='hand2', bd=0, bg='light blue', fg='black', activebackground='light blue')
@@ -1730,27 +4267,22 @@ def insertbyprescription():
 
     # Function when back home button is pressed
     def backtohome():
-        root9.destroy()
-        introscreen()
+        show_screen(introscreen)
 
     # Button for going back to home page
     home_page_button = Button(root9, text='Back to home', command=backtohome, font=('Georgia', 18, 'bold'), cursor='hand2', bd=0, bg='light blue', fg='black', activebackground='light blue')
     home_page_button.place(x=760, y=25, width=220)
 
-    root9.mainloop()
-
 #Inserting in sales
-def insertbysales():
+def insertbysales(root10):
     # Create a tkinter page for the insert in sales page
-    root10 = Tk()
     root10.geometry('1000x700+250+50')
     root10.title('Insert in Sales Page')
     root10.resizable(0, 0)
     root10.config(bg='gray')
 
     # Background image setup (make sure the path is correct)
-    bgimg = Image.open(R"C:\Users\Nikhil\Downloads\SSN\College Files\Second Year\3rd Semester\Database Technology Lab\Mini Project\bgpic.jpg")
-    bgtk = ImageTk.PhotoImage(bgimg)
+    bgtk = assets.photo('bgpic.jpg', (1000, 750))
     bglabel = Label(root10, image=bgtk, height=750, width=1000)
     bglabel.place(x=0, y=0)
 
@@ -1771,6 +4303,8 @@ def insertbysales():
         sdateentry.delete(0, END)
         totamtentry.delete(0, END)
         payentry.delete(0, END)
+        prefill_id(sidentry, 'SALES')
+    root10.on_show.append(resetfield)
 
     def insertdetails():
         global se, ce, sde, te, pe
@@ -1782,9 +4316,9 @@ def insertbysales():
 
         # Function to validate Sale ID format
         def pattern():
-            pattern_regex = r"^S\d{3}$"
+            pattern_regex = r"^S\d{3,}$"
             if not re.match(pattern_regex, se):
-                messagebox.showerror('Error!', 'Invalid Sale ID format. It should start with "S" followed by three digits.')
+                messagebox.showerror('Error!', 'Invalid Sale ID format. It should start with "S" followed by at least three digits.')
                 return False
             return True
 
@@ -1814,9 +4348,7 @@ def insertbysales():
                 return
 
             # Check if the sale ID already exists
-            query = "SELECT sale_id FROM SALES WHERE sale_id = :1"
-            params = (se,)
-            c = dbms.fetch_query(query, params)
+            c = id_index['SALES'].contains(se)
 
             if c:
                 messagebox.showerror('Insert Error!', f'Sale ID {se} already exists!')
@@ -1858,6 +4390,7 @@ def insertbysales():
     # Input fields
     sidentry = Entry(DetailsFrame, font=("Georgia", 16, 'bold'), bg='white', fg='black')
     sidentry.place(x=20, y=80, width=350)
+    prefill_id(sidentry, 'SALES')
     cidentry = Entry(DetailsFrame, font=("Georgia", 16, 'bold'), bg='white', fg='black')
     cidentry.place(x=20, y=160, width=350)
     sdateentry = Entry(DetailsFrame, font=("Georgia", 16, 'bold'), bg='white', fg='black')
@@ -1872,8 +4405,7 @@ def insertbysales():
 
     # Function when back button is pressed
     def backpage():
-        root10.destroy()
-        insert_medicine()
+        show_screen(insert_medicine)
 
     # Button for going back to previous page
     backbutton = Button(root10, text='Back', command=backpage, font=('Georgia', 18, 'bold'), cursor='hand2', bd=0, bg='light blue', fg='black', activebackground='light blue')
@@ -1881,27 +4413,22 @@ def insertbysales():
 
     # Function when back home button is pressed
     def backtohome():
-        root10.destroy()
-        introscreen()
+        show_screen(introscreen)
 
     # Button for going back to home page
     home_page_button = Button(root10, text='Back to home', command=backtohome, font=('Georgia', 18, 'bold'), cursor='hand2', bd=0, bg='light blue', fg='black', activebackground='light blue')
     home_page_button.place(x=760, y=25, width=220)
 
-    root10.mainloop()
-
 #Inserting in sales items
-def insertbysalesitems():
+def insertbysalesitems(root11):
     # Create a tkinter page for the insert in sales items page
-    root11 = Tk()
     root11.geometry('1000x700+250+50')
     root11.title('Insert in Sales Items Page')
     root11.resizable(0, 0)
     root11.config(bg='gray')
 
     # Background image setup (make sure the path is correct)
-    bgimg = Image.open(R"C:\Users\Nikhil\Downloads\SSN\College Files\Second Year\3rd Semester\Database Technology Lab\Mini Project\bgpic.jpg")
-    bgtk = ImageTk.PhotoImage(bgimg)
+    bgtk = assets.photo('bgpic.jpg', (1000, 750))
     bglabel = Label(root11, image=bgtk, height=750, width=1000)
     bglabel.place(x=0, y=0)
 
@@ -1922,6 +4449,8 @@ def insertbysalesitems():
         midentry.delete(0, END)
         qtyentry.delete(0, END)
         priceentry.delete(0, END)
+        prefill_id(saidentry, 'SALES_ITEMS')
+    root11.on_show.append(resetfield)
 
     def insertdetails():
         sie = saidentry.get()  # Sale Item ID
@@ -1938,9 +4467,9 @@ def insertbysalesitems():
 
         # Validate Sale Item ID format
         def pattern():
-            pattern_regex = r"^SI\d{3}$"
+            pattern_regex = r"^SI\d{3,}$"
             if not re.match(pattern_regex, sie):
-                messagebox.showerror('Error!', 'Invalid Sale Item ID format. It should start with "SI" followed by three digits.')
+                messagebox.showerror('Error!', 'Invalid Sale Item ID format. It should start with "SI" followed by at least three digits.')
                 return False
             return True
 
@@ -1961,18 +4490,15 @@ def insertbysalesitems():
             resetfield()
             return
 
-        # Determine discount strategy based on selection
+        # Determine discount rules based on selection
         discount_strategy = discount_choice.get()
-        if discount_strategy == "NoDiscount":
-            discount = NoDiscount()
-        elif discount_strategy == "SeasonalDiscount":
-            discount = SeasonalDiscount()
-        elif discount_strategy == "FirstTimeBuyerDiscount":
-            discount = FirstTimeBuyerDiscount()
-
-        # Create SalesItemInsert instance and apply discount
+        discount = SALES_ITEM_DISCOUNTS.get(discount_strategy)
+        if discount is None:
+            messagebox.showerror('Error!', f'Choose a discount type from the list: {", ".join(SALES_ITEM_DISCOUNTS)}.')
+            return
+
+        # Create SalesItemInsert instance; it is priced once the sale and medicine are known
         sales_item = SalesItemInsert(sie, se, me, qe, pe)
-        sales_item.subtotal = discount.apply_discount(sales_item.subtotal)
 
         # Validate and perform insert if valid
         if not sales_item.validate():
@@ -1987,10 +4513,18 @@ def insertbysalesitems():
             resetfield()
             return
 
+        # The first-time buyer discount only applies to lines of the customer's first sale
+        if not discount.applies_to(sale_id=se):
+            messagebox.showerror('Error!', f'Sale ID {se} is not the customer\'s first purchase, so {discount_strategy} does not apply.')
+            resetfield()
+            return
+
+        # Priced as a one-line basket; the brand is needed for brand-scoped rules
+        brand = dbms.fetch_query("SELECT brand FROM MEDICINE WHERE medicine_id = :1", (me,), cache=True)
+        sales_item.subtotal = discount.price_lines([(me, brand[0][0] if brand else None, qe, pe)], sale_id=se)[0]
+
         # Check if the sale_item_id already exists
-        query = "SELECT sale_item_id FROM SALES_ITEMS WHERE sale_item_id = :1"
-        params = (sie,)
-        c = dbms.fetch_query(query, params)
+        c = id_index['SALES_ITEMS'].contains(sie)
 
         if c:
             messagebox.showerror('Insert Error!', f'Sale Item ID {sie} already exists!')
@@ -2008,7 +4542,7 @@ def insertbysalesitems():
             try:
                 invoker.execute_commands()
                 messagebox.showinfo('Success!', 'Record inserted successfully into Sales Items Table!')
-            except cx_Oracle.DatabaseError as e:
+            except DATABASE_ERRORS as e:
                 error_message = str(e)
                 if "ORA-20001" in error_message:
                     messagebox.showerror("Trigger Error", "Trigger prevented the operation: Insufficient stock in MEDICINE table.")
@@ -2035,6 +4569,7 @@ def insertbysalesitems():
     # Input fields
     saidentry = Entry(DetailsFrame, font=("Georgia", 16, 'bold'), bg='white', fg='black')
     saidentry.place(x=20, y=80, width=350)
+    prefill_id(saidentry, 'SALES_ITEMS')
     sidentry = Entry(DetailsFrame, font=("Georgia", 16, 'bold'), bg='white', fg='black')
     sidentry.place(x=20, y=160, width=350)
     midentry = Entry(DetailsFrame, font=("Georgia", 16, 'bold'), bg='white', fg='black')
@@ -2046,7 +4581,7 @@ def insertbysalesitems():
 
     discount_choice = StringVar(DetailsFrame)
     discount_choice.set("NoDiscount")  # Default value
-    discount_menu = ttk.Combobox(DetailsFrame, textvariable=discount_choice, font=("Georgia", 16, 'bold'), values=["NoDiscount", "SeasonalDiscount", "FirstTimeBuyerDiscount"])
+    discount_menu = ttk.Combobox(DetailsFrame, textvariable=discount_choice, font=("Georgia", 16, 'bold'), values=list(SALES_ITEM_DISCOUNTS))
     discount_menu.place(x=450, y=240, width=350)
 
     EnterButton = Button(DetailsFrame, text='Enter', command=insertdetails, font=('Georgia', 18, 'bold'), cursor='hand2', bd=0, bg='light blue', fg='black', activebackground='light blue')
@@ -2054,8 +4589,7 @@ def insertbysalesitems():
 
     # Function when back button is pressed
     def backpage():
-        root11.destroy()
-        insert_medicine()
+        show_screen(insert_medicine)
 
     # Button for going back to previous page
     backbutton = Button(root11, text='Back', command=backpage, font=('Georgia', 18, 'bold'), cursor='hand2', bd=0, bg='light blue', fg='black', activebackground='light blue')
@@ -2063,33 +4597,27 @@ def insertbysalesitems():
 
     # Function when back home button is pressed
     def backtohome():
-        root11.destroy()
-        introscreen()
+        show_screen(introscreen)
 
     # Button for going back to home page
     home_page_button = Button(root11, text='Back to home', command=backtohome, font=('Georgia', 18, 'bold'), cursor='hand2', bd=0, bg='light blue', fg='black', activebackground='light blue')
     home_page_button.place(x=750, y=25, width=220)
 
-    root11.mainloop()
-
 #Inserting a medicine
-def insert_medicine():
+def insert_medicine(root3):
     #Create a tkinter page for the insert medicine page
-    root3 = Tk()
     root3.geometry('1000x700+250+50') #Set window size
     root3.title('Insert Medicine Page') #Set window title
     root3.resizable(0,0) # Disable window resizing
     root3.config(bg='gray') #Set background colour
     
-    bgimg = Image.open(R"C:\Users\Nikhil\Downloads\SSN\College Files\Second Year\3rd Semester\Database Technology Lab\Mini Project\bgpic.jpg")
-    bgtk = ImageTk.PhotoImage(bgimg)
+    bgtk = assets.photo('bgpic.jpg', (1000, 750))
     bglabel = Label(root3, image=bgtk, height=750, width=1000)
     bglabel.place(x=0, y=0)
 
     #Function when back home button is pressed
     def backtohome():
-        root3.destroy()
-        introscreen()
+        show_screen(introscreen)
     
     #Create top frame for displaying title
     Topframe = Frame(root3, bg='black',width=1000, height=100)
@@ -2104,28 +4632,22 @@ def insert_medicine():
 
     #Function when buttons are pressed for inserting into specific tables
     def insert_supplier():
-        root3.destroy()
-        insertbysupplier()
+        show_screen(insertbysupplier)
     
     def insert_medicine():
-        root3.destroy()
-        insertbymedicine()
+        show_screen(insertbymedicine)
     
     def insert_customer():
-        root3.destroy()
-        insertbycustomer()
+        show_screen(insertbycustomer)
     
     def insert_prescription():
-        root3.destroy()
-        insertbyprescription()
+        show_screen(insertbyprescription)
 
     def insert_sales():
-        root3.destroy()
-        insertbysales()
+        show_screen(insertbysales)
     
     def insert_sales_items():
-        root3.destroy()
-        insertbysalesitems()
+        show_screen(insertbysalesitems)
 
     #Button for inserting medicine by supplier
     supplier_button = Button(ButtonsFrame,text='Supplier',command=insert_supplier,font=('Georgia',18,'bold'),
@@ -2162,18 +4684,14 @@ def insert_medicine():
                               cursor='hand2',bd=0,bg='light blue',fg='black',activebackground='light blue')
     home_page_button.place(x=760,y=25,width=220)
 
-    root3.mainloop()
-
 #updating in supplier
-def updatebysupplier():
-    root12 = Tk()
+def updatebysupplier(root12):
     root12.geometry('1000x700+250+50')
     root12.title('Update Supplier Page')
     root12.resizable(0, 0)
     root12.config(bg='gray')
 
-    bgimg = Image.open(R"C:\Users\Nikhil\Downloads\SSN\College Files\Second Year\3rd Semester\Database Technology Lab\Mini Project\bgpic.jpg")
-    bgtk = ImageTk.PhotoImage(bgimg)
+    bgtk = assets.photo('bgpic.jpg', (1000, 750))
     bglabel = Label(root12, image=bgtk, height=750, width=1000)
     bglabel.place(x=0, y=0)
 
@@ -2183,6 +4701,7 @@ def updatebysupplier():
         numberentry.delete(0, END)
         emailentry.delete(0, END)
         addressentry.delete(0, END)
+    root12.on_show.append(resetfield)
 
     def update_supplier_details():
         se = sidentry.get()  # Supplier ID (primary key for identification)
@@ -2198,9 +4717,9 @@ def updatebysupplier():
 
         # Validate Supplier ID format
         def pattern():
-            pattern_regex = r"^S\d{3}$"
+            pattern_regex = r"^S(UP)?\d{3,}$"
             if not re.match(pattern_regex, se):
-                messagebox.showerror('Error!', 'Invalid Supplier ID format. It should start with "S" followed by three digits.')
+                messagebox.showerror('Error!', 'Invalid Supplier ID format. It should start with "SUP" (or "S" for older suppliers) followed by at least three digits.')
                 return False
             return True
 
@@ -2223,11 +4742,7 @@ def updatebysupplier():
         else:
             # Check if Supplier ID exists in the table before updating
             try:
-                query_check = "SELECT supplier_id FROM SUPPLIER WHERE supplier_id = :1"
-                params_check = (se,)
-                result = dbms.fetch_query(query_check, params_check)
-                
-                if not result:
+                if not id_index['SUPPLIER'].contains(se):
                     messagebox.showerror('Error!', f'Supplier ID {se} does not exist in the SUPPLIER table.')
                     resetfield()
                     return
@@ -2239,9 +4754,9 @@ def updatebysupplier():
                     WHERE supplier_id=:5
                 """
                 params = (sne, ne, ee, ae, se)
-                dbms.execute_query(query, params)
-                dbms.execute_query("COMMIT")
-                messagebox.showinfo('Success!', f'Supplier ID {se} updated successfully.')
+                if dbms.execute_query(query, params):
+                    events.publish('SUPPLIER', 'update', {'s_name': sne, 'contact_number': ne, 'email': ee, 'address': ae, 'supplier_id': se})
+                    messagebox.showinfo('Success!', f'Supplier ID {se} updated successfully.')
                 resetfield()
             except Exception as e:
                 messagebox.showerror('Update Failed', str(e))
@@ -2286,8 +4801,7 @@ def updatebysupplier():
 
     # Function when back button is pressed
     def backpage():
-        root12.destroy()
-        update_medicine()
+        show_screen(update_medicine)
 
     # Button for going back to previous page
     backbutton = Button(root12, text='Back', command=backpage, font=('Georgia', 18, 'bold'),
@@ -2296,26 +4810,21 @@ def updatebysupplier():
 
     # Function when back home button is pressed
     def backtohome():
-        root12.destroy()
-        introscreen()
+        show_screen(introscreen)
 
     # Button for going back to home page
     home_page_button = Button(root12, text='Back to home', command=backtohome, font=('Georgia', 18, 'bold'),
                               cursor='hand2', bd=0, bg='light blue', fg='black', activebackground='light blue')
     home_page_button.place(x=760, y=25, width=220)
 
-    root12.mainloop()
-
 #updating in medicine
-def updatebymedicine():
-    root13 = Tk()
+def updatebymedicine(root13):
     root13.geometry('1000x700+250+50')
     root13.title('Update Medicine Page')
     root13.resizable(0, 0)
     root13.config(bg='gray')
     
-    bgimg = Image.open(R"C:\Users\Nikhil\Downloads\SSN\College Files\Second Year\3rd Semester\Database Technology Lab\Mini Project\bgpic.jpg")
-    bgtk = ImageTk.PhotoImage(bgimg)
+    bgtk = assets.photo('bgpic.jpg', (1000, 750))
     bglabel = Label(root13, image=bgtk, height=750, width=1000)
     bglabel.place(x=0, y=0)
 
@@ -2328,10 +4837,11 @@ def updatebymedicine():
         qtyentry.delete(0, END)
         priceentry.delete(0, END)
         sidentry.delete(0, END)
+    root13.on_show.append(resetfield)
 
     def validate_medicine_id(me):
         # Medicine ID should match format like M001, M002, etc.
-        return bool(re.match(r'^M\d{3}$', me))
+        return bool(re.match(r'^M\d{3,}$', me))
 
     def validate_batch_number(be):
         # Batch Number should match format like BATCH123
@@ -2342,8 +4852,8 @@ def updatebymedicine():
         return bool(re.match(r'^\d{2}-[A-Za-z]{3}-\d{2}$', ee))
 
     def validate_supplier_id(se):
-        # Supplier ID should match format like S001, S002, etc.
-        return bool(re.match(r'^S\d{3}$', se))
+        # Supplier ID should match format like SUP0000000001, or S001 for older suppliers
+        return bool(re.match(r'^S(UP)?\d{3,}$', se))
 
     def update_medicine_details():
         me = midentry.get()  # Medicine ID (primary key for identification)
@@ -2363,10 +4873,7 @@ def updatebymedicine():
 
         # Check if Medicine ID exists in the table
         try:
-            query = "SELECT COUNT(*) FROM MEDICINE WHERE medicine_id = :1"
-            params = (me,)
-            result = dbms.execute_query(query, params)
-            if result[0][0] == 0:
+            if not id_index['MEDICINE'].contains(me):
                 messagebox.showerror('Error!', f'Medicine ID {me} does not exist in the table.')
                 resetfield()
                 return
@@ -2405,10 +4912,7 @@ def updatebymedicine():
 
         # Check if Supplier ID exists in the supplier table
         try:
-            query = "SELECT COUNT(*) FROM SUPPLIER WHERE supplier_id = :1"
-            params = (se,)
-            result = dbms.execute_query(query, params)
-            if result[0][0] == 0:
+            if not id_index['SUPPLIER'].contains(se):
                 messagebox.showerror('Error!', f'Supplier ID {se} does not exist in the Supplier table.')
                 resetfield()
                 return
@@ -2421,12 +4925,13 @@ def updatebymedicine():
         try:
             query = """
                 UPDATE MEDICINE 
-                SET m_name=:1, brand=:2, batch_number=:3, expiry_date=:4, quantity=:5, price=:6, supplier_id=:7 
+                SET m_name=:1, brand=:2, batch_number=:3, expiry_date=:4, quantity=:5, price=:6, supplier_id=:7, version=version + 1
                 WHERE medicine_id=:8
             """
             params = (mne, bre, be, ee, qe, pe, se, me)
-            dbms.execute_query(query, params)
-            messagebox.showinfo('Success!', f'Medicine ID {me} updated successfully.')
+            if dbms.execute_query(query, params):
+                events.publish('MEDICINE', 'update', {'m_name': mne, 'brand': bre, 'batch_number': be, 'expiry_date': ee, 'quantity': qe, 'price': pe, 'supplier_id': se, 'medicine_id': me})
+                messagebox.showinfo('Success!', f'Medicine ID {me} updated successfully.')
             resetfield()
         except Exception as e:
             messagebox.showerror('Update Failed', str(e))
@@ -2483,8 +4988,7 @@ def updatebymedicine():
 
     # Function when back button is pressed
     def backpage():
-        root13.destroy()
-        update_medicine()
+        show_screen(update_medicine)
 
     # Button for going back to previous page
     backbutton = Button(root13, text='Back', command=backpage, font=('Georgia', 18, 'bold'),
@@ -2493,26 +4997,21 @@ def updatebymedicine():
 
     # Function when back home button is pressed
     def backtohome():
-        root13.destroy()
-        introscreen()
+        show_screen(introscreen)
 
     # Button for going back to home page
     home_page_button = Button(root13, text='Back to home', command=backtohome, font=('Georgia', 18, 'bold'),
                               cursor='hand2', bd=0, bg='light blue', fg='black', activebackground='light blue')
     home_page_button.place(x=760, y=25, width=220)
 
-    root13.mainloop()
-
 #Updating in customer
-def updatebycustomer():
-    root14 = Tk()
+def updatebycustomer(root14):
     root14.geometry('1000x700+250+50')
     root14.title('Update Customer Page')
     root14.resizable(0, 0)
     root14.config(bg='gray')
 
-    bgimg = Image.open(R"C:\Users\Nikhil\Downloads\SSN\College Files\Second Year\3rd Semester\Database Technology Lab\Mini Project\bgpic.jpg")
-    bgtk = ImageTk.PhotoImage(bgimg)
+    bgtk = assets.photo('bgpic.jpg', (1000, 750))
     bglabel = Label(root14, image=bgtk, height=750, width=1000)
     bglabel.place(x=0, y=0)
 
@@ -2522,6 +5021,7 @@ def updatebycustomer():
         numberentry.delete(0, END)
         emailentry.delete(0, END)
         addressentry.delete(0, END)
+    root14.on_show.append(resetfield)
 
     def update_customer_details():
         cid = cidentry.get()  # Customer ID (primary key for identification)
@@ -2532,9 +5032,9 @@ def updatebycustomer():
 
         # Check if Customer ID format is valid (e.g., "CUST123")
         def validate_customer_id():
-            pattern = r"^C\d{3}$"
+            pattern = r"^C\d{3,}$"
             if not re.match(pattern, cid):
-                messagebox.showerror('Error!', 'Invalid Customer ID format. It should start with "CUST" followed by three digits.')
+                messagebox.showerror('Error!', 'Invalid Customer ID format. It should start with "CUST" followed by at least three digits.')
                 return False
             return True
 
@@ -2571,9 +5071,7 @@ def updatebycustomer():
         else:
             try:
                 # Check if customer ID exists in the table
-                query = "SELECT customer_id FROM CUSTOMER WHERE customer_id = :1"
-                params = (cid,)
-                c = dbms.fetch_query(query, params)
+                c = id_index['CUSTOMER'].contains(cid)
 
                 if not c:
                     messagebox.showerror('Error!', f'Customer ID {cid} does not exist.')
@@ -2586,8 +5084,9 @@ def updatebycustomer():
                     WHERE customer_id=:5
                 """
                 params = (cname, contact_number, email, address, cid)
-                dbms.execute_query(query, params)
-                messagebox.showinfo('Success!', f'Customer ID {cid} updated successfully.')
+                if dbms.execute_query(query, params):
+                    events.publish('CUSTOMER', 'update', {'c_name': cname, 'contact_number': contact_number, 'email': email, 'address': address, 'customer_id': cid})
+                    messagebox.showinfo('Success!', f'Customer ID {cid} updated successfully.')
                 resetfield()
             except Exception as e:
                 messagebox.showerror('Update Failed', str(e))
@@ -2632,8 +5131,7 @@ def updatebycustomer():
 
     # Function when back button is pressed
     def backpage():
-        root14.destroy()
-        update_medicine()
+        show_screen(update_medicine)
 
     # Button for going back to previous page
     backbutton = Button(root14, text='Back', command=backpage, font=('Georgia', 18, 'bold'),
@@ -2642,26 +5140,21 @@ def updatebycustomer():
 
     # Function when back home button is pressed
     def backtohome():
-        root14.destroy()
-        introscreen()
+        show_screen(introscreen)
 
     # Button for going back to home page
     home_page_button = Button(root14, text='Back to home', command=backtohome, font=('Georgia', 18, 'bold'),
                               cursor='hand2', bd=0, bg='light blue', fg='black', activebackground='light blue')
     home_page_button.place(x=760, y=25, width=220)
 
-    root14.mainloop()
-
 #Updating in prescription
-def updatebyprescription():
-    root15 = Tk()
+def updatebyprescription(root15):
     root15.geometry('1000x700+250+50')
     root15.title('Update Prescription Page')
     root15.resizable(0, 0)
     root15.config(bg='gray')
 
-    bgimg = Image.open(R"C:\Users\Nikhil\Downloads\SSN\College Files\Second Year\3rd Semester\Database Technology Lab\Mini Project\bgpic.jpg")
-    bgtk = ImageTk.PhotoImage(bgimg)
+    bgtk = assets.photo('bgpic.jpg', (1000, 750))
     bglabel = Label(root15, image=bgtk, height=750, width=1000)
     bglabel.place(x=0, y=0)
 
@@ -2674,16 +5167,15 @@ def updatebyprescription():
         freqentry.delete(0, END)
         durationentry.delete(0, END)
         addinentry.delete(0, END)
+    root15.on_show.append(resetfield)
 
     def validate_prescription_id(pid):
         # Check if prescription ID is in the correct format (e.g., P002)
-        return bool(re.match(r'^P\d{3}$', pid))
+        return bool(re.match(r'^P\d{3,}$', pid))
 
     def validate_customer_exists(cid):
         # Check if customer ID exists in the database
-        query = "SELECT COUNT(*) FROM CUSTOMER WHERE customer_id=:1"
-        result = dbms.execute_query(query, (cid,))
-        return result[0][0] > 0  # Returns True if customer exists, otherwise False
+        return id_index['CUSTOMER'].contains(cid)
 
     def validate_prescription_date(date):
         # Check if prescription date is in the correct format (dd-mon-yy)
@@ -2721,9 +5213,7 @@ def updatebyprescription():
         else:
             # Check if Prescription ID exists in the database
             try:
-                check_query = "SELECT COUNT(*) FROM PRESCRIPTION WHERE prescription_id=:1"
-                prescription_count = dbms.execute_query(check_query, (pe,))[0][0]
-                if prescription_count == 0:
+                if not id_index['PRESCRIPTION'].contains(pe):
                     messagebox.showerror('Error!', 'Prescription ID does not exist in the database.')
                     resetfield()
                     return
@@ -2741,8 +5231,9 @@ def updatebyprescription():
                     WHERE prescription_id=:8
                 """
                 params = (ce, dne, pde, doe, fe, due, ae, pe)
-                dbms.execute_query(query, params)
-                messagebox.showinfo('Success!', f'Prescription ID {pe} updated successfully.')
+                if dbms.execute_query(query, params):
+                    events.publish('PRESCRIPTION', 'update', {'customer_id': ce, 'doctor_name': dne, 'prescription_date': pde, 'dosage': doe, 'frequency': fe, 'duration': due, 'additional_instructions': ae, 'prescription_id': pe})
+                    messagebox.showinfo('Success!', f'Prescription ID {pe} updated successfully.')
                 resetfield()
             except Exception as e:
                 messagebox.showerror('Update Failed', str(e))
@@ -2800,8 +5291,7 @@ def updatebyprescription():
 
     # Function when back button is pressed
     def backpage():
-        root15.destroy()
-        update_medicine()
+        show_screen(update_medicine)
 
     # Button for going back to previous page
     backbutton = Button(root15, text='Back', command=backpage, font=('Georgia', 18, 'bold'),
@@ -2810,26 +5300,21 @@ def updatebyprescription():
 
     # Function when back home button is pressed
     def backtohome():
-        root15.destroy()
-        introscreen()
+        show_screen(introscreen)
 
     # Button for going back to home page
     home_page_button = Button(root15, text='Back to home', command=backtohome, font=('Georgia', 18, 'bold'),
                               cursor='hand2', bd=0, bg='light blue', fg='black', activebackground='light blue')
     home_page_button.place(x=760, y=25, width=220)
 
-    root15.mainloop()
-
 #Updating in sales
-def updatebysales():
-    root16 = Tk()
+def updatebysales(root16):
     root16.geometry('1000x700+250+50')
     root16.title('Update Sales Page')
     root16.resizable(0, 0)
     root16.config(bg='gray')
 
-    bgimg = Image.open(R"C:\Users\Nikhil\Downloads\SSN\College Files\Second Year\3rd Semester\Database Technology Lab\Mini Project\bgpic.jpg")
-    bgtk = ImageTk.PhotoImage(bgimg)
+    bgtk = assets.photo('bgpic.jpg', (1000, 750))
     bglabel = Label(root16, image=bgtk, height=750, width=1000)
     bglabel.place(x=0, y=0)
 
@@ -2839,6 +5324,7 @@ def updatebysales():
         sdateentry.delete(0, END)
         totamtentry.delete(0, END)
         payentry.delete(0, END)
+    root16.on_show.append(resetfield)
 
     def update_sales_details():
         sid = sidentry.get()  # Sale ID (primary key for identification)
@@ -2849,9 +5335,7 @@ def updatebysales():
 
         # Check if Sale ID exists in the SALES table
         try:
-            check_sale_query = "SELECT COUNT(*) FROM SALES WHERE sale_id=:1"
-            sale_count = dbms.execute_query(check_sale_query, (sid,))[0][0]
-            if sale_count == 0:
+            if not id_index['SALES'].contains(sid):
                 messagebox.showerror('Error!', f'Sale ID {sid} does not exist in the SALES table.')
                 resetfield()
                 return
@@ -2860,23 +5344,21 @@ def updatebysales():
             resetfield()
             return
 
-        # Check if Sale ID is in the correct format (S002 something)
-        if not re.match(r'^S\d{3} .+', sid):
-            messagebox.showerror('Error!', 'Sale ID must be in the format S002 something.')
+        # Check if Sale ID is in the correct format (S002)
+        if not re.match(r'^S\d{3,}$', sid):
+            messagebox.showerror('Error!', 'Sale ID must be in the format S002.')
             resetfield()
             return
 
         # Check if Customer ID is in the correct format (C002) and exists in the customer table
-        if not re.match(r'^C\d{3}$', cid):
+        if not re.match(r'^C\d{3,}$', cid):
             messagebox.showerror('Error!', 'Customer ID must be in the format C002.')
             resetfield()
             return
 
         # Validate if the Customer ID exists in the database (assuming the database has a check for this)
         try:
-            check_query = "SELECT COUNT(*) FROM CUSTOMER WHERE customer_id=:1"
-            customer_count = dbms.execute_query(check_query, (cid,))[0][0]
-            if customer_count == 0:
+            if not id_index['CUSTOMER'].contains(cid):
                 messagebox.showerror('Error!', 'Customer ID does not exist in the database.')
                 resetfield()
                 return
@@ -2915,8 +5397,9 @@ def updatebysales():
                     WHERE sale_id=:5
                 """
                 params = (cid, sdate, total_amt, payment_method, sid)
-                dbms.execute_query(query, params)
-                messagebox.showinfo('Success!', f'Sale ID {sid} updated successfully.')
+                if dbms.execute_query(query, params):
+                    events.publish('SALES', 'update', {'customer_id': cid, 'sale_date': sdate, 'total_amount': total_amt, 'payment_method': payment_method, 'sale_id': sid})
+                    messagebox.showinfo('Success!', f'Sale ID {sid} updated successfully.')
                 resetfield()
             except Exception as e:
                 messagebox.showerror('Update Failed', str(e))
@@ -2961,8 +5444,7 @@ def updatebysales():
 
     # Function when back button is pressed
     def backpage():
-        root16.destroy()
-        update_medicine()
+        show_screen(update_medicine)
 
     # Button for going back to previous page
     backbutton = Button(root16, text='Back', command=backpage, font=('Georgia', 18, 'bold'),
@@ -2971,19 +5453,15 @@ def updatebysales():
 
     # Function when back home button is pressed
     def backtohome():
-        root16.destroy()
-        introscreen()
+        show_screen(introscreen)
 
     # Button for going back to home page
     home_page_button = Button(root16, text='Back to home', command=backtohome, font=('Georgia', 18, 'bold'),
                               cursor='hand2', bd=0, bg='light blue', fg='black', activebackground='light blue')
     home_page_button.place(x=760, y=25, width=220)
 
-    root16.mainloop()
-
 #Updating in sales items
-def updatebysalesitems():
-    root17 = Tk()
+def updatebysalesitems(root17):
     root17.geometry('1000x700+250+50')
     root17.title('Update Sales Items Page')
     root17.resizable(0, 0)
@@ -2995,15 +5473,16 @@ def updatebysalesitems():
         midentry.delete(0, END)
         qtyentry.delete(0, END)
         priceentry.delete(0, END)
+    root17.on_show.append(resetfield)
 
     def is_valid_sale_item_id(sale_item_id):
-        return bool(re.match(r"^SI\d{3}$", sale_item_id))
+        return bool(re.match(r"^SI\d{3,}$", sale_item_id))
 
     def is_valid_sale_id(sale_id):
-        return bool(re.match(r"^S\d{3}$", sale_id))
+        return bool(re.match(r"^S\d{3,}$", sale_id))
 
     def is_valid_medicine_id(medicine_id):
-        return bool(re.match(r"^M\d{3}$", medicine_id))
+        return bool(re.match(r"^M\d{3,}$", medicine_id))
 
     def is_non_negative(value):
         try:
@@ -3036,22 +5515,19 @@ def updatebysalesitems():
             return
 
         # Check if Sale Item ID exists
-        query = "SELECT COUNT(*) FROM SALES_ITEMS WHERE sale_item_id = :1"
-        if dbms.execute_query(query, (sale_item_id,))[0][0] == 0:
+        if not id_index['SALES_ITEMS'].contains(sale_item_id):
             messagebox.showerror('Error!', f'Sale Item ID {sale_item_id} does not exist.')
             resetfield()
             return
 
         # Check if Sale ID exists
-        query = "SELECT COUNT(*) FROM SALES WHERE sale_id = :1"
-        if dbms.execute_query(query, (sale_id,))[0][0] == 0:
+        if not id_index['SALES'].contains(sale_id):
             messagebox.showerror('Error!', f'Sale ID {sale_id} does not exist.')
             resetfield()
             return
 
         # Check if Medicine ID exists
-        query = "SELECT COUNT(*) FROM MEDICINE WHERE medicine_id = :1"
-        if dbms.execute_query(query, (medicine_id,))[0][0] == 0:
+        if not id_index['MEDICINE'].contains(medicine_id):
             messagebox.showerror('Error!', f'Medicine ID {medicine_id} does not exist.')
             resetfield()
             return
@@ -3064,8 +5540,9 @@ def updatebysalesitems():
                 WHERE sale_item_id = :6
             """
             params = (sale_id, medicine_id, quantity, price_per_unit, subtotal, sale_item_id)
-            dbms.execute_query(query, params)
-            messagebox.showinfo('Success!', f'Sale Item ID {sale_item_id} updated successfully.')
+            if dbms.execute_query(query, params):
+                events.publish('SALES_ITEMS', 'update', {'sale_id': sale_id, 'medicine_id': medicine_id, 'quantity': quantity, 'price_per_unit': price_per_unit, 'subtotal': subtotal, 'sale_item_id': sale_item_id})
+                messagebox.showinfo('Success!', f'Sale Item ID {sale_item_id} updated successfully.')
             resetfield()
         except Exception as e:
             messagebox.showerror('Update Failed', str(e))
@@ -3110,8 +5587,7 @@ def updatebysalesitems():
 
     # Function when back button is pressed
     def backpage():
-        root17.destroy()
-        update_medicine()
+        show_screen(update_medicine)
 
     # Button for going back to previous page
     backbutton = Button(root17, text='Back', command=backpage, font=('Georgia', 18, 'bold'),
@@ -3120,34 +5596,28 @@ def updatebysalesitems():
 
     # Function when back home button is pressed
     def backtohome():
-        root17.destroy()
-        introscreen()
+        show_screen(introscreen)
 
     # Button for going back to home page
     home_page_button = Button(root17, text='Back to home', command=backtohome, font=('Georgia', 18, 'bold'),
                               cursor='hand2', bd=0, bg='light blue', fg='black', activebackground='light blue')
     home_page_button.place(x=760, y=25, width=220)
 
-    root17.mainloop()
-
 #Updating a medicine
-def update_medicine():
+def update_medicine(root4):
     #Create a tkinter page for the update medicine page
-    root4 = Tk()
     root4.geometry('1000x700+250+50') #Set window size
     root4.title('Update Medicine Page') #Set window title
     root4.resizable(0,0) # Disable window resizing
     root4.config(bg='gray') #Set background colour
 
-    bgimg = Image.open(R"C:\Users\Nikhil\Downloads\SSN\College Files\Second Year\3rd Semester\Database Technology Lab\Mini Project\bgpic.jpg")
-    bgtk = ImageTk.PhotoImage(bgimg)
+    bgtk = assets.photo('bgpic.jpg', (1000, 750))
     bglabel = Label(root4, image=bgtk, height=750, width=1000)
     bglabel.place(x=0, y=0)
 
     #Function when back home button is pressed
     def backtohome():
-        root4.destroy()
-        introscreen()
+        show_screen(introscreen)
     
     #Create top frame for displaying title
     Topframe = Frame(root4, bg='black',width=1000, height=100)
@@ -3162,28 +5632,22 @@ def update_medicine():
 
     #Function when buttons are pressed for updating into specific tables
     def update_supplier():
-        root4.destroy()
-        updatebysupplier()
+        show_screen(updatebysupplier)
     
     def update_medicine():
-        root4.destroy()
-        updatebymedicine()
+        show_screen(updatebymedicine)
 
     def update_customer():
-        root4.destroy()
-        updatebycustomer()
+        show_screen(updatebycustomer)
 
     def update_prescription():
-        root4.destroy()
-        updatebyprescription()
+        show_screen(updatebyprescription)
 
     def update_sales():
-        root4.destroy()
-        updatebysales()
+        show_screen(updatebysales)
 
     def update_sales_items():
-        root4.destroy()
-        updatebysalesitems()
+        show_screen(updatebysalesitems)
 
     #Button for updating medicine by supplier
     supplier_button = Button(ButtonsFrame,text='Supplier',command=update_supplier,font=('Georgia',18,'bold'),
@@ -3220,18 +5684,14 @@ def update_medicine():
                               cursor='hand2',bd=0,bg='light blue',fg='black',activebackground='light blue')
     home_page_button.place(x=760,y=25,width=220)
 
-    root4.mainloop()
-
 # Delete supplier record
-def deletebysupplier():
-    root_del_supplier = Tk()
+def deletebysupplier(root_del_supplier):
     root_del_supplier.geometry('1000x525')
     root_del_supplier.title('Delete Supplier')
     root_del_supplier.resizable(0, 0)
     root_del_supplier.config(bg='gray')
 
-    bgimg = Image.open(R"C:\Users\Nikhil\Downloads\SSN\College Files\Second Year\3rd Semester\Database Technology Lab\Mini Project\bgpic.jpg")
-    bgtk = ImageTk.PhotoImage(bgimg)
+    bgtk = assets.photo('bgpic.jpg', (1000, 750))
     bglabel = Label(root_del_supplier, image=bgtk, height=750, width=1000)
     bglabel.place(x=0, y=0)
 
@@ -3239,7 +5699,7 @@ def deletebysupplier():
         sid = sidentry.get()  # Supplier ID
 
         # Check if Supplier ID is in the correct format (e.g., S002)
-        if not re.match(r'^S\d{3}$', sid):
+        if not re.match(r'^S\d{3,}$', sid):
             messagebox.showerror('Error!', 'Supplier ID format is invalid. It should be in the format Sxxx (e.g., S002).')
             return
 
@@ -3249,13 +5709,7 @@ def deletebysupplier():
         else:
             # Check if Supplier ID exists in the SUPPLIER table
             try:
-                check_query = "SELECT COUNT(*) FROM SUPPLIER WHERE supplier_id=:1"
-                result = dbms.fetch_query(check_query, (sid,))
-                
-                # Check if result is valid and contains data
-                if result and result[0][0] > 0:
-                    supplier_count = result[0][0]
-                else:
+                if not id_index['SUPPLIER'].contains(sid):
                     messagebox.showerror('Error!', 'Supplier ID does not exist in the database.')
                     sidentry.delete(0, END)
                     return
@@ -3266,10 +5720,11 @@ def deletebysupplier():
 
             # If all checks pass, proceed with deletion
             try:
-                query = "DELETE FROM SUPPLIER WHERE supplier_id=:1"
-                dbms.execute_query(query, (sid,))
-                messagebox.showinfo('Success!', f'Supplier ID {sid} deleted successfully.')
-                sidentry.delete(0, END)
+                query = "DELETE FROM SUPPLIER WHERE supplier_id = :1"
+                if dbms.execute_query(query, (sid,)):
+                    events.publish('SUPPLIER', 'delete', {'supplier_id': sid})
+                    messagebox.showinfo('Success!', f'Supplier ID {sid} deleted successfully.')
+                    sidentry.delete(0, END)
             except Exception as e:
                 messagebox.showerror('Delete Failed', str(e))
 
@@ -3294,8 +5749,7 @@ def deletebysupplier():
 
     #Function when back button is pressed
     def backpage():
-        root_del_supplier.destroy()
-        delete_medicine()
+        show_screen(delete_medicine)
 
     #Button for going back to previous page
     backbutton = Button(root_del_supplier,text='Back',command=backpage,font=('Georgia',18,'bold'),
@@ -3304,26 +5758,21 @@ def deletebysupplier():
 
     #Function when back home button is pressed
     def backtohome():
-        root_del_supplier.destroy()
-        introscreen()
+        show_screen(introscreen)
 
     #Button for going back to home page
     home_page_button = Button(root_del_supplier,text='Back to home',command=backtohome,font=('Georgia',18,'bold'),
                               cursor='hand2',bd=0,bg='light blue',fg='black',activebackground='light blue')
     home_page_button.place(x=760,y=25,width=220)
 
-    root_del_supplier.mainloop()
-
 # Delete medicine record
-def deletebymedicine():
-    root_del_medicine = Tk()
+def deletebymedicine(root_del_medicine):
     root_del_medicine.geometry('1000x525')
     root_del_medicine.title('Delete Medicine')
     root_del_medicine.resizable(0, 0)
     root_del_medicine.config(bg='gray')
 
-    bgimg = Image.open(R"C:\Users\Nikhil\Downloads\SSN\College Files\Second Year\3rd Semester\Database Technology Lab\Mini Project\bgpic.jpg")
-    bgtk = ImageTk.PhotoImage(bgimg)
+    bgtk = assets.photo('bgpic.jpg', (1000, 750))
     bglabel = Label(root_del_medicine, image=bgtk, height=750, width=1000)
     bglabel.place(x=0, y=0)
 
@@ -3331,7 +5780,7 @@ def deletebymedicine():
         mid = midentry.get()  # Get the medicine_id from the entry field
 
         # Check if Medicine ID is in the correct format (e.g., M002)
-        if not re.match(r'^M\d{3}$', mid):
+        if not re.match(r'^M\d{3,}$', mid):
             messagebox.showerror('Error!', 'Medicine ID format is invalid. It should be in the format Mxxx (e.g., M002).')
             return
 
@@ -3341,13 +5790,7 @@ def deletebymedicine():
         else:
             # Check if Medicine ID exists in the MEDICINE table
             try:
-                check_query = "SELECT COUNT(*) FROM MEDICINE WHERE medicine_id=:1"
-                result = dbms.fetch_query(check_query, (mid,))
-                
-                # Check if result is valid and contains data
-                if result and result[0][0] > 0:
-                    medicine_count = result[0][0]
-                else:
+                if not id_index['MEDICINE'].contains(mid):
                     messagebox.showerror('Error!', 'Medicine ID does not exist in the database.')
                     midentry.delete(0, END)
                     return
@@ -3359,9 +5802,10 @@ def deletebymedicine():
             # If all checks pass, proceed with deletion
             try:
                 query = "DELETE FROM MEDICINE WHERE medicine_id = :1"
-                dbms.execute_query(query, (mid,))
-                messagebox.showinfo('Success!', f'Medicine ID {mid} deleted successfully.')
-                midentry.delete(0, END)
+                if dbms.execute_query(query, (mid,)):
+                    events.publish('MEDICINE', 'delete', {'medicine_id': mid})
+                    messagebox.showinfo('Success!', f'Medicine ID {mid} deleted successfully.')
+                    midentry.delete(0, END)
             except Exception as e:
                 messagebox.showerror('Delete Failed', str(e))
 
@@ -3388,8 +5832,7 @@ def deletebymedicine():
 
     # Function when back button is pressed
     def backpage():
-        root_del_medicine.destroy()
-        delete_medicine()  # Adjust this to navigate back to the appropriate page if needed
+        show_screen(delete_medicine)  # Adjust this to navigate back to the appropriate page if needed
 
     # Button for going back to the previous page
     backbutton = Button(root_del_medicine, text='Back', command=backpage, font=('Georgia', 18, 'bold'),
@@ -3398,26 +5841,21 @@ def deletebymedicine():
 
     # Function when back to home button is pressed
     def backtohome():
-        root_del_medicine.destroy()
-        introscreen()  # Adjust this to navigate back to the home page if needed
+        show_screen(introscreen)  # Adjust this to navigate back to the home page if needed
 
     # Button for going back to the home page
     home_page_button = Button(root_del_medicine, text='Back to home', command=backtohome, font=('Georgia', 18, 'bold'),
                               cursor='hand2', bd=0, bg='light blue', fg='black', activebackground='light blue')
     home_page_button.place(x=760, y=25, width=220)
 
-    root_del_medicine.mainloop()
-
 # Delete customer record
-def deletebycustomer():
-    root_del_customer = Tk()
+def deletebycustomer(root_del_customer):
     root_del_customer.geometry('1000x525')
     root_del_customer.title('Delete Customer')
     root_del_customer.resizable(0, 0)
     root_del_customer.config(bg='gray')
 
-    bgimg = Image.open(R"C:\Users\Nikhil\Downloads\SSN\College Files\Second Year\3rd Semester\Database Technology Lab\Mini Project\bgpic.jpg")
-    bgtk = ImageTk.PhotoImage(bgimg)
+    bgtk = assets.photo('bgpic.jpg', (1000, 750))
     bglabel = Label(root_del_customer, image=bgtk, height=750, width=1000)
     bglabel.place(x=0, y=0)
 
@@ -3425,7 +5863,7 @@ def deletebycustomer():
         cid = cidentry.get()  # Get the customer_id from the entry field
 
         # Check if Customer ID is in the correct format (e.g., C002)
-        if not re.match(r'^C\d{3}$', cid):
+        if not re.match(r'^C\d{3,}$', cid):
             messagebox.showerror('Error!', 'Customer ID format is invalid. It should be in the format Cxxx (e.g., C002).')
             return
 
@@ -3435,13 +5873,7 @@ def deletebycustomer():
         else:
             # Check if Customer ID exists in the CUSTOMER table
             try:
-                check_query = "SELECT COUNT(*) FROM CUSTOMER WHERE customer_id=:1"
-                result = dbms.fetch_query(check_query, (cid,))
-                
-                # Check if result is valid and contains data
-                if result and result[0][0] > 0:
-                    customer_count = result[0][0]
-                else:
+                if not id_index['CUSTOMER'].contains(cid):
                     messagebox.showerror('Error!', 'Customer ID does not exist in the database.')
                     cidentry.delete(0, END)
                     return
@@ -3453,9 +5885,10 @@ def deletebycustomer():
             # If all checks pass, proceed with deletion
             try:
                 query = "DELETE FROM CUSTOMER WHERE customer_id = :1"
-                dbms.execute_query(query, (cid,))
-                messagebox.showinfo('Success!', f'Customer ID {cid} deleted successfully.')
-                cidentry.delete(0, END)
+                if dbms.execute_query(query, (cid,)):
+                    events.publish('CUSTOMER', 'delete', {'customer_id': cid})
+                    messagebox.showinfo('Success!', f'Customer ID {cid} deleted successfully.')
+                    cidentry.delete(0, END)
             except Exception as e:
                 messagebox.showerror('Delete Failed', str(e))
 
@@ -3483,8 +5916,7 @@ def deletebycustomer():
 
     # Function when back button is pressed
     def backpage():
-        root_del_customer.destroy()
-        delete_medicine()  # Adjust this to navigate back to the appropriate page if needed
+        show_screen(delete_medicine)  # Adjust this to navigate back to the appropriate page if needed
 
     # Button for going back to the previous page
     backbutton = Button(root_del_customer, text='Back', command=backpage, font=('Georgia', 18, 'bold'),
@@ -3493,26 +5925,21 @@ def deletebycustomer():
 
     # Function when back to home button is pressed
     def backtohome():
-        root_del_customer.destroy()
-        introscreen()  # Adjust this to navigate back to the home page if needed
+        show_screen(introscreen)  # Adjust this to navigate back to the home page if needed
 
     # Button for going back to the home page
     home_page_button = Button(root_del_customer, text='Back to home', command=backtohome, font=('Georgia', 18, 'bold'),
                               cursor='hand2', bd=0, bg='light blue', fg='black', activebackground='light blue')
     home_page_button.place(x=760, y=25, width=220)
 
-    root_del_customer.mainloop()
-
 # Delete prescription record
-def deletebyprescription():
-    root_del_prescription = Tk()
+def deletebyprescription(root_del_prescription):
     root_del_prescription.geometry('1000x525')
     root_del_prescription.title('Delete Prescription')
     root_del_prescription.resizable(0, 0)
     root_del_prescription.config(bg='gray')
 
-    bgimg = Image.open(R"C:\Users\Nikhil\Downloads\SSN\College Files\Second Year\3rd Semester\Database Technology Lab\Mini Project\bgpic.jpg")
-    bgtk = ImageTk.PhotoImage(bgimg)
+    bgtk = assets.photo('bgpic.jpg', (1000, 750))
     bglabel = Label(root_del_prescription, image=bgtk, height=750, width=1000)
     bglabel.place(x=0, y=0)
 
@@ -3520,7 +5947,7 @@ def deletebyprescription():
         pid = pidentry.get()  # Get the prescription_id from the entry field
 
         # Check if Prescription ID is in the correct format (e.g., P001)
-        if not re.match(r'^P\d{3}$', pid):
+        if not re.match(r'^P\d{3,}$', pid):
             messagebox.showerror('Error!', 'Prescription ID format is invalid. It should be in the format Pxxx (e.g., P001).')
             return
 
@@ -3530,13 +5957,7 @@ def deletebyprescription():
         else:
             # Check if Prescription ID exists in the PRESCRIPTION table
             try:
-                check_query = "SELECT COUNT(*) FROM PRESCRIPTION WHERE prescription_id=:1"
-                result = dbms.fetch_query(check_query, (pid,))
-                
-                # Check if result is valid and contains data
-                if result and result[0][0] > 0:
-                    prescription_count = result[0][0]
-                else:
+                if not id_index['PRESCRIPTION'].contains(pid):
                     messagebox.showerror('Error!', 'Prescription ID does not exist in the database.')
                     pidentry.delete(0, END)
                     return
@@ -3548,9 +5969,10 @@ def deletebyprescription():
             # If all checks pass, proceed with deletion
             try:
                 query = "DELETE FROM PRESCRIPTION WHERE prescription_id = :1"
-                dbms.execute_query(query, (pid,))
-                messagebox.showinfo('Success!', f'Prescription ID {pid} deleted successfully.')
-                pidentry.delete(0, END)
+                if dbms.execute_query(query, (pid,)):
+                    events.publish('PRESCRIPTION', 'delete', {'prescription_id': pid})
+                    messagebox.showinfo('Success!', f'Prescription ID {pid} deleted successfully.')
+                    pidentry.delete(0, END)
             except Exception as e:
                 messagebox.showerror('Delete Failed', str(e))
 
@@ -3578,8 +6000,7 @@ def deletebyprescription():
 
     # Function when back button is pressed
     def backpage():
-        root_del_prescription.destroy()
-        delete_medicine()  # Adjust this to navigate back to the appropriate page if needed
+        show_screen(delete_medicine)  # Adjust this to navigate back to the appropriate page if needed
 
     # Button for going back to the previous page
     backbutton = Button(root_del_prescription, text='Back', command=backpage, font=('Georgia', 18, 'bold'),
@@ -3588,26 +6009,21 @@ def deletebyprescription():
 
     # Function when back to home button is pressed
     def backtohome():
-        root_del_prescription.destroy()
-        introscreen()  # Adjust this to navigate back to the home page if needed
+        show_screen(introscreen)  # Adjust this to navigate back to the home page if needed
 
     # Button for going back to the home page
     home_page_button = Button(root_del_prescription, text='Back to home', command=backtohome, font=('Georgia', 18, 'bold'),
                               cursor='hand2', bd=0, bg='light blue', fg='black', activebackground='light blue')
     home_page_button.place(x=760, y=25, width=220)
 
-    root_del_prescription.mainloop()
-
 # Delete sales record
-def deletebysales():
-    root_del_sales = Tk()
+def deletebysales(root_del_sales):
     root_del_sales.geometry('1000x525')
     root_del_sales.title('Delete Sale')
     root_del_sales.resizable(0, 0)
     root_del_sales.config(bg='gray')
 
-    bgimg = Image.open(R"C:\Users\Nikhil\Downloads\SSN\College Files\Second Year\3rd Semester\Database Technology Lab\Mini Project\bgpic.jpg")
-    bgtk = ImageTk.PhotoImage(bgimg)
+    bgtk = assets.photo('bgpic.jpg', (1000, 750))
     bglabel = Label(root_del_sales, image=bgtk, height=750, width=1000)
     bglabel.place(x=0, y=0)
 
@@ -3615,7 +6031,7 @@ def deletebysales():
         sale_id = saleidentry.get()  # Get the sale_id from the entry field
 
         # Check if Sale ID is in the correct format (e.g., S003)
-        if not re.match(r'^S\d{3}$', sale_id):
+        if not re.match(r'^S\d{3,}$', sale_id):
             messagebox.showerror('Error!', 'Sale ID format is invalid. It should be in the format Sxxx (e.g., S003).')
             return
 
@@ -3624,9 +6040,7 @@ def deletebysales():
         else:
             # Check if Sale ID exists in the SALES table
             try:
-                check_query = "SELECT COUNT(*) FROM SALES WHERE sale_id=:1"
-                result = dbms.fetch_query(check_query, (sale_id,))  # Use fetch_query instead of execute_query for retrieval
-                if result[0][0] == 0:
+                if not id_index['SALES'].contains(sale_id):
                     messagebox.showerror('Error!', 'Sale ID does not exist in the database.')
                     saleidentry.delete(0, END)
                     return
@@ -3638,9 +6052,10 @@ def deletebysales():
             # If all checks pass, proceed with deletion
             try:
                 delete_query = "DELETE FROM SALES WHERE sale_id = :1"
-                dbms.execute_query(delete_query, (sale_id,))
-                messagebox.showinfo('Success!', f'Sale ID {sale_id} deleted successfully.')
-                saleidentry.delete(0, END)
+                if dbms.execute_query(delete_query, (sale_id,)):
+                    events.publish('SALES', 'delete', {'sale_id': sale_id})
+                    messagebox.showinfo('Success!', f'Sale ID {sale_id} deleted successfully.')
+                    saleidentry.delete(0, END)
             except Exception as e:
                 messagebox.showerror('Delete Failed', str(e))
 
@@ -3668,8 +6083,7 @@ def deletebysales():
 
     # Function when back button is pressed
     def backpage():
-        root_del_sales.destroy()
-        delete_medicine()  # Adjust this to navigate back to the appropriate page if needed
+        show_screen(delete_medicine)  # Adjust this to navigate back to the appropriate page if needed
 
     # Button for going back to the previous page
     backbutton = Button(root_del_sales, text='Back', command=backpage, font=('Georgia', 18, 'bold'),
@@ -3678,27 +6092,22 @@ def deletebysales():
 
     # Function when back to home button is pressed
     def backtohome():
-        root_del_sales.destroy()
-        introscreen()  # Adjust this to navigate back to the home page if needed
+        show_screen(introscreen)  # Adjust this to navigate back to the home page if needed
 
     # Button for going back to the home page
     home_page_button = Button(root_del_sales, text='Back to home', command=backtohome, font=('Georgia', 18, 'bold'),
                               cursor='hand2', bd=0, bg='light blue', fg='black', activebackground='light blue')
     home_page_button.place(x=760, y=25, width=220)
 
-    root_del_sales.mainloop()
-
 
 # Delete sales items record
-def deletebysalesitems():
-    root_del_saleitems = Tk()
+def deletebysalesitems(root_del_saleitems):
     root_del_saleitems.geometry('1000x525')
     root_del_saleitems.title('Delete Sale Item')
     root_del_saleitems.resizable(0, 0)
     root_del_saleitems.config(bg='gray')
 
-    bgimg = Image.open(R"C:\Users\Nikhil\Downloads\SSN\College Files\Second Year\3rd Semester\Database Technology Lab\Mini Project\bgpic.jpg")
-    bgtk = ImageTk.PhotoImage(bgimg)
+    bgtk = assets.photo('bgpic.jpg', (1000, 750))
     bglabel = Label(root_del_saleitems, image=bgtk, height=750, width=1000)
     bglabel.place(x=0, y=0)
 
@@ -3706,7 +6115,7 @@ def deletebysalesitems():
         sale_item_id = saleitemidentry.get()  # Get the sale_item_id from the entry field
 
         # Check if Sale Item ID is in the correct format (e.g., SI002)
-        if not re.match(r'^SI\d{3}$', sale_item_id):
+        if not re.match(r'^SI\d{3,}$', sale_item_id):
             messagebox.showerror('Error!', 'Sale Item ID format is invalid. It should be in the format SIxxx (e.g., SI002).')
             return
 
@@ -3715,9 +6124,7 @@ def deletebysalesitems():
         else:
             # Check if Sale Item ID exists in the SALES_ITEMS table
             try:
-                check_query = "SELECT COUNT(*) FROM SALES_ITEMS WHERE sale_item_id=:1"
-                result = dbms.fetch_query(check_query, (sale_item_id,))
-                if result[0][0] == 0:
+                if not id_index['SALES_ITEMS'].contains(sale_item_id):
                     messagebox.showerror('Error!', 'Sale Item ID does not exist in the database.')
                     saleitemidentry.delete(0, END)
                     return
@@ -3729,9 +6136,10 @@ def deletebysalesitems():
             # If all checks pass, proceed with deletion
             try:
                 delete_query = "DELETE FROM SALES_ITEMS WHERE sale_item_id = :1"
-                dbms.execute_query(delete_query, (sale_item_id,))
-                messagebox.showinfo('Success!', f'Sale Item ID {sale_item_id} deleted successfully.')
-                saleitemidentry.delete(0, END)
+                if dbms.execute_query(delete_query, (sale_item_id,)):
+                    events.publish('SALES_ITEMS', 'delete', {'sale_item_id': sale_item_id})
+                    messagebox.showinfo('Success!', f'Sale Item ID {sale_item_id} deleted successfully.')
+                    saleitemidentry.delete(0, END)
             except Exception as e:
                 messagebox.showerror('Delete Failed', str(e))
 
@@ -3759,8 +6167,7 @@ def deletebysalesitems():
 
     # Function when back button is pressed
     def backpage():
-        root_del_saleitems.destroy()
-        delete_medicine()  # Adjust to navigate back to the appropriate page if needed
+        show_screen(delete_medicine)  # Adjust to navigate back to the appropriate page if needed
 
     # Button for going back to the previous page
     backbutton = Button(root_del_saleitems, text='Back', command=backpage, font=('Georgia', 18, 'bold'),
@@ -3769,22 +6176,18 @@ def deletebysalesitems():
 
     # Function when back to home button is pressed
     def backtohome():
-        root_del_saleitems.destroy()
-        introscreen()  # Adjust to navigate back to the home page if needed
+        show_screen(introscreen)  # Adjust to navigate back to the home page if needed
 
     # Button for going back to the home page
     home_page_button = Button(root_del_saleitems, text='Back to home', command=backtohome, font=('Georgia', 18, 'bold'),
                               cursor='hand2', bd=0, bg='light blue', fg='black', activebackground='light blue')
     home_page_button.place(x=760, y=25, width=220)
 
-    root_del_saleitems.mainloop()
-
 
 
 #Deleting a medicine
-def delete_medicine():
+def delete_medicine(root5):
     #Create a tkinter page for the delete medicine page
-    root5 = Tk()
     root5.geometry('1000x700+250+50') #Set window size
     root5.title('Delete Medicine Page') #Set window title
     root5.resizable(0,0) # Disable window resizing
@@ -3792,11 +6195,9 @@ def delete_medicine():
 
     #Function when back home button is pressed
     def backtohome():
-        root5.destroy()
-        introscreen()
+        show_screen(introscreen)
 
-    bgimg = Image.open(R"C:\Users\Nikhil\Downloads\SSN\College Files\Second Year\3rd Semester\Database Technology Lab\Mini Project\bgpic.jpg")
-    bgtk = ImageTk.PhotoImage(bgimg)
+    bgtk = assets.photo('bgpic.jpg', (1000, 750))
     bglabel = Label(root5, image=bgtk, height=750, width=1000)
     bglabel.place(x=0, y=0)
 
@@ -3813,28 +6214,22 @@ def delete_medicine():
 
     #Function when buttons are pressed for deleting into specific tables
     def delete_supplier():
-        root5.destroy()
-        deletebysupplier()
+        show_screen(deletebysupplier)
     
     def delete_medicine():
-        root5.destroy()
-        deletebymedicine()
+        show_screen(deletebymedicine)
     
     def delete_customer():
-        root5.destroy()
-        deletebycustomer()
+        show_screen(deletebycustomer)
 
     def delete_prescription():
-        root5.destroy()
-        deletebyprescription()
+        show_screen(deletebyprescription)
 
     def delete_sales():
-        root5.destroy()
-        deletebysales()
+        show_screen(deletebysales)
     
     def delete_sales_items():
-        root5.destroy()
-        deletebysalesitems()
+        show_screen(deletebysalesitems)
 
     #Button for deleting medicine by supplier
     supplier_button = Button(ButtonsFrame,text='Supplier',command=delete_supplier,font=('Georgia',18,'bold'),
@@ -3871,19 +6266,15 @@ def delete_medicine():
                               cursor='hand2',bd=0,bg='light blue',fg='black',activebackground='light blue')
     home_page_button.place(x=760,y=25,width=220)
 
-    root5.mainloop()
-
 #Home page screen
-def introscreen():
+def introscreen(root1):
     #Create a tkinter page for the introduction page
-    root1 = Tk()
     root1.geometry('1000x700+250+50') #Set window size
     root1.title('Home Page') #Set window title
     root1.resizable(0,0) # Disable window resizing
     root1.config(bg='gray') #Set background colour
     
-    bgimg = Image.open(R"C:\Users\Nikhil\Downloads\SSN\College Files\Second Year\3rd Semester\Database Technology Lab\Mini Project\bgpic.jpg")
-    bgtk = ImageTk.PhotoImage(bgimg)
+    bgtk = assets.photo('bgpic.jpg', (1000, 750))
     bglabel = Label(root1, image=bgtk, height=750, width=1000)
     bglabel.place(x=0, y=0)
 
@@ -3904,23 +6295,19 @@ def introscreen():
     
     #Function when check medicine button is pressed
     def check_med():
-        root1.destroy()
-        check_medicine()
+        show_screen(check_medicine)
 
     #Function when insert medicine button is pressed
     def insert_med():
-        root1.destroy()
-        insert_medicine()
+        show_screen(insert_medicine)
     
     #Function when update medicine button is pressed
     def update_med():
-        root1.destroy()
-        update_medicine()
+        show_screen(update_medicine)
     
     #Function when delete medicine button is pressed
     def delete_med():
-        root1.destroy()
-        delete_medicine()
+        show_screen(delete_medicine)
 
     Headingtext = Label(ButtonsFrame, text='Welcome Back',
                         font=('Georgia',20,'bold'),bg='black',fg='white',activebackground='black')
@@ -3946,51 +6333,66 @@ def introscreen():
                                cursor='hand2',bd=0,bg='light blue',fg='black',activebackground='light blue')
     delete_med_button.place(x=275,y=250,width=220)
 
-    # Check near-expiry medicines and display in a message box
-    near_expiry_meds = call_procedure_check_near_expiry(dbms)
-    if near_expiry_meds:
-        near_expiry_message = "Near Expiry Medicines:\n\n"
+    # Alert panel for near-expiry and low-stock medicines, filled in as the checks finish
+    AlertFrame = Frame(root1, bg='black', width=1000, height=130)
+    AlertFrame.place(x=0, y=570)
+
+    def alert_list(title, x):
+        heading = Label(AlertFrame, text=f'{title}: checking...', font=('Georgia', 13, 'bold'), bg='black', fg='white', anchor='w')
+        heading.place(x=x, y=5, width=470)
+        listbox = Listbox(AlertFrame, font=('Georgia', 11), bg='black', fg='white', bd=0, highlightthickness=0)
+        listbox.place(x=x, y=30, width=455, height=95)
+        v_scroll = Scrollbar(AlertFrame, orient=VERTICAL, command=listbox.yview)
+        v_scroll.place(x=x + 455, y=30, height=95)
+        listbox.config(yscrollcommand=v_scroll.set)
+        return heading, listbox
+
+    expiry_heading, expiry_list = alert_list('Near expiry', 20)
+    stock_heading, stock_list = alert_list('Low stock', 510)
+
+    def show_near_expiry(near_expiry_meds):
+        expiry_heading.config(text=f'Near expiry: {len(near_expiry_meds)} medicines')
+        expiry_list.delete(0, END)
         for med in near_expiry_meds:
-            near_expiry_message += f"Medicine Name: {med[0]}, Expiry Date: {med[1].strftime('%Y-%m-%d')}, Days Remaining: {med[2]}\n"
-        messagebox.showinfo("Near Expiry Medicines", near_expiry_message)
-    
-    # Check low-stock medicines and display in a message box
-    low_stock_meds = call_procedure_check_low_stock(dbms)
-    if low_stock_meds:
-        low_stock_message = "Low Stock Medicines:\n\n"
-        for med in low_stock_meds:
-            low_stock_message += f"Medicine Name: {med[0]}, Quantity: {med[1]}\n"
-        messagebox.showinfo("Low Stock Medicines", low_stock_message)
+            expiry_list.insert(END, f"{med[0]}, expires {med[1].strftime('%Y-%m-%d')} ({med[2]} days)")
 
-    root1.mainloop()
+    def show_low_stock(low_stock_meds):
+        stock_heading.config(text=f'Low stock: {len(low_stock_meds)} medicines')
+        stock_list.delete(0, END)
+        for med in low_stock_meds:
+            stock_list.insert(END, f"{med[0]}, {med[1]} left")
+
+    def alert_failed(heading, title):
+        return lambda e: heading.config(text=f'{title}: check failed ({e})')
+
+    seen_changes = None
+    alert_job = None
+
+    # Both checks run together on worker threads, or come from the cache if they ran recently
+    def refresh_alerts():
+        nonlocal seen_changes
+        seen_changes = alerts.changes
+        checks = alerts.fetch_all()
+        background.watch(root1, BackgroundTask(checks['near_expiry'], owned=False),
+                         on_done=show_near_expiry, on_error=alert_failed(expiry_heading, 'Near expiry'))
+        background.watch(root1, BackgroundTask(checks['low_stock'], owned=False),
+                         on_done=show_low_stock, on_error=alert_failed(stock_heading, 'Low stock'))
+
+    # Alert events arrive on other threads, so the Tk thread checks for new ones while the page is open
+    def watch_alerts():
+        nonlocal alert_job
+        if alerts.changes != seen_changes:
+            refresh_alerts()
+        alert_job = root1.after(ALERT_POLL_MS, watch_alerts)
+
+    def stop_watching_alerts():
+        root1.after_cancel(alert_job)
+
+    # The home page is kept between visits, so the panel is refreshed every time it is shown
+    root1.on_show.append(refresh_alerts)
+    root1.on_show.append(watch_alerts)
+    root1.on_hide.append(stop_watching_alerts)
     
-# Function to call check_near_expiry procedure
-def call_procedure_check_near_expiry(db_manager):
-    try:
-        # Directly use db_manager.cursor without calling it as a function
-        expiry_meds = db_manager.cursor.var(cx_Oracle.CURSOR)  # Define cursor variable
-
-        # Call the procedure with the OUT cursor
-        db_manager.cursor.callproc("check_near_expiry", [expiry_meds])
-
-        # Fetch all rows from the cursor returned by the procedure
-        result_set = expiry_meds.getvalue().fetchall()  # Use getvalue() to retrieve cursor contents
-        return result_set
-    except cx_Oracle.DatabaseError as e:
-        messagebox.showerror("Database Error", str(e))
-        return []
-
-
-# Function to call check_low_stock procedure
-def call_procedure_check_low_stock(db_manager):
-    try:
-        low_stock_meds = db_manager.cursor.var(cx_Oracle.CURSOR)
-        db_manager.cursor.callproc("check_low_stock", [low_stock_meds])
-        return low_stock_meds.getvalue()  # Fetch all rows from the cursor
-    except cx_Oracle.DatabaseError as e:
-        messagebox.showerror("Database Error", str(e))
-        return []
-
 def login():
     # Handles the login button click
     username = username_entry.get()
@@ -3998,8 +6400,7 @@ def login():
     
     if validate_login(username, password):
         messagebox.showinfo("Login Success", "Welcome!")
-        login_window.destroy()  # Close login window on success
-        introscreen()
+        show_screen(introscreen)
     
 def check_password_strength(password):
     # Regular expression to check password strength
@@ -4030,19 +6431,16 @@ def create_account():
     dbms.execute_query("INSERT INTO LOGIN (username, password) VALUES (:1, :2)", (c_username, c_password))
 
     messagebox.showinfo("Account Created", "Your account has been successfully created. Please log in.")
-    create_login_window.destroy()
-    show_login_window()
+    show_screen(show_login_window)
 
 def validate_login(username, password):
     # Validates the username and password with the LOGIN table
     result = dbms.fetch_query("SELECT * FROM LOGIN WHERE username = :1 AND password = :2", (username, password))
     return bool(result)
 
-def show_create_login_window():
-    login_window.destroy()
+def show_create_login_window(create_login_window):
     # Displays the window for creating a new login
-    global create_login_window, c_username_entry, c_password_entry
-    create_login_window = Tk()
+    global c_username_entry, c_password_entry
     create_login_window.title("Create Account")
     create_login_window.geometry("800x300+350+200")
     create_login_window.configure(bg="black")  # Dark background
@@ -4063,10 +6461,9 @@ def show_create_login_window():
     create_account_button = Button(create_login_window, text="Create Account", command=create_account, font=('Georgia', 14, 'bold'), bg="#8ED1FC", fg="black", width=15)
     create_account_button.pack(pady=20)
 
-def show_login_window():
+def show_login_window(login_window):
     # Displays the login window
-    global login_window, username_entry, password_entry
-    login_window = Tk()
+    global username_entry, password_entry
     login_window.title("Pharmacy Management System Login")
     login_window.geometry("800x400+350+200")
     login_window.configure(bg="black")  # Dark background
@@ -4088,9 +6485,28 @@ def show_login_window():
     login_button.place(relx=0.5, rely=0.65, anchor='center')
 
     # Create Account button
-    create_account_button = Button(login_window, text="Create Account", command=show_create_login_window, font=('Georgia', 14, 'bold'), bg="#8ED1FC", fg="black", width=15)
+    create_account_button = Button(login_window, text="Create Account", command=lambda: show_screen(show_create_login_window), font=('Georgia', 14, 'bold'), bg="#8ED1FC", fg="black", width=15)
     create_account_button.place(relx=0.5, rely=0.80, anchor='center')
 
-    login_window.mainloop()
-
-show_login_window()
\ No newline at end of file
+    # The database connects on its own thread; report it here if that fails
+    background.watch(login_window, BackgroundTask(dbms.ready, owned=False))
+
+    # Warm the in-memory indexes and the screen background while staff type their credentials
+    purchases.reconcile()
+    expiry_index.start()
+    background.run(stock_monitor.load)
+    medicine_changes.start()
+    background.run(assets.image, 'bgpic.jpg', (1000, 750))
+    reservations.start()
+
+if __name__ == '__main__':
+    # --rebuild-customer-summary recomputes CUSTOMER_SUMMARY from scratch instead of starting the app
+    if '--rebuild-customer-summary' in sys.argv[1:]:
+        print(f"Rebuilt the summary of {CustomerSummary.rebuild()} customers")
+        dbms.close()
+    else:
+        def login_visible():
+            profiler.mark('login window visible', budget_ms=300)
+            if '--profile-startup' in sys.argv[1:]:
+                dbms.ready.add_done_callback(lambda future: print(profiler.report()))
+        application.run(show_login_window, on_visible=login_visible)
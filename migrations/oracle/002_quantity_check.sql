@@ -0,0 +1,3 @@
+-- Sale item quantities must be positive (ORA-02264 when the constraint already exists)
+ALTER TABLE SALES_ITEMS ADD CONSTRAINT check_sales_item_quantity_positive CHECK (quantity > 0)
+/
@@ -0,0 +1,14 @@
+-- Deducts stock for every sale item and rejects the sale when there is not enough
+CREATE OR REPLACE TRIGGER update_medicine_stock
+AFTER INSERT ON SALES_ITEMS
+FOR EACH ROW
+BEGIN
+    UPDATE MEDICINE
+    SET quantity = quantity - :NEW.quantity
+    WHERE medicine_id = :NEW.medicine_id
+    AND quantity >= :NEW.quantity;
+    IF SQL%ROWCOUNT = 0 THEN
+        RAISE_APPLICATION_ERROR(-20001, 'Insufficient stock in MEDICINE table.');
+    END IF;
+END;
+/
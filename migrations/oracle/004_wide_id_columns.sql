@@ -0,0 +1,13 @@
+-- Widens the ID and foreign key columns so IDs can outgrow three digits; existing IDs are unchanged
+ALTER TABLE SUPPLIER MODIFY (supplier_id VARCHAR2(20))
+/
+ALTER TABLE MEDICINE MODIFY (medicine_id VARCHAR2(20), supplier_id VARCHAR2(20))
+/
+ALTER TABLE CUSTOMER MODIFY (customer_id VARCHAR2(20))
+/
+ALTER TABLE PRESCRIPTION MODIFY (prescription_id VARCHAR2(20), customer_id VARCHAR2(20))
+/
+ALTER TABLE SALES MODIFY (sale_id VARCHAR2(20), customer_id VARCHAR2(20))
+/
+ALTER TABLE SALES_ITEMS MODIFY (sale_item_id VARCHAR2(20), sale_id VARCHAR2(20), medicine_id VARCHAR2(20))
+/
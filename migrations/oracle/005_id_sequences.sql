@@ -0,0 +1,26 @@
+-- Sequences behind the ID allocator, each starting after the table's highest existing ID.
+-- INCREMENT BY must match ID_BLOCK_SIZE in medical_system_v9.py: one NEXTVAL reserves a block.
+DECLARE
+    PROCEDURE create_id_sequence(p_table VARCHAR2, p_column VARCHAR2, p_prefix VARCHAR2) IS
+        v_start NUMBER;
+    BEGIN
+        EXECUTE IMMEDIATE 'SELECT NVL(MAX(TO_NUMBER(SUBSTR(' || p_column || ', ' || (LENGTH(p_prefix) + 1) || '))), 0) + 1'
+            || ' FROM ' || p_table || ' WHERE REGEXP_LIKE(' || p_column || ', ''^' || p_prefix || '[0-9]+$'')'
+            INTO v_start;
+        EXECUTE IMMEDIATE 'CREATE SEQUENCE ' || p_table || '_ID_SEQ START WITH ' || v_start
+            || ' INCREMENT BY 20 NOCACHE';
+    EXCEPTION
+        WHEN OTHERS THEN
+            IF SQLCODE != -955 THEN
+                RAISE;
+            END IF;
+    END;
+BEGIN
+    create_id_sequence('SUPPLIER', 'supplier_id', 'S');
+    create_id_sequence('MEDICINE', 'medicine_id', 'M');
+    create_id_sequence('CUSTOMER', 'customer_id', 'C');
+    create_id_sequence('PRESCRIPTION', 'prescription_id', 'P');
+    create_id_sequence('SALES', 'sale_id', 'S');
+    create_id_sequence('SALES_ITEMS', 'sale_item_id', 'SI');
+END;
+/
@@ -0,0 +1,14 @@
+-- Indexes for the foreign key and date columns the screens and procedures filter on
+-- (ORA-00955/ORA-01408 when the index or an equivalent one already exists)
+CREATE INDEX sales_items_sale_id_idx ON SALES_ITEMS (sale_id)
+/
+CREATE INDEX sales_items_medicine_id_idx ON SALES_ITEMS (medicine_id)
+/
+CREATE INDEX sales_customer_id_idx ON SALES (customer_id)
+/
+CREATE INDEX prescription_customer_id_idx ON PRESCRIPTION (customer_id)
+/
+CREATE INDEX medicine_expiry_date_idx ON MEDICINE (expiry_date)
+/
+CREATE INDEX medicine_quantity_idx ON MEDICINE (quantity)
+/
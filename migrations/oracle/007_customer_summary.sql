@@ -0,0 +1,146 @@
+-- One row per customer with the totals the counter lookup needs, kept current by the triggers
+-- below. CustomerSummary.rebuild() in medical_system_v9.py recomputes it from scratch.
+CREATE TABLE CUSTOMER_SUMMARY (
+customer_id VARCHAR2(20) PRIMARY KEY,
+total_spend DECIMAL(12,2) DEFAULT 0 NOT NULL,
+visit_count INT DEFAULT 0 NOT NULL,
+last_visit DATE,
+last_prescription_id VARCHAR2(20),
+last_prescription_date DATE
+)
+/
+-- Recomputes one customer's row from SALES and PRESCRIPTION, using the customer_id indexes
+CREATE OR REPLACE PROCEDURE refresh_customer_summary(p_customer_id IN VARCHAR2) IS
+BEGIN
+    MERGE INTO CUSTOMER_SUMMARY cs
+    USING (
+        SELECT p_customer_id AS customer_id, s.total_spend, s.visit_count, s.last_visit,
+               p.last_prescription_id, p.last_prescription_date
+        FROM (SELECT NVL(SUM(total_amount), 0) AS total_spend, COUNT(*) AS visit_count, MAX(sale_date) AS last_visit
+              FROM SALES WHERE customer_id = p_customer_id) s,
+             (SELECT MAX(prescription_id) KEEP (DENSE_RANK LAST ORDER BY prescription_date NULLS FIRST, prescription_id) AS last_prescription_id,
+                     MAX(prescription_date) AS last_prescription_date
+              FROM PRESCRIPTION WHERE customer_id = p_customer_id) p
+    ) n
+    ON (cs.customer_id = n.customer_id)
+    WHEN MATCHED THEN UPDATE SET
+        cs.total_spend = n.total_spend, cs.visit_count = n.visit_count, cs.last_visit = n.last_visit,
+        cs.last_prescription_id = n.last_prescription_id, cs.last_prescription_date = n.last_prescription_date
+    WHEN NOT MATCHED THEN INSERT (customer_id, total_spend, visit_count, last_visit, last_prescription_id, last_prescription_date)
+        VALUES (n.customer_id, n.total_spend, n.visit_count, n.last_visit, n.last_prescription_id, n.last_prescription_date);
+END;
+/
+-- New sales add their amount in place. Updates and deletes may move a customer's last visit, so
+-- the customers they touch are recomputed once the statement is done; reading SALES from a row
+-- level trigger would raise ORA-04091.
+CREATE OR REPLACE TRIGGER customer_summary_sales
+FOR INSERT OR UPDATE OR DELETE ON SALES
+COMPOUND TRIGGER
+    TYPE customer_list IS TABLE OF VARCHAR2(20);
+    changed customer_list := customer_list();
+
+    AFTER EACH ROW IS
+    BEGIN
+        IF INSERTING THEN
+            IF :NEW.customer_id IS NOT NULL THEN
+                MERGE INTO CUSTOMER_SUMMARY cs
+                USING (SELECT :NEW.customer_id AS customer_id FROM dual) n
+                ON (cs.customer_id = n.customer_id)
+                WHEN MATCHED THEN UPDATE SET
+                    cs.total_spend = cs.total_spend + :NEW.total_amount,
+                    cs.visit_count = cs.visit_count + 1,
+                    cs.last_visit = GREATEST(NVL(cs.last_visit, :NEW.sale_date), :NEW.sale_date)
+                WHEN NOT MATCHED THEN INSERT (customer_id, total_spend, visit_count, last_visit)
+                    VALUES (:NEW.customer_id, :NEW.total_amount, 1, :NEW.sale_date);
+            END IF;
+        ELSE
+            changed.EXTEND;
+            changed(changed.LAST) := :OLD.customer_id;
+            IF UPDATING THEN
+                changed.EXTEND;
+                changed(changed.LAST) := :NEW.customer_id;
+            END IF;
+        END IF;
+    END AFTER EACH ROW;
+
+    AFTER STATEMENT IS
+    BEGIN
+        FOR i IN 1 .. changed.COUNT LOOP
+            IF changed(i) IS NOT NULL THEN
+                refresh_customer_summary(changed(i));
+            END IF;
+        END LOOP;
+        changed.DELETE;
+    END AFTER STATEMENT;
+END customer_summary_sales;
+/
+CREATE OR REPLACE TRIGGER customer_summary_prescriptions
+FOR INSERT OR UPDATE OR DELETE ON PRESCRIPTION
+COMPOUND TRIGGER
+    TYPE customer_list IS TABLE OF VARCHAR2(20);
+    changed customer_list := customer_list();
+
+    AFTER EACH ROW IS
+    BEGIN
+        IF INSERTING THEN
+            IF :NEW.customer_id IS NOT NULL THEN
+                MERGE INTO CUSTOMER_SUMMARY cs
+                USING (SELECT :NEW.customer_id AS customer_id FROM dual) n
+                ON (cs.customer_id = n.customer_id)
+                WHEN MATCHED THEN UPDATE SET
+                    cs.last_prescription_id = :NEW.prescription_id,
+                    cs.last_prescription_date = :NEW.prescription_date
+                    WHERE cs.last_prescription_id IS NULL
+                       OR NVL(:NEW.prescription_date, DATE '0001-01-01') > NVL(cs.last_prescription_date, DATE '0001-01-01')
+                       OR (NVL(:NEW.prescription_date, DATE '0001-01-01') = NVL(cs.last_prescription_date, DATE '0001-01-01')
+                           AND :NEW.prescription_id > cs.last_prescription_id)
+                WHEN NOT MATCHED THEN INSERT (customer_id, last_prescription_id, last_prescription_date)
+                    VALUES (:NEW.customer_id, :NEW.prescription_id, :NEW.prescription_date);
+            END IF;
+        ELSE
+            changed.EXTEND;
+            changed(changed.LAST) := :OLD.customer_id;
+            IF UPDATING THEN
+                changed.EXTEND;
+                changed(changed.LAST) := :NEW.customer_id;
+            END IF;
+        END IF;
+    END AFTER EACH ROW;
+
+    AFTER STATEMENT IS
+    BEGIN
+        FOR i IN 1 .. changed.COUNT LOOP
+            IF changed(i) IS NOT NULL THEN
+                refresh_customer_summary(changed(i));
+            END IF;
+        END LOOP;
+        changed.DELETE;
+    END AFTER STATEMENT;
+END customer_summary_prescriptions;
+/
+CREATE OR REPLACE TRIGGER customer_summary_customers
+AFTER INSERT OR DELETE ON CUSTOMER
+FOR EACH ROW
+BEGIN
+    IF INSERTING THEN
+        MERGE INTO CUSTOMER_SUMMARY cs
+        USING (SELECT :NEW.customer_id AS customer_id FROM dual) n
+        ON (cs.customer_id = n.customer_id)
+        WHEN NOT MATCHED THEN INSERT (customer_id) VALUES (n.customer_id);
+    ELSE
+        DELETE FROM CUSTOMER_SUMMARY WHERE customer_id = :OLD.customer_id;
+    END IF;
+END;
+/
+-- Initial contents, the same statement CustomerSummary.rebuild() runs
+INSERT INTO CUSTOMER_SUMMARY (customer_id, total_spend, visit_count, last_visit, last_prescription_id, last_prescription_date)
+SELECT C.customer_id, COALESCE(S.total_spend, 0), COALESCE(S.visit_count, 0), S.last_visit,
+       P.prescription_id, P.prescription_date
+FROM CUSTOMER C
+LEFT JOIN (SELECT customer_id, SUM(total_amount) AS total_spend, COUNT(*) AS visit_count, MAX(sale_date) AS last_visit
+           FROM SALES GROUP BY customer_id) S ON S.customer_id = C.customer_id
+LEFT JOIN (SELECT customer_id, prescription_id, prescription_date,
+                  ROW_NUMBER() OVER (PARTITION BY customer_id
+                                     ORDER BY prescription_date DESC NULLS LAST, prescription_id DESC) AS position
+           FROM PRESCRIPTION) P ON P.customer_id = C.customer_id AND P.position = 1
+/
@@ -0,0 +1,18 @@
+-- StockEngine deducts whole batches with one UPDATE per medicine and marks its session with
+-- CLIENT_INFO 'stock_engine' meanwhile, so the row-level trigger stands aside for those inserts
+CREATE OR REPLACE TRIGGER update_medicine_stock
+AFTER INSERT ON SALES_ITEMS
+FOR EACH ROW
+BEGIN
+    IF SYS_CONTEXT('USERENV', 'CLIENT_INFO') = 'stock_engine' THEN
+        RETURN;
+    END IF;
+    UPDATE MEDICINE
+    SET quantity = quantity - :NEW.quantity
+    WHERE medicine_id = :NEW.medicine_id
+    AND quantity >= :NEW.quantity;
+    IF SQL%ROWCOUNT = 0 THEN
+        RAISE_APPLICATION_ERROR(-20001, 'Insufficient stock in MEDICINE table.');
+    END IF;
+END;
+/
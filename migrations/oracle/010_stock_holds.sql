@@ -0,0 +1,35 @@
+-- Short-lived holds on MEDICINE stock while a basket is open, and a version number that every
+-- stock change bumps so reservations can detect a concurrent change instead of locking the row.
+-- expires_at is in epoch seconds.
+ALTER TABLE MEDICINE ADD (version INT DEFAULT 0 NOT NULL)
+/
+CREATE TABLE STOCK_HOLD (
+hold_id VARCHAR2(40) PRIMARY KEY,
+terminal_id VARCHAR2(100) NOT NULL,
+medicine_id VARCHAR2(20) NOT NULL,
+quantity INT NOT NULL,
+expires_at NUMBER NOT NULL,
+FOREIGN KEY (medicine_id) REFERENCES MEDICINE(medicine_id) ON DELETE CASCADE
+)
+/
+CREATE INDEX stock_hold_medicine_id_idx ON STOCK_HOLD (medicine_id, expires_at)
+/
+CREATE INDEX stock_hold_expires_at_idx ON STOCK_HOLD (expires_at)
+/
+CREATE OR REPLACE TRIGGER update_medicine_stock
+AFTER INSERT ON SALES_ITEMS
+FOR EACH ROW
+BEGIN
+    IF SYS_CONTEXT('USERENV', 'CLIENT_INFO') = 'stock_engine' THEN
+        RETURN;
+    END IF;
+    UPDATE MEDICINE
+    SET quantity = quantity - :NEW.quantity,
+        version = version + 1
+    WHERE medicine_id = :NEW.medicine_id
+    AND quantity >= :NEW.quantity;
+    IF SQL%ROWCOUNT = 0 THEN
+        RAISE_APPLICATION_ERROR(-20001, 'Insufficient stock in MEDICINE table.');
+    END IF;
+END;
+/
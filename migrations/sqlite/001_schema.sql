@@ -0,0 +1,66 @@
+-- Tables from Medical_Management_System.sql. Statements are separated by lines holding only "/".
+CREATE TABLE IF NOT EXISTS SUPPLIER(
+supplier_id VARCHAR2(10) PRIMARY KEY,
+s_name VARCHAR2(50) NOT NULL,
+contact_number INT,
+email VARCHAR2(100),
+address VARCHAR2(150)
+)
+/
+CREATE TABLE IF NOT EXISTS MEDICINE(
+medicine_id VARCHAR2(10) PRIMARY KEY,
+m_name VARCHAR2(20) NOT NULL,
+brand VARCHAR2(20),
+batch_number VARCHAR2(10),
+expiry_date DATE,
+quantity INT DEFAULT 0,
+price DECIMAL(10,2) NOT NULL,
+supplier_id VARCHAR2(10),
+FOREIGN KEY (supplier_id) REFERENCES SUPPLIER(supplier_id)
+)
+/
+CREATE TABLE IF NOT EXISTS CUSTOMER(
+customer_id VARCHAR2(10) PRIMARY KEY,
+c_name VARCHAR2(30) NOT NULL,
+contact_number INT,
+email VARCHAR2(40),
+address VARCHAR2(50)
+)
+/
+CREATE TABLE IF NOT EXISTS PRESCRIPTION(
+prescription_id VARCHAR2(15) PRIMARY KEY,
+customer_id VARCHAR2(10),
+doctor_name VARCHAR2(25),
+prescription_date DATE,
+dosage VARCHAR2(30),
+frequency VARCHAR2(40),
+duration VARCHAR2(10),
+additional_instructions VARCHAR2(75),
+FOREIGN KEY (customer_id) REFERENCES CUSTOMER(customer_id)
+)
+/
+CREATE TABLE IF NOT EXISTS SALES(
+sale_id VARCHAR2(10) PRIMARY KEY,
+customer_id VARCHAR2(10),
+sale_date DATE NOT NULL,
+total_amount DECIMAL(10,2) NOT NULL,
+payment_method VARCHAR2(20),
+FOREIGN KEY (customer_id) REFERENCES CUSTOMER(customer_id)
+)
+/
+CREATE TABLE IF NOT EXISTS SALES_ITEMS (
+sale_item_id VARCHAR2(10) PRIMARY KEY,
+sale_id VARCHAR2(10),
+medicine_id VARCHAR2(10),
+quantity INT DEFAULT 1,
+price_per_unit DECIMAL(10, 2),
+subtotal DECIMAL(10,2),
+FOREIGN KEY (sale_id) REFERENCES SALES(sale_id),
+FOREIGN KEY (medicine_id) REFERENCES MEDICINE(medicine_id)
+)
+/
+CREATE TABLE IF NOT EXISTS LOGIN (
+username VARCHAR2(30) PRIMARY KEY,
+password VARCHAR2(50) NOT NULL
+)
+/
@@ -0,0 +1,8 @@
+-- SQLite cannot add a CHECK constraint to an existing table, so a trigger raises the Oracle error instead
+CREATE TRIGGER IF NOT EXISTS check_sales_item_quantity_positive
+BEFORE INSERT ON SALES_ITEMS
+FOR EACH ROW WHEN NEW.quantity <= 0
+BEGIN
+    SELECT RAISE(ABORT, 'ORA-02290: check constraint (CHECK_SALES_ITEM_QUANTITY_POSITIVE) violated');
+END;
+/
@@ -0,0 +1,13 @@
+-- Deducts stock for every sale item and rejects the sale when there is not enough
+CREATE TRIGGER IF NOT EXISTS update_medicine_stock
+AFTER INSERT ON SALES_ITEMS
+FOR EACH ROW
+BEGIN
+    SELECT RAISE(ABORT, 'ORA-20001: Insufficient stock in MEDICINE table.')
+    WHERE NOT EXISTS (SELECT 1 FROM MEDICINE
+                      WHERE medicine_id = NEW.medicine_id AND quantity >= NEW.quantity);
+    UPDATE MEDICINE
+    SET quantity = quantity - NEW.quantity
+    WHERE medicine_id = NEW.medicine_id;
+END;
+/
@@ -0,0 +1,2 @@
+-- SQLite does not enforce VARCHAR2 lengths, so the ID columns need no widening. The script is kept
+-- so each version number means the same schema on both backends.
@@ -0,0 +1,6 @@
+-- Stands in for Oracle sequences; each row is created on the first reservation, after any seed data
+CREATE TABLE IF NOT EXISTS ID_SEQUENCES (
+name TEXT PRIMARY KEY,
+next_value INTEGER NOT NULL
+)
+/
@@ -0,0 +1,13 @@
+-- Indexes for the foreign key and date columns the screens and procedures filter on
+CREATE INDEX IF NOT EXISTS sales_items_sale_id_idx ON SALES_ITEMS (sale_id)
+/
+CREATE INDEX IF NOT EXISTS sales_items_medicine_id_idx ON SALES_ITEMS (medicine_id)
+/
+CREATE INDEX IF NOT EXISTS sales_customer_id_idx ON SALES (customer_id)
+/
+CREATE INDEX IF NOT EXISTS prescription_customer_id_idx ON PRESCRIPTION (customer_id)
+/
+CREATE INDEX IF NOT EXISTS medicine_expiry_date_idx ON MEDICINE (expiry_date)
+/
+CREATE INDEX IF NOT EXISTS medicine_quantity_idx ON MEDICINE (quantity)
+/
@@ -0,0 +1,112 @@
+-- One row per customer with the totals the counter lookup needs, kept current by the triggers
+-- below. CustomerSummary.rebuild() in medical_system_v9.py recomputes it from scratch.
+CREATE TABLE IF NOT EXISTS CUSTOMER_SUMMARY (
+customer_id VARCHAR2(20) PRIMARY KEY,
+total_spend DECIMAL(12,2) DEFAULT 0 NOT NULL,
+visit_count INT DEFAULT 0 NOT NULL,
+last_visit DATE,
+last_prescription_id VARCHAR2(20),
+last_prescription_date DATE
+)
+/
+-- New sales add their amount in place
+CREATE TRIGGER IF NOT EXISTS customer_summary_sale_insert
+AFTER INSERT ON SALES
+FOR EACH ROW WHEN NEW.customer_id IS NOT NULL
+BEGIN
+    INSERT OR IGNORE INTO CUSTOMER_SUMMARY (customer_id) VALUES (NEW.customer_id);
+    UPDATE CUSTOMER_SUMMARY
+    SET total_spend = total_spend + COALESCE(NEW.total_amount, 0),
+        visit_count = visit_count + 1,
+        last_visit = MAX(COALESCE(last_visit, NEW.sale_date), NEW.sale_date)
+    WHERE customer_id = NEW.customer_id;
+END;
+/
+-- Updates and deletes may move the last visit, so the customers they touch are recomputed
+CREATE TRIGGER IF NOT EXISTS customer_summary_sale_delete
+AFTER DELETE ON SALES
+FOR EACH ROW WHEN OLD.customer_id IS NOT NULL
+BEGIN
+    UPDATE CUSTOMER_SUMMARY
+    SET (total_spend, visit_count, last_visit) =
+        (SELECT COALESCE(SUM(total_amount), 0), COUNT(*), MAX(sale_date) FROM SALES WHERE customer_id = OLD.customer_id)
+    WHERE customer_id = OLD.customer_id;
+END;
+/
+CREATE TRIGGER IF NOT EXISTS customer_summary_sale_update
+AFTER UPDATE OF customer_id, sale_date, total_amount ON SALES
+FOR EACH ROW
+BEGIN
+    INSERT OR IGNORE INTO CUSTOMER_SUMMARY (customer_id) SELECT NEW.customer_id WHERE NEW.customer_id IS NOT NULL;
+    UPDATE CUSTOMER_SUMMARY
+    SET (total_spend, visit_count, last_visit) =
+        (SELECT COALESCE(SUM(total_amount), 0), COUNT(*), MAX(sale_date) FROM SALES
+         WHERE SALES.customer_id = CUSTOMER_SUMMARY.customer_id)
+    WHERE customer_id IN (OLD.customer_id, NEW.customer_id);
+END;
+/
+CREATE TRIGGER IF NOT EXISTS customer_summary_prescription_insert
+AFTER INSERT ON PRESCRIPTION
+FOR EACH ROW WHEN NEW.customer_id IS NOT NULL
+BEGIN
+    INSERT OR IGNORE INTO CUSTOMER_SUMMARY (customer_id) VALUES (NEW.customer_id);
+    UPDATE CUSTOMER_SUMMARY
+    SET last_prescription_id = NEW.prescription_id,
+        last_prescription_date = NEW.prescription_date
+    WHERE customer_id = NEW.customer_id
+      AND (last_prescription_id IS NULL
+           OR COALESCE(NEW.prescription_date, '') > COALESCE(last_prescription_date, '')
+           OR (COALESCE(NEW.prescription_date, '') = COALESCE(last_prescription_date, '')
+               AND NEW.prescription_id > last_prescription_id));
+END;
+/
+CREATE TRIGGER IF NOT EXISTS customer_summary_prescription_delete
+AFTER DELETE ON PRESCRIPTION
+FOR EACH ROW WHEN OLD.customer_id IS NOT NULL
+BEGIN
+    UPDATE CUSTOMER_SUMMARY
+    SET (last_prescription_id, last_prescription_date) =
+        (SELECT prescription_id, prescription_date FROM PRESCRIPTION WHERE customer_id = OLD.customer_id
+         ORDER BY prescription_date DESC NULLS LAST, prescription_id DESC LIMIT 1)
+    WHERE customer_id = OLD.customer_id;
+END;
+/
+CREATE TRIGGER IF NOT EXISTS customer_summary_prescription_update
+AFTER UPDATE OF customer_id, prescription_id, prescription_date ON PRESCRIPTION
+FOR EACH ROW
+BEGIN
+    INSERT OR IGNORE INTO CUSTOMER_SUMMARY (customer_id) SELECT NEW.customer_id WHERE NEW.customer_id IS NOT NULL;
+    UPDATE CUSTOMER_SUMMARY
+    SET (last_prescription_id, last_prescription_date) =
+        (SELECT prescription_id, prescription_date FROM PRESCRIPTION
+         WHERE PRESCRIPTION.customer_id = CUSTOMER_SUMMARY.customer_id
+         ORDER BY prescription_date DESC NULLS LAST, prescription_id DESC LIMIT 1)
+    WHERE customer_id IN (OLD.customer_id, NEW.customer_id);
+END;
+/
+CREATE TRIGGER IF NOT EXISTS customer_summary_customer_insert
+AFTER INSERT ON CUSTOMER
+FOR EACH ROW
+BEGIN
+    INSERT OR IGNORE INTO CUSTOMER_SUMMARY (customer_id) VALUES (NEW.customer_id);
+END;
+/
+CREATE TRIGGER IF NOT EXISTS customer_summary_customer_delete
+AFTER DELETE ON CUSTOMER
+FOR EACH ROW
+BEGIN
+    DELETE FROM CUSTOMER_SUMMARY WHERE customer_id = OLD.customer_id;
+END;
+/
+-- Initial contents, the same statement CustomerSummary.rebuild() runs
+INSERT OR IGNORE INTO CUSTOMER_SUMMARY (customer_id, total_spend, visit_count, last_visit, last_prescription_id, last_prescription_date)
+SELECT C.customer_id, COALESCE(S.total_spend, 0), COALESCE(S.visit_count, 0), S.last_visit,
+       P.prescription_id, P.prescription_date
+FROM CUSTOMER C
+LEFT JOIN (SELECT customer_id, SUM(total_amount) AS total_spend, COUNT(*) AS visit_count, MAX(sale_date) AS last_visit
+           FROM SALES GROUP BY customer_id) S ON S.customer_id = C.customer_id
+LEFT JOIN (SELECT customer_id, prescription_id, prescription_date,
+                  ROW_NUMBER() OVER (PARTITION BY customer_id
+                                     ORDER BY prescription_date DESC NULLS LAST, prescription_id DESC) AS position
+           FROM PRESCRIPTION) P ON P.customer_id = C.customer_id AND P.position = 1
+/
@@ -0,0 +1,3 @@
+-- Per-medicine reorder threshold for the stock monitor; NULL means the default of 50 units
+ALTER TABLE MEDICINE ADD COLUMN reorder_level INT
+/
@@ -0,0 +1,16 @@
+-- StockEngine deducts whole batches with one UPDATE per medicine and switches the
+-- stock_trigger_enabled() function off meanwhile, so the row-level trigger stands aside
+DROP TRIGGER IF EXISTS update_medicine_stock
+/
+CREATE TRIGGER update_medicine_stock
+AFTER INSERT ON SALES_ITEMS
+FOR EACH ROW WHEN stock_trigger_enabled()
+BEGIN
+    SELECT RAISE(ABORT, 'ORA-20001: Insufficient stock in MEDICINE table.')
+    WHERE NOT EXISTS (SELECT 1 FROM MEDICINE
+                      WHERE medicine_id = NEW.medicine_id AND quantity >= NEW.quantity);
+    UPDATE MEDICINE
+    SET quantity = quantity - NEW.quantity
+    WHERE medicine_id = NEW.medicine_id;
+END;
+/
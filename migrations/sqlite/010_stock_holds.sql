@@ -0,0 +1,33 @@
+-- Short-lived holds on MEDICINE stock while a basket is open, and a version number that every
+-- stock change bumps so reservations can detect a concurrent change instead of locking the row.
+-- expires_at is in epoch seconds.
+ALTER TABLE MEDICINE ADD COLUMN version INT NOT NULL DEFAULT 0
+/
+CREATE TABLE IF NOT EXISTS STOCK_HOLD (
+hold_id VARCHAR2(40) PRIMARY KEY,
+terminal_id VARCHAR2(100) NOT NULL,
+medicine_id VARCHAR2(20) NOT NULL,
+quantity INT NOT NULL,
+expires_at NUMBER NOT NULL,
+FOREIGN KEY (medicine_id) REFERENCES MEDICINE(medicine_id) ON DELETE CASCADE
+)
+/
+CREATE INDEX IF NOT EXISTS stock_hold_medicine_id_idx ON STOCK_HOLD (medicine_id, expires_at)
+/
+CREATE INDEX IF NOT EXISTS stock_hold_expires_at_idx ON STOCK_HOLD (expires_at)
+/
+DROP TRIGGER IF EXISTS update_medicine_stock
+/
+CREATE TRIGGER update_medicine_stock
+AFTER INSERT ON SALES_ITEMS
+FOR EACH ROW WHEN stock_trigger_enabled()
+BEGIN
+    SELECT RAISE(ABORT, 'ORA-20001: Insufficient stock in MEDICINE table.')
+    WHERE NOT EXISTS (SELECT 1 FROM MEDICINE
+                      WHERE medicine_id = NEW.medicine_id AND quantity >= NEW.quantity);
+    UPDATE MEDICINE
+    SET quantity = quantity - NEW.quantity,
+        version = version + 1
+    WHERE medicine_id = NEW.medicine_id;
+END;
+/
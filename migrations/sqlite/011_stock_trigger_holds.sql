@@ -0,0 +1,20 @@
+-- Sale items may only use stock that no open basket holds: live STOCK_HOLD rows (expires_at in
+-- epoch seconds still ahead) are subtracted before the quantity check
+DROP TRIGGER IF EXISTS update_medicine_stock
+/
+CREATE TRIGGER update_medicine_stock
+AFTER INSERT ON SALES_ITEMS
+FOR EACH ROW WHEN stock_trigger_enabled()
+BEGIN
+    SELECT RAISE(ABORT, 'ORA-20001: Insufficient stock in MEDICINE table.')
+    WHERE NOT EXISTS (SELECT 1 FROM MEDICINE
+                      WHERE medicine_id = NEW.medicine_id
+                      AND quantity - (SELECT COALESCE(SUM(h.quantity), 0) FROM STOCK_HOLD h
+                                      WHERE h.medicine_id = NEW.medicine_id
+                                      AND h.expires_at > CAST(strftime('%s', 'now') AS INTEGER)) >= NEW.quantity);
+    UPDATE MEDICINE
+    SET quantity = quantity - NEW.quantity,
+        version = version + 1
+    WHERE medicine_id = NEW.medicine_id;
+END;
+/
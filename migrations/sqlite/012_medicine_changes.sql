@@ -0,0 +1,42 @@
+-- Every MEDICINE insert and stock or detail update stamps version from one table-wide counter, and a
+-- delete leaves a MEDICINE_TOMBSTONE row stamped the same way. Terminals then read only the rows
+-- changed since their previous poll (version > :last) instead of the whole table. The counter starts
+-- above every version already stored; a stamp still changes on every write, which is all the stock
+-- reservations compare.
+INSERT OR IGNORE INTO ID_SEQUENCES (name, next_value)
+SELECT 'MEDICINE_VERSION_SEQ', COALESCE(MAX(version), 0) + 1 FROM MEDICINE
+/
+CREATE TABLE IF NOT EXISTS MEDICINE_TOMBSTONE (
+medicine_id VARCHAR2(20) PRIMARY KEY,
+version INT NOT NULL
+)
+/
+CREATE INDEX IF NOT EXISTS medicine_version_idx ON MEDICINE (version)
+/
+CREATE INDEX IF NOT EXISTS medicine_tombstone_version_idx ON MEDICINE_TOMBSTONE (version)
+/
+-- The stamping UPDATEs only set version, so they fire neither trigger again
+CREATE TRIGGER IF NOT EXISTS medicine_version_insert
+AFTER INSERT ON MEDICINE
+BEGIN
+    UPDATE MEDICINE SET version = (SELECT next_value FROM ID_SEQUENCES WHERE name = 'MEDICINE_VERSION_SEQ')
+    WHERE medicine_id = NEW.medicine_id;
+    UPDATE ID_SEQUENCES SET next_value = next_value + 1 WHERE name = 'MEDICINE_VERSION_SEQ';
+END;
+/
+CREATE TRIGGER IF NOT EXISTS medicine_version_update
+AFTER UPDATE OF medicine_id, m_name, brand, batch_number, expiry_date, quantity, price, supplier_id, reorder_level ON MEDICINE
+BEGIN
+    UPDATE MEDICINE SET version = (SELECT next_value FROM ID_SEQUENCES WHERE name = 'MEDICINE_VERSION_SEQ')
+    WHERE medicine_id = NEW.medicine_id;
+    UPDATE ID_SEQUENCES SET next_value = next_value + 1 WHERE name = 'MEDICINE_VERSION_SEQ';
+END;
+/
+CREATE TRIGGER IF NOT EXISTS medicine_tombstone
+AFTER DELETE ON MEDICINE
+BEGIN
+    INSERT OR REPLACE INTO MEDICINE_TOMBSTONE (medicine_id, version)
+    SELECT OLD.medicine_id, next_value FROM ID_SEQUENCES WHERE name = 'MEDICINE_VERSION_SEQ';
+    UPDATE ID_SEQUENCES SET next_value = next_value + 1 WHERE name = 'MEDICINE_VERSION_SEQ';
+END;
+/
@@ -0,0 +1,75 @@
+# bulk_insert reports every failing row with its own message and still writes the rest of the batch.
+# Runs on the embedded SQLite backend:  python -m unittest discover tests
+import os
+import sys
+import unittest
+
+os.environ['MEDICAL_DB_BACKEND'] = 'sqlite'
+os.environ.pop('MEDICAL_DB_PATH', None)
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import medical_system_v9 as app
+
+MEDICINE = 'M005'
+
+class BulkInsertTest(unittest.TestCase):
+    def setUp(self):
+        self.published = []
+        app.events.subscribe('CUSTOMER', lambda action, row: self.published.append(row['customer_id']))
+        self.created = []
+
+    def tearDown(self):
+        for customer_id in self.created:
+            app.dbms.execute_query("DELETE FROM CUSTOMER WHERE customer_id = :1", (customer_id,))
+
+    def customer(self, customer_id=None, name='Asha'):
+        customer_id = customer_id or app.id_allocator['CUSTOMER'].next()
+        self.created.append(customer_id)
+        return app.CustomerInsert(customer_id, name, 9876543210, 'asha@gmail.com', 'Chennai')
+
+    def exists(self, customer_id):
+        return bool(app.dbms.fetch_query("SELECT 1 FROM CUSTOMER WHERE customer_id = :1", (customer_id,)))
+
+    def test_each_failing_row_is_reported(self):
+        good, unnamed, bad_id = self.customer(), self.customer(name=''), self.customer(customer_id='X1')
+        duplicate, later = self.customer(customer_id=good.customer_id), self.customer()
+        result = app.bulk_insert([good, unnamed, bad_id, duplicate, later])
+        self.assertFalse(result.ok)
+        self.assertEqual(result.inserted, [good, later])
+        errors = dict(result.errors)
+        self.assertEqual(list(errors), [unnamed, bad_id, duplicate])
+        self.assertEqual(errors[unnamed], 'All fields are required.')
+        self.assertIn('Invalid Customer ID format', errors[bad_id])
+        self.assertIn('UNIQUE', errors[duplicate])
+        self.assertTrue(self.exists(good.customer_id) and self.exists(later.customer_id))
+        self.assertEqual(self.published, [good.customer_id, later.customer_id])
+
+    def test_validation_exceptions_are_reported(self):
+        item = app.SalesItemInsert('SI990', 'S001', MEDICINE, 1, 1.0)
+        item.quantity = None  # None <= 0 raises TypeError
+        result = app.bulk_insert([item])
+        self.assertEqual(result.inserted, [])
+        self.assertEqual(len(result.errors), 1)
+
+    def test_short_stock_lines_fail_alone(self):
+        app.dbms.execute_query("DELETE FROM STOCK_HOLD")
+        for engine in (True, False):
+            with self.subTest(stock_engine=engine):
+                enabled, app.stock_engine.enabled = app.stock_engine.enabled, engine
+                try:
+                    app.dbms.execute_query("UPDATE MEDICINE SET quantity = 3 WHERE medicine_id = :1", (MEDICINE,))
+                    sale_id = app.id_allocator['SALES'].next()
+                    app.dbms.execute_query("INSERT INTO SALES (sale_id, customer_id, sale_date, total_amount, payment_method) "
+                                           "VALUES (:1, 'C001', TO_DATE('2024-11-01', 'YYYY-MM-DD'), 0, 'Cash')", (sale_id,))
+                    items = [app.SalesItemInsert(app.id_allocator['SALES_ITEMS'].next(), sale_id, medicine_id, quantity, 10.0)
+                             for medicine_id, quantity in ((MEDICINE, 9), ('M001', 1))]
+                    app.dbms.execute_query("UPDATE MEDICINE SET quantity = 10 WHERE medicine_id = 'M001'")
+                    result = app.bulk_insert(items)
+                    self.assertEqual(result.inserted, [items[1]])
+                    self.assertEqual([obj for obj, error in result.errors], [items[0]])
+                    self.assertEqual(app.dbms.fetch_query("SELECT quantity FROM MEDICINE WHERE medicine_id = :1", (MEDICINE,))[0][0], 3)
+                finally:
+                    app.stock_engine.enabled = enabled
+
+if __name__ == '__main__':
+    unittest.main()
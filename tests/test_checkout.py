@@ -0,0 +1,54 @@
+# checkout() reports every problem with a basket at once and accepts fully discounted sales.
+# Runs on the embedded SQLite backend:  python -m unittest discover tests
+import os
+import sys
+import unittest
+
+os.environ['MEDICAL_DB_BACKEND'] = 'sqlite'
+os.environ.pop('MEDICAL_DB_PATH', None)
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import medical_system_v9 as app
+
+MEDICINE = 'M005'
+
+class CheckoutTest(unittest.TestCase):
+    def setUp(self):
+        app.dbms.execute_query("DELETE FROM STOCK_HOLD")
+        app.dbms.execute_query("UPDATE MEDICINE SET quantity = 5 WHERE medicine_id = :1", (MEDICINE,))
+
+    def stock(self):
+        return app.dbms.fetch_query("SELECT quantity FROM MEDICINE WHERE medicine_id = :1", (MEDICINE,))[0][0]
+
+    def test_every_problem_is_listed(self):
+        items = [(MEDICINE, True), (MEDICINE, 0), ('M999', 1), (MEDICINE, 9)]
+        with self.assertRaises(app.CheckoutError) as raised:
+            app.checkout('C999', items, 'Cheque')
+        problems = raised.exception.problems
+        self.assertEqual(len(problems), 6, problems)
+        self.assertEqual(sum('quantity must be a positive whole number' in problem for problem in problems), 2)
+        for expected in ("Invalid payment method 'Cheque'", 'Customer ID C999 does not exist',
+                         'Medicine ID M999 does not exist', f'Insufficient stock for {MEDICINE}: 9 requested'):
+            self.assertTrue(any(expected in problem for problem in problems), expected)
+        self.assertEqual(self.stock(), 5)
+
+    def test_empty_basket(self):
+        with self.assertRaises(app.CheckoutError) as raised:
+            app.checkout('C001', [], 'Cash')
+        self.assertEqual(raised.exception.problems, ['The basket is empty.'])
+
+    def test_fully_discounted_sale_is_accepted(self):
+        receipt = app.checkout('C001', [(MEDICINE, 2)], 'Cash', discount=app.DiscountEngine([app.DiscountRule('Free', 100)]))
+        self.assertEqual(receipt.total, 0)
+        self.assertEqual(self.stock(), 3)
+        self.assertEqual(app.dbms.fetch_query("SELECT total_amount FROM SALES WHERE sale_id = :1", (receipt.sale_id,))[0][0], 0)
+
+    def test_sale_total_validation(self):
+        for total, valid in ((0, True), (0.0, True), ('12.50', True), (-1, False), (True, False), ('abc', False)):
+            with self.subTest(total=total):
+                sale = app.SalesInsert('S001', 'C001', '01-Nov-24', total, 'Cash')
+                sale.interactive = False
+                self.assertEqual(sale.validate(), valid)
+
+if __name__ == '__main__':
+    unittest.main()
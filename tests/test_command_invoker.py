@@ -0,0 +1,88 @@
+# A transactional CommandInvoker commits every queued command or none of them, and never
+# shows a dialog while its transaction is open.
+# Runs on the embedded SQLite backend:  python -m unittest discover tests
+import os
+import sys
+import unittest
+
+os.environ['MEDICAL_DB_BACKEND'] = 'sqlite'
+os.environ.pop('MEDICAL_DB_PATH', None)
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import medical_system_v9 as app
+
+# Fails with a database error the first `failures` times it runs, then inserts a supplier
+class FlakyCommand(app.Command):
+    def __init__(self, supplier, failures):
+        self.supplier = supplier
+        self.failures = failures
+        self.attempts = 0
+
+    def execute(self):
+        self.attempts += 1
+        if self.attempts <= self.failures:
+            app.dbms.execute_query("INSERT INTO SUPPLIER (supplier_id) VALUES (NULL)")
+        return self.supplier.perform_insert()
+
+class TransactionalInvokerTest(unittest.TestCase):
+    def setUp(self):
+        self.dialogs = []
+        self.showerror = app.messagebox.showerror
+        app.messagebox.showerror = lambda title, message: self.dialogs.append((message, app.dbms.in_transaction()))
+        self.created = []
+
+    def tearDown(self):
+        app.messagebox.showerror = self.showerror
+        for supplier_id in self.created:
+            app.dbms.execute_query("DELETE FROM SUPPLIER WHERE supplier_id = :1", (supplier_id,))
+
+    def supplier(self, name='Acme Pharma'):
+        supplier_id = app.id_allocator['SUPPLIER'].next()
+        self.created.append(supplier_id)
+        return app.SupplierInsert(supplier_id, name, '9876543210', 'acme@example.com', '1 Main St')
+
+    def exists(self, insert):
+        return bool(app.dbms.fetch_query("SELECT 1 FROM SUPPLIER WHERE supplier_id = :1", (insert.supplier_id,)))
+
+    def invoker(self, *commands, retries=0):
+        invoker = app.CommandInvoker(transactional=True, retries=retries)
+        for command in commands:
+            invoker.add_command(command)
+        return invoker
+
+    def test_validation_errors_are_collected_before_the_transaction(self):
+        good, bad, worse = self.supplier(), self.supplier(name=''), self.supplier(name='')
+        invoker = self.invoker(*(app.InsertCommand(insert) for insert in (good, bad, worse)))
+        with self.assertRaises(app.CommandError) as raised:
+            invoker.execute_commands()
+        self.assertEqual(raised.exception.messages, ['All fields are required.'] * 2)
+        self.assertEqual(self.dialogs, [('All fields are required.', False)] * 2)
+        self.assertFalse(self.exists(good))
+
+    def test_database_error_rolls_back_every_command(self):
+        first, second = self.supplier(), self.supplier()
+        second.supplier_id = first.supplier_id  # Duplicate key fails inside the transaction
+        invoker = self.invoker(app.InsertCommand(first), app.InsertCommand(second))
+        with self.assertRaises(app.DATABASE_ERRORS):
+            invoker.execute_commands()
+        self.assertFalse(self.exists(first))
+        self.assertEqual(len(self.dialogs), 1)
+        self.assertFalse(self.dialogs[0][1])  # Shown after the rollback
+
+    def test_retry_resumes_from_the_failing_command(self):
+        first, flaky = app.InsertCommand(self.supplier()), FlakyCommand(self.supplier(), failures=1)
+        self.assertTrue(self.invoker(first, flaky, retries=1).execute_commands())
+        self.assertEqual(flaky.attempts, 2)
+        self.assertTrue(self.exists(first.insert_obj))
+        self.assertTrue(self.exists(flaky.supplier))
+        self.assertEqual(self.dialogs, [])
+
+    def test_out_of_retries_rolls_back(self):
+        first, flaky = app.InsertCommand(self.supplier()), FlakyCommand(self.supplier(), failures=2)
+        with self.assertRaises(app.DATABASE_ERRORS):
+            self.invoker(first, flaky, retries=1).execute_commands()
+        self.assertFalse(self.exists(first.insert_obj))
+        self.assertFalse(self.exists(flaky.supplier))
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,64 @@
+# DiscountEngine stacks rules by priority, scope, quantity break, date window and customer segment.
+# Runs on the embedded SQLite backend:  python -m unittest discover tests
+import os
+import sys
+import unittest
+from datetime import date, timedelta
+
+os.environ['MEDICAL_DB_BACKEND'] = 'sqlite'
+os.environ.pop('MEDICAL_DB_PATH', None)
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import medical_system_v9 as app
+
+TODAY = date(2024, 11, 1)
+
+class DiscountEngineTest(unittest.TestCase):
+    def setUp(self):
+        # Listed out of priority order on purpose
+        self.engine = app.DiscountEngine([
+            app.DiscountRule('Base', 20),
+            app.DiscountRule('Bulk', 5, min_quantity=10, priority=1, stackable=True),
+            app.DiscountRule('Exclusive', 50, medicine_ids=['M100'], priority=5),
+            app.DiscountRule('Brand', 10, brands=['Acme'], priority=2, stackable=True),
+        ])
+
+    def price(self, *lines, engine=None, **kwargs):
+        return (engine or self.engine).price_lines(list(lines), on=TODAY, **kwargs)
+
+    def test_rules_stack_by_priority_until_one_does_not_stack(self):
+        self.assertEqual(self.price(('M001', 'Other', 1, 100.0)), [80.0])  # Base only
+        self.assertEqual(self.price(('M002', 'Acme', 1, 100.0)), [72.0])  # Brand, then Base
+        self.assertEqual(self.price(('M100', 'Acme', 1, 100.0)), [50.0])  # Exclusive stops the rest
+
+    def test_quantity_breaks(self):
+        self.assertEqual(self.price(('M001', 'Other', 9, 10.0), ('M001', 'Other', 10, 10.0)), [72.0, 76.0])
+        self.assertEqual(self.price(('M002', 'Acme', 10, 10.0)), [68.4])  # Brand, Bulk and Base
+
+    def test_schedules_are_shared_and_reused(self):
+        lines = [('M001', 'Other', 1, 100.0), ('M002', 'Acme', 10, 10.0), ('M003', 'Acme', 10, 10.0)] * 3
+        self.assertEqual(self.price(*lines), [80.0, 68.4, 68.4] * 3)
+        compiled = self.engine.compiled(TODAY, None)
+        self.assertIs(compiled.schedules['M002'], compiled.schedules['M003'])
+        self.assertIs(compiled.schedules['M001'], compiled.default)
+
+    def test_date_window(self):
+        engine = app.DiscountEngine([app.DiscountRule('Expired', 10, ends=TODAY - timedelta(days=1)),
+                                     app.DiscountRule('Upcoming', 10, starts=TODAY + timedelta(days=1)),
+                                     app.DiscountRule('Today', 25, starts=TODAY, ends=TODAY)])
+        self.assertEqual(self.price(('M001', 'Other', 2, 10.0), engine=engine), [15.0])
+
+    def test_segment_rules(self):
+        engine = app.DiscountEngine([app.DiscountRule('First-time buyer', 20, segment='first_time', stackable=True),
+                                     app.DiscountRule('Loyalty', 10, segment='returning')])
+        self.assertFalse(app.purchases.has_purchased('C900'))
+        self.assertEqual(self.price(('M001', 'Other', 1, 100.0), engine=engine, customer_id='C900'), [80.0])
+        returning = engine.compiled(TODAY, 'returning').schedule('M001', 'Other')
+        self.assertEqual(returning, ([1], [0.9]))
+
+    def test_no_discount_and_full_discount(self):
+        self.assertEqual(self.price(('M001', 'Other', 3, 10.0), engine=app.DiscountEngine([])), [30.0])
+        self.assertEqual(self.price(('M001', 'Other', 3, 10.0), engine=app.DiscountEngine([app.DiscountRule('Free', 100)])), [0.0])
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,54 @@
+# IdAllocator hands out fixed-width IDs from blocks that are really reserved on the sequence.
+# Runs on the embedded SQLite backend:  python -m unittest discover tests
+import os
+import sys
+import unittest
+
+os.environ['MEDICAL_DB_BACKEND'] = 'sqlite'
+os.environ.pop('MEDICAL_DB_PATH', None)
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import medical_system_v9 as app
+
+class IdAllocatorTest(unittest.TestCase):
+    def setUp(self):
+        self.allocator = app.IdAllocator('CUSTOMER', 'customer_id', 'C')
+        app.dbms.reserve_ids(self.allocator.sequence)  # Creates the sequence row outside any test transaction
+
+    def number(self, new_id):
+        return int(new_id[len(self.allocator.prefix):])
+
+    def sequence(self):
+        return app.dbms.fetch_query("SELECT next_value FROM ID_SEQUENCES WHERE name = :1", (self.allocator.sequence,))[0][0]
+
+    def test_prefixes_are_distinct(self):
+        prefixes = [prefix for column, prefix in app.ID_SEQUENCES.values()]
+        self.assertEqual(len(set(prefixes)), len(prefixes))
+
+    def test_one_reservation_per_block(self):
+        ids = [self.allocator.next() for _ in range(app.ID_BLOCK_SIZE)]
+        self.assertEqual(self.allocator.reservations, 1)
+        self.assertEqual(len(set(ids)), len(ids))
+        numbers = [self.number(new_id) for new_id in ids]
+        self.assertEqual(numbers, list(range(numbers[0], numbers[0] + app.ID_BLOCK_SIZE)))
+        self.assertLessEqual(numbers[-1], self.sequence())
+
+    def test_ids_sort_in_numeric_order(self):
+        self.allocator._next, self.allocator._end = 999, 1001
+        ids = [self.allocator.next(), self.allocator.next()]
+        self.assertEqual(ids, sorted(ids))
+        self.assertEqual({len(new_id) for new_id in ids}, {len('C') + app.ID_DIGITS})
+
+    def test_rolled_back_reservation_is_not_reused(self):
+        with self.assertRaises(RuntimeError):
+            with app.dbms.transaction():
+                rolled_back = self.number(self.allocator.next())
+                raise RuntimeError('rollback')
+        self.assertEqual(self.sequence(), rolled_back)  # The block went back to the sequence
+        self.allocator._next = self.allocator._end  # Use up the rest of the block
+        fresh = self.number(self.allocator.next())
+        self.assertGreaterEqual(fresh, rolled_back + app.ID_BLOCK_SIZE)
+        self.assertGreater(self.sequence(), fresh)  # The new block is reserved, not assumed
+
+if __name__ == '__main__':
+    unittest.main()
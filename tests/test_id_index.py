@@ -0,0 +1,84 @@
+# IdIndex answers ID checks from memory, learns rows other terminals added and reconciles deletes.
+# Runs on the embedded SQLite backend:  python -m unittest discover tests
+import os
+import sys
+import unittest
+from unittest import mock
+
+os.environ['MEDICAL_DB_BACKEND'] = 'sqlite'
+os.environ.pop('MEDICAL_DB_PATH', None)
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import medical_system_v9 as app
+
+CUSTOMER = 'C900'
+
+# Stands in for dbms during a reload and publishes a change once the reload has read the table
+class ChangeDuringReload:
+    def __init__(self, db, index, action, key):
+        self.db = db
+        self.index = index
+        self.action = action
+        self.key = key
+
+    def fetch_query(self, query, params=()):
+        rows = self.db.fetch_query(query, params)
+        self.index.on_change(self.action, {self.index.column: self.key})
+        return rows
+
+class IdIndexTest(unittest.TestCase):
+    def setUp(self):
+        app.dbms.execute_query("DELETE FROM CUSTOMER WHERE customer_id = :1", (CUSTOMER,))
+        self.index = app.IdIndex('CUSTOMER', 'customer_id')
+        self.index.load()
+
+    def tearDown(self):
+        app.dbms.execute_query("DELETE FROM CUSTOMER WHERE customer_id = :1", (CUSTOMER,))
+
+    def add_elsewhere(self):
+        # Written without publishing, as another terminal would
+        app.dbms.execute_query("INSERT INTO CUSTOMER (customer_id, c_name) VALUES (:1, 'Elsewhere')", (CUSTOMER,))
+
+    def test_published_writes_update_the_set(self):
+        self.index.on_change('insert', {'customer_id': CUSTOMER})
+        self.assertTrue(self.index.known(CUSTOMER))
+        self.index.on_change('delete', {'customer_id': CUSTOMER})
+        self.assertFalse(self.index.known(CUSTOMER))
+
+    def test_miss_falls_back_and_learns_the_row(self):
+        self.add_elsewhere()
+        self.assertFalse(self.index.known(CUSTOMER))
+        self.assertTrue(self.index.contains(CUSTOMER))
+        self.assertTrue(self.index.known(CUSTOMER))
+        self.assertEqual(self.index.stats()['fallbacks'], 1)
+        self.assertTrue(self.index.contains(CUSTOMER))
+        self.assertEqual(self.index.stats()['hits'], 1)
+
+    def test_reload_drops_rows_deleted_elsewhere(self):
+        self.add_elsewhere()
+        self.index.contains(CUSTOMER)
+        app.dbms.execute_query("DELETE FROM CUSTOMER WHERE customer_id = :1", (CUSTOMER,))
+        self.assertTrue(self.index.known(CUSTOMER))  # Stale until reconciled
+        self.index.load()
+        self.assertFalse(self.index.known(CUSTOMER))
+
+    def test_changes_during_a_reload_are_replayed(self):
+        with mock.patch.object(app, 'dbms', ChangeDuringReload(app.dbms, self.index, 'insert', CUSTOMER)):
+            self.index.load()
+        self.assertTrue(self.index.known(CUSTOMER))
+        self.add_elsewhere()
+        self.index.load()
+        with mock.patch.object(app, 'dbms', ChangeDuringReload(app.dbms, self.index, 'delete', CUSTOMER)):
+            self.index.load()
+        self.assertFalse(self.index.known(CUSTOMER))
+
+    def test_rows_read_inside_a_transaction_are_not_learned(self):
+        with self.assertRaises(RuntimeError):
+            with app.dbms.transaction():
+                self.add_elsewhere()
+                self.assertTrue(self.index.contains(CUSTOMER))
+                raise RuntimeError('rollback')
+        self.assertFalse(self.index.known(CUSTOMER))
+
+if __name__ == '__main__':
+    unittest.main()
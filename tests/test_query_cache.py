@@ -0,0 +1,81 @@
+# Cached reference table reads are served from QueryCache until a write to a table they read.
+# Runs on the embedded SQLite backend:  python -m unittest discover tests
+import os
+import sys
+import unittest
+
+os.environ['MEDICAL_DB_BACKEND'] = 'sqlite'
+os.environ.pop('MEDICAL_DB_PATH', None)
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import medical_system_v9 as app
+
+MEDICINE = 'M005'
+QUERY = "SELECT quantity FROM MEDICINE WHERE medicine_id = :1"
+
+class QueryCacheTest(unittest.TestCase):
+    def test_lru_eviction_and_ttl(self):
+        cache = app.QueryCache(max_entries=2, ttl=60)
+        cache.put('a', (1,), frozenset({'MEDICINE'}))
+        cache.put('b', (2,), frozenset({'MEDICINE'}))
+        cache.get('a')  # 'b' is now the least recently used
+        cache.put('c', (3,), frozenset({'CUSTOMER'}))
+        self.assertIsNone(cache.get('b'))
+        self.assertEqual(cache.get('a'), (1,))
+        self.assertEqual(cache.stats()['evictions'], 1)
+        cache.ttl = -1
+        cache.put('d', (4,), frozenset({'CUSTOMER'}))
+        self.assertIsNone(cache.get('d'))
+
+    def test_invalidate_drops_only_entries_reading_the_table(self):
+        cache = app.QueryCache()
+        cache.put('medicine', (1,), frozenset({'MEDICINE'}))
+        cache.put('join', (2,), frozenset({'MEDICINE', 'SUPPLIER'}))
+        cache.put('customer', (3,), frozenset({'CUSTOMER'}))
+        cache.invalidate({'SUPPLIER', 'MEDICINE'})
+        self.assertEqual([cache.get(key) for key in ('medicine', 'join', 'customer')], [None, None, (3,)])
+        self.assertEqual(cache.stats()['invalidations'], 2)
+
+class CachedReadTest(unittest.TestCase):
+    def setUp(self):
+        app.dbms.execute_query("UPDATE MEDICINE SET quantity = 50 WHERE medicine_id = :1", (MEDICINE,))
+
+    def read(self):
+        return app.dbms.fetch_query(QUERY, (MEDICINE,), cache=True)[0][0]
+
+    def hits(self):
+        return app.dbms.cache.stats()['hits']
+
+    def test_repeated_read_is_a_hit(self):
+        self.read()
+        hits = self.hits()
+        self.assertEqual(self.read(), 50)
+        self.assertEqual(self.hits(), hits + 1)
+
+    def test_write_to_the_table_invalidates(self):
+        self.read()
+        app.dbms.execute_query("UPDATE MEDICINE SET quantity = 40 WHERE medicine_id = :1", (MEDICINE,))
+        self.assertEqual(self.read(), 40)
+
+    def test_write_to_another_table_keeps_the_entry(self):
+        self.read()
+        hits = self.hits()
+        app.dbms.execute_query("UPDATE SALES SET payment_method = payment_method WHERE sale_id = 'none'")
+        self.read()
+        self.assertEqual(self.hits(), hits + 1)
+
+    def test_sales_item_insert_invalidates_medicine(self):
+        # The stock trigger changes MEDICINE when SALES_ITEMS is written
+        self.assertIn('MEDICINE', app.dbms._written_tables("INSERT INTO SALES_ITEMS VALUES (1)"))
+
+    def test_transaction_reads_bypass_and_rollback_invalidates(self):
+        self.read()
+        with self.assertRaises(RuntimeError):
+            with app.dbms.transaction():
+                app.dbms.execute_query("UPDATE MEDICINE SET quantity = 1 WHERE medicine_id = :1", (MEDICINE,))
+                self.assertEqual(self.read(), 1)  # Sees its own uncommitted write
+                raise RuntimeError('rollback')
+        self.assertEqual(self.read(), 50)
+
+if __name__ == '__main__':
+    unittest.main()
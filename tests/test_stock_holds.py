@@ -0,0 +1,59 @@
+# Stock held by an open basket must not be sold by another terminal, whichever path the sale takes.
+# Runs on the embedded SQLite backend:  python -m unittest discover tests
+import os
+import sys
+import unittest
+
+os.environ['MEDICAL_DB_BACKEND'] = 'sqlite'
+os.environ.pop('MEDICAL_DB_PATH', None)
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import medical_system_v9 as app
+
+MEDICINE = 'M005'
+
+class HeldStockTest(unittest.TestCase):
+    def setUp(self):
+        self.enabled = app.stock_engine.enabled
+        app.dbms.execute_query("DELETE FROM STOCK_HOLD")
+        app.dbms.execute_query("UPDATE MEDICINE SET quantity = 5 WHERE medicine_id = :1", (MEDICINE,))
+        self.basket = app.Basket(terminal_id='terminal-a')
+        self.basket.add(MEDICINE, 4)  # Leaves one unit for everyone else
+        self.sale_id = app.id_allocator['SALES'].next()
+        app.dbms.execute_query("INSERT INTO SALES (sale_id, customer_id, sale_date, total_amount, payment_method) "
+                               "VALUES (:1, 'C001', TO_DATE('2024-11-01', 'YYYY-MM-DD'), 0, 'Cash')", (self.sale_id,))
+
+    def tearDown(self):
+        app.stock_engine.enabled = self.enabled
+        self.basket.abandon()
+
+    def item(self, quantity):
+        return app.SalesItemInsert(app.id_allocator['SALES_ITEMS'].next(), self.sale_id, MEDICINE, quantity, 10.0)
+
+    def stock(self):
+        return app.dbms.fetch_query("SELECT quantity FROM MEDICINE WHERE medicine_id = :1", (MEDICINE,))[0][0]
+
+    def test_single_sale_item_cannot_take_held_stock(self):
+        # The insertbysalesitems screen inserts one line through the update_medicine_stock trigger
+        with app.dbms.raise_errors():
+            with self.assertRaises(app.DATABASE_ERRORS):
+                self.item(2).perform_insert()
+            self.assertTrue(self.item(1).perform_insert())
+        self.assertEqual(self.stock(), 4)
+
+    def test_bulk_insert_cannot_take_held_stock(self):
+        for engine in (True, False):
+            with self.subTest(stock_engine=engine):
+                app.stock_engine.enabled = engine
+                result = app.bulk_insert([self.item(2)])
+                self.assertFalse(result.ok)
+                self.assertEqual(self.stock(), 5)
+
+    def test_basket_checkout_still_gets_its_held_stock(self):
+        app.dbms.execute_query("DELETE FROM SALES WHERE sale_id = :1", (self.sale_id,))
+        receipt = self.basket.checkout('C001', 'Cash')
+        self.assertEqual(sum(item.quantity for item in receipt.items), 4)
+        self.assertEqual(self.stock(), 1)
+
+if __name__ == '__main__':
+    unittest.main()